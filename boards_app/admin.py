@@ -5,6 +5,12 @@ from .models import Board
 # Register your models here.
 @admin.register(Board)
 class BoardAdmin(admin.ModelAdmin):
-    list_display = ("title", "owner")
+    list_display = ("title", "owner", "member_count", "ticket_count")
+    readonly_fields = (
+        "member_count",
+        "ticket_count",
+        "tasks_to_do_count",
+        "tasks_high_prio_count",
+    )
     search_fields = ("title",)
     filter_horizontal = ("members",)
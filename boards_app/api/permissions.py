@@ -1,6 +1,8 @@
 # permissions.py
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from boards_app.membership import BoardMembership
+
 
 class IsMemberOrOwnerOrAdmin(BasePermission):
     """
@@ -18,7 +20,7 @@ class IsMemberOrOwnerOrAdmin(BasePermission):
         Permissions:
         - Superusers: full access
         - SAFE methods (GET, HEAD, OPTIONS): owner or member
-        - PUT / PATCH: owner or member
+        - PUT / PATCH / POST (board actions such as moving tasks): owner or member
         - DELETE: owner only
         """
         user = request.user
@@ -29,14 +31,25 @@ class IsMemberOrOwnerOrAdmin(BasePermission):
         if user.is_superuser:
             return True
 
-        if request.method in (*SAFE_METHODS, "PUT", "PATCH"):
+        if request.method in (*SAFE_METHODS, "PUT", "PATCH", "POST"):
             return (
-                user == obj.owner
-                or user in obj.members.all()
-                or user.is_superuser
+                obj.owner_id == user.id
+                or BoardMembership.for_request(request).is_member_or_owner(obj.pk)
             )
 
         if request.method == "DELETE":
-            return user == obj.owner or user.is_superuser
+            return obj.owner_id == user.id
 
         return False
+
+
+class IsAdmin(BasePermission):
+    """
+    View-level permission granting access to superusers only.
+    """
+
+    def has_permission(self, request, view):
+        """
+        Check whether the requesting user is a superuser.
+        """
+        return bool(request.user and request.user.is_superuser)
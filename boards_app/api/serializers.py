@@ -1,20 +1,45 @@
+from collections import defaultdict
+
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
 
-from boards_app.models import Board
+from boards_app.changes import record_changes
+from boards_app.counters import apply_task_transitions
+from boards_app.export import (
+    EXPORT_FORMATS,
+    RECORD_TYPES,
+    ExportCursorError,
+    parse_cursor,
+)
+from boards_app.models import Board, BoardChange
+from core.api.fields import BulkPrimaryKeyRelatedField
+from core.api.pagination import KeysetPagination
+from core.api.sparse import SparseFieldsMixin
+from tasks_app.models import Comments, Task
 from user_auth_app.api.serializers import UserProfileSerializer
-from tasks_app.api.serializers import TaskNestedSerializer
+from tasks_app.api.serializers import (
+    CommentSerializer,
+    TaskListSerializer,
+    TaskNestedSerializer,
+)
 
 
-class BoardListSerializer(serializers.ModelSerializer):
+class BoardListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for listing and creating boards.
 
-    Includes aggregated counts and supports assigning members
+    Includes the stored board counters and supports assigning members
     via primary key references on creation.
     """
 
-    members = serializers.PrimaryKeyRelatedField(
+    members = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=User.objects.all(),
         write_only=True,
@@ -26,19 +51,20 @@ class BoardListSerializer(serializers.ModelSerializer):
     ticket_count = serializers.IntegerField(read_only=True)
     tasks_to_do_count = serializers.IntegerField(read_only=True)
     tasks_high_prio_count = serializers.IntegerField(read_only=True)
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
 
     def create(self, validated_data):
         """
         Create a board and assign members.
 
-        The owner is automatically added to the members list.
+        The owner is automatically added to the members list
+        when the board is saved.
         """
         members = validated_data.pop('members', [])
         board = Board.objects.create(**validated_data)
 
-        board.members.set(members)
-        board.members.add(board.owner)
+        if members:
+            board.members.add(*members)
 
         return board
 
@@ -59,16 +85,19 @@ class BoardListSerializer(serializers.ModelSerializer):
         ]
 
 
-class BoardDetailSerializer(serializers.ModelSerializer):
+class BoardDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving a single board with full details.
 
-    Includes nested members and tasks.
+    Includes nested members and tasks; with `expand`, unexpanded
+    members and tasks are returned as lists of ids.
     """
 
+    expandable_fields = {"members": "members", "tasks": "tasks"}
+
     members = UserProfileSerializer(many=True, read_only=True)
     tasks = TaskNestedSerializer(many=True, read_only=True)
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         """
@@ -92,7 +121,7 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     detailed owner and member information.
     """
 
-    members = serializers.PrimaryKeyRelatedField(
+    members = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=User.objects.all(),
         write_only=True,
@@ -123,3 +152,414 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
             "members_data",
             "members",
         ]
+
+
+class BoardTaskMoveSerializer(serializers.Serializer):
+    """
+    Serializer for moving many tasks of a board at once.
+
+    All listed tasks receive the target status and, optionally,
+    a new priority and assignee with one set-based `UPDATE`.
+    The board counters are adjusted with a single update and the
+    change log entries are appended with one insert.
+    """
+
+    tasks = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.TASK_BULK_MAX_ITEMS,
+        help_text="IDs of the tasks to move."
+    )
+
+    status = serializers.ChoiceField(
+        choices=Task.STATUS_CHOICES,
+        help_text="Target workflow status."
+    )
+
+    priority = serializers.ChoiceField(
+        choices=Task.PRIORITY_CHOICES,
+        required=False,
+        help_text="Optional new priority for all tasks."
+    )
+
+    assignee_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(),
+        source="assignee",
+        required=False,
+        allow_null=True,
+        help_text="Optional user ID to assign all tasks to."
+    )
+
+    def create(self, validated_data):
+        """
+        Move the tasks and update the board counters in one transaction.
+
+        The current status and priority of the tasks are read with a
+        row lock first, so the counter delta matches what is replaced.
+
+        Raises:
+            ValidationError: If any task does not belong to the board.
+
+        Returns:
+            Board: The board with refreshed counters.
+        """
+        board = validated_data.pop("board")
+        task_ids = set(validated_data.pop("tasks"))
+
+        with transaction.atomic():
+            old_states = {
+                pk: (board.pk, status, priority)
+                for pk, status, priority in (
+                    Task.objects
+                    .select_for_update()
+                    .filter(board=board, pk__in=task_ids)
+                    .values_list("pk", "status", "priority")
+                )
+            }
+            missing = sorted(task_ids - set(old_states))
+
+            if missing:
+                raise serializers.ValidationError({
+                    "tasks": [
+                        "Tasks do not belong to this board: "
+                        + ", ".join(map(str, missing))
+                    ]
+                })
+
+            Task.objects.filter(pk__in=task_ids).update(
+                **validated_data,
+                updated_at=timezone.now(),
+            )
+            apply_task_transitions(
+                (
+                    old_state,
+                    (
+                        board.pk,
+                        validated_data["status"],
+                        validated_data.get("priority", old_state[2]),
+                    ),
+                )
+                for old_state in old_states.values()
+            )
+            record_changes(
+                (board.pk, BoardChange.TASK, BoardChange.UPDATE, task_id)
+                for task_id in sorted(task_ids)
+            )
+
+        board.refresh_from_db(fields=[*Board.COUNTER_FIELDS, "version", "updated_at"])
+        return board
+
+
+class BoardChangeQuerySerializer(serializers.Serializer):
+    """
+    Serializer validating the query parameters of the change feed.
+    """
+
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Cursor returned by the previous request."
+    )
+
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.BOARD_CHANGES["MAX_PAGE_SIZE"],
+        default=settings.BOARD_CHANGES["PAGE_SIZE"],
+        help_text="Maximum number of change log entries to read."
+    )
+
+
+class BoardExportQuerySerializer(serializers.Serializer):
+    """
+    Serializer validating the query parameters of the board export.
+    """
+
+    output = serializers.ChoiceField(
+        choices=EXPORT_FORMATS,
+        default="ndjson",
+        help_text="ndjson for all record types, csv for a single one."
+    )
+
+    records = serializers.ListField(
+        child=serializers.ChoiceField(choices=RECORD_TYPES),
+        required=False,
+        help_text="Record types to export (repeatable, default: all)."
+    )
+
+    after = serializers.CharField(
+        required=False,
+        help_text="Cursor of the last record received, to resume an export."
+    )
+
+    gzip = serializers.BooleanField(
+        default=False,
+        help_text="Compress the export with gzip."
+    )
+
+    def validate_after(self, value):
+        """
+        Check that the cursor is well-formed.
+        """
+        try:
+            parse_cursor(value)
+        except ExportCursorError as exc:
+            raise serializers.ValidationError(str(exc))
+
+        return value
+
+    def validate(self, attrs):
+        """
+        Default to all record types and require a single one for CSV.
+        """
+        attrs["records"] = attrs.get("records") or list(RECORD_TYPES)
+
+        if attrs["output"] == "csv" and len(set(attrs["records"])) != 1:
+            raise serializers.ValidationError(
+                {"records": "CSV exports contain exactly one record type."}
+            )
+
+        return attrs
+
+
+class BoardColumnsQuerySerializer(serializers.Serializer):
+    """
+    Serializer validating the query parameters of the column view.
+
+    `limit` applies to every column; `limit_<status>` (for example
+    `limit_done=0`) overrides it for one column.
+    """
+
+    limit = serializers.IntegerField(
+        min_value=0,
+        max_value=settings.BOARD_COLUMNS["MAX_PAGE_SIZE"],
+        default=settings.BOARD_COLUMNS["PAGE_SIZE"],
+        help_text="Maximum number of tasks returned per column."
+    )
+
+    def get_fields(self):
+        """
+        Add one optional limit per task status.
+        """
+        fields = super().get_fields()
+
+        for status, title in Task.STATUS_CHOICES:
+            fields[f"limit_{status}"] = serializers.IntegerField(
+                min_value=0,
+                max_value=settings.BOARD_COLUMNS["MAX_PAGE_SIZE"],
+                required=False,
+                help_text=f"Maximum number of tasks returned for {title}."
+            )
+
+        return fields
+
+    def get_limits(self):
+        """
+        Return the validated limit of every column by status.
+        """
+        data = self.validated_data
+
+        return {
+            status: data.get(f"limit_{status}", data["limit"])
+            for status, _ in Task.STATUS_CHOICES
+        }
+
+
+class BoardColumnsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a board with its tasks grouped into status columns.
+
+    Every column holds its task count, the first tasks by id up to the
+    column's limit and the URL of the task list continuing after them.
+    Positions and counts are read in one query over the board/status
+    index. Its window functions number and count every task of the
+    board before the limit filter applies, so the limits bound the rows
+    returned, not the index entries scanned. Only the listed tasks are
+    loaded, with a second query.
+
+    Context:
+        limits (dict): Limit per status, see `BoardColumnsQuerySerializer`.
+        request (Request): Used to build absolute `next` URLs.
+    """
+
+    columns = serializers.SerializerMethodField()
+
+    class Meta:
+        """
+        Serializer metadata.
+        """
+        model = Board
+        fields = ["id", "title", "columns"]
+
+    def get_columns(self, board):
+        """
+        Return the columns of the board in workflow order.
+
+        The position query scans the ids of all of the board's tasks;
+        only the rows within the limits are returned and loaded.
+        """
+        limits = self.context["limits"]
+        rows = (
+            Task.objects
+            .filter(board=board)
+            .annotate(
+                position=Window(
+                    RowNumber(), partition_by=F("status"), order_by=F("id").asc()
+                ),
+                column_size=Window(Count("id"), partition_by=F("status")),
+            )
+            .filter(position__lte=max(max(limits.values()), 1))
+            .values_list("id", "status", "position", "column_size")
+        )
+
+        counts = dict.fromkeys(limits, 0)
+        task_ids = {status: [] for status in limits}
+
+        for task_id, status, position, column_size in rows:
+            counts[status] = column_size
+
+            if position <= limits[status]:
+                task_ids[status].append(task_id)
+
+        tasks = (
+            Task.objects
+            .select_related("assignee", "reviewer")
+            .in_bulk([task_id for ids in task_ids.values() for task_id in ids])
+        )
+
+        return [
+            {
+                "status": status,
+                "title": title,
+                "count": counts[status],
+                "tasks": TaskListSerializer(
+                    [tasks[task_id] for task_id in task_ids[status]], many=True
+                ).data,
+                "next": self.get_next_url(
+                    board, status, limits[status], task_ids[status], counts[status]
+                ),
+            }
+            for status, title in Task.STATUS_CHOICES
+        ]
+
+    def get_next_url(self, board, status, limit, task_ids, count):
+        """
+        Return the task list URL continuing a column, or None if the
+        column is complete.
+        """
+        if count <= len(task_ids):
+            return None
+
+        query = urlencode({
+            "board": board.pk,
+            "status": status,
+            "page_size": limit or settings.BOARD_COLUMNS["PAGE_SIZE"],
+        })
+        url = self.context["request"].build_absolute_uri(f"{reverse('tasks-list')}?{query}")
+
+        if not task_ids:
+            return url
+
+        return KeysetPagination().get_url_after(url, task_ids[-1])
+
+
+class BoardChangeListSerializer(serializers.ListSerializer):
+    """
+    List serializer for a page of change log entries.
+
+    Only the latest entry per object is returned. The current state of
+    the changed objects is loaded with one query per kind of object
+    and embedded in the entries.
+    """
+
+    def to_representation(self, data):
+        """
+        Collapse the entries per object and serialize them with their objects.
+        """
+        latest = {}
+
+        for change in data:
+            latest[(change.entity, change.entity_id)] = change
+
+        changes = sorted(latest.values(), key=lambda change: change.id)
+        self.context["objects"] = self.load_objects(changes)
+
+        return [self.child.to_representation(change) for change in changes]
+
+    def load_objects(self, changes):
+        """
+        Return the serialized objects of all non-delete entries,
+        keyed by `(entity, entity_id)`.
+
+        Objects that no longer belong to the board are left out.
+        """
+        board = self.context["board"]
+        ids = defaultdict(list)
+        objects = {}
+
+        for change in changes:
+            if change.action != BoardChange.DELETE:
+                ids[change.entity].append(change.entity_id)
+
+        if ids[BoardChange.TASK]:
+            tasks = (
+                Task.objects
+                .filter(board=board, pk__in=ids[BoardChange.TASK])
+                .select_related("assignee", "reviewer")
+            )
+            for task in tasks:
+                objects[(BoardChange.TASK, task.pk)] = TaskNestedSerializer(task).data
+
+        if ids[BoardChange.COMMENT]:
+            comments = Comments.objects.filter(
+                task__board=board, pk__in=ids[BoardChange.COMMENT]
+            )
+            for comment in comments:
+                objects[(BoardChange.COMMENT, comment.pk)] = {
+                    **CommentSerializer(comment).data,
+                    "task": comment.task_id,
+                }
+
+        if ids[BoardChange.MEMBER]:
+            for user in board.members.filter(pk__in=ids[BoardChange.MEMBER]):
+                objects[(BoardChange.MEMBER, user.pk)] = UserProfileSerializer(user).data
+
+        return objects
+
+
+class BoardChangeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a single change log entry.
+
+    Inserts and updates carry the current state of the object in `data`.
+    Deletes are tombstones with `data` set to null; an object that no
+    longer exists or has left the board is reported as deleted.
+    """
+
+    action = serializers.SerializerMethodField()
+    data = serializers.SerializerMethodField()
+
+    class Meta:
+        """
+        Serializer metadata.
+        """
+        model = BoardChange
+        list_serializer_class = BoardChangeListSerializer
+        fields = ["id", "entity", "entity_id", "action", "data"]
+
+    def get_action(self, change):
+        """
+        Return the action, downgraded to a delete if the object is gone.
+        """
+        if self.get_data(change) is None:
+            return BoardChange.DELETE
+
+        return change.action
+
+    def get_data(self, change):
+        """
+        Return the serialized object of the entry, or None for deletes.
+        """
+        if change.action == BoardChange.DELETE:
+            return None
+
+        return self.context["objects"].get((change.entity, change.entity_id))
@@ -1,10 +1,39 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BoardViewSet
+
+from core.api.async_views import read_async
+from .views import (
+    AsyncBoardDetailView,
+    AsyncBoardListView,
+    BoardEventsView,
+    BoardViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'', BoardViewSet, basename='board')
 
 urlpatterns = [
+    path('<int:pk>/events/', BoardEventsView.as_view(), name='board-events'),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns += [
+        path('', read_async(
+            BoardViewSet.as_view({'get': 'list', 'post': 'create'}),
+            AsyncBoardListView.as_view(),
+        ), name='board-list'),
+        path('<int:pk>/', read_async(
+            BoardViewSet.as_view({
+                'get': 'retrieve',
+                'put': 'update',
+                'patch': 'partial_update',
+                'delete': 'destroy',
+            }),
+            AsyncBoardDetailView.as_view(),
+        ), name='board-detail'),
+    ]
+
+urlpatterns += [
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
@@ -1,81 +1,158 @@
 # third party imports
-from django.db.models import Count, Q
+import gzip
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.db.models import (
+    Max,
+    Prefetch,
+    Q,
+    aprefetch_related_objects,
+    prefetch_related_objects,
+)
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    NotFound,
+    PermissionDenied,
+)
 from django.shortcuts import get_object_or_404
 
 # local imports
+from boards_app.export import CONTENT_TYPES, BoardExport, export_chunks
+from boards_app.importer import BoardImport
+from boards_app.live import OVERFLOW, get_broker, live_updates_config
+from boards_app.membership import BoardMembership
 from boards_app.models import Board
+from core.api.async_views import AsyncAPIView, AsyncListAPIView
+from core.api.rows import RowListMixin, get_row_plan
+from core.api.conditional import (
+    conditional_response,
+    make_etag,
+    set_conditional_headers,
+)
+from core.api.sparse import SparseFieldset
+from core.api.streaming import (
+    ajson_document,
+    chunk_size,
+    json_document,
+    stream_requested,
+    streaming_json_response,
+)
+from tasks_app.models import Task
 from .serializers import (
     BoardListSerializer,
     BoardDetailSerializer,
     BoardUpdateSerializer,
+    BoardTaskMoveSerializer,
+    BoardChangeQuerySerializer,
+    BoardChangeSerializer,
+    BoardColumnsQuerySerializer,
+    BoardColumnsSerializer,
+    BoardExportQuerySerializer,
 )
-from .permissions import IsMemberOrOwnerOrAdmin
+from .permissions import IsAdmin, IsMemberOrOwnerOrAdmin
+from user_auth_app.authentication import CachedTokenAuthentication
+
+
+def boards_for_user(user):
+    """
+    Return the boards a user owns or is a member of (all for superusers).
+    """
+    queryset = Board.objects.all()
+
+    if user.is_superuser:
+        return queryset
+
+    member_board_ids = (
+        Board.members.through.objects
+        .filter(user_id=user.id)
+        .values("board_id")
+    )
+
+    return queryset.filter(
+        Q(owner=user) | Q(pk__in=member_board_ids)
+    )
+
+
+def board_detail_prefetches(fieldset):
+    """
+    Return the prefetches needed to serialize a board in detail.
+
+    Members and tasks are only loaded if they are rendered, with just
+    their ids if they are not expanded; tasks join only the users that
+    are expanded.
+    """
+    prefetches = []
+
+    if fieldset.expands("members"):
+        prefetches.append("members")
+    elif fieldset.includes("members"):
+        prefetches.append(Prefetch("members", queryset=User.objects.only("id")))
+
+    if fieldset.expands("tasks"):
+        tasks = fieldset.select_related(
+            Task.objects.all(), "assignee", "reviewer", prefix="tasks"
+        )
+        prefetches.append(Prefetch("tasks", queryset=tasks))
+    elif fieldset.includes("tasks"):
+        prefetches.append(Prefetch("tasks", queryset=Task.objects.only("id", "board_id")))
+
+    return prefetches
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+class ChangeCursorExpired(APIException):
+    """
+    Raised when a change feed cursor predates the compacted change log.
+    """
+
+    status_code = status.HTTP_410_GONE
+    default_detail = "The cursor has expired. Reload the board and start a new sync."
+    default_code = "cursor_expired"
+
+
+class BoardViewSet(RowListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing boards.
 
     Provides CRUD operations for boards with permission handling
-    and optimized querysets including aggregated task and member data.
+    and querysets backed by the counters stored on each board.
+    The list may be read from a replica (see `core.routing`).
     """
 
     serializer_class = BoardListSerializer
     permission_classes = [IsAuthenticated, IsMemberOrOwnerOrAdmin]
+    replica_actions = {"list"}
 
     def get_queryset(self):
         """
         Return a queryset of boards accessible to the current user.
 
         Superusers receive all boards. Regular users receive boards
-        where they are the owner or a member. The queryset is optimized
-        with related data and annotated counts.
+        where they are the owner or a member. Member and task counts
+        are read from the counters stored on each board.
         """
-        user = self.request.user
-
-        queryset = (
-            Board.objects
-            .select_related('owner')
-            .prefetch_related('members', 'tasks')
-            .annotate(
-                member_count=Count('members', distinct=True),
-                ticket_count=Count('tasks', distinct=True),
-                tasks_to_do_count=Count(
-                    'tasks',
-                    filter=Q(tasks__status='todo'),
-                    distinct=True,
-                ),
-                tasks_high_prio_count=Count(
-                    'tasks',
-                    filter=Q(tasks__priority='high'),
-                    distinct=True,
-                ),
-            )
-        )
-
-        if user.is_superuser:
-            return queryset
-
-        return queryset.filter(
-            Q(owner=user) | Q(members=user)
-        ).distinct()
+        return boards_for_user(self.request.user)
 
     def create(self, request, *args, **kwargs):
         """
         Create a new board and assign the requesting user as owner.
 
-        Returns the created board with annotated fields included.
+        Returns the created board with its counters included.
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         board = serializer.save(owner=request.user)
-        board_qs = self.get_queryset().filter(pk=board.pk).first()
-        response_serializer = self.get_serializer(board_qs)
+        response_serializer = self.get_serializer(board)
 
         return Response(
             response_serializer.data,
@@ -102,10 +179,47 @@ class BoardViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve a single board with detailed information.
+
+        Supports conditional requests: the ETag is derived from the
+        board's version, so an unchanged board returns 304 right after
+        the board lookup and permission check, without serializing.
+        Otherwise members and tasks (with their assignee and reviewer)
+        are loaded with one query each, as far as `fields` and `expand`
+        render them, and rendered through the row plan of
+        `BoardDetailSerializer` where possible. Each sparse
+        representation has its own ETag. With `?stream=true` the tasks
+        are streamed in chunks (see `RowListMixin`).
         """
         instance = self.get_object()
-        serializer = BoardDetailSerializer(instance)
-        return Response(serializer.data)
+        fieldset = SparseFieldset.from_request(request)
+        etag = make_etag(
+            instance.pk, instance.version, instance.updated_at, *fieldset.etag_parts()
+        )
+        not_modified = conditional_response(request, etag, instance.updated_at)
+
+        if not_modified is not None:
+            return not_modified
+
+        plan = get_row_plan(BoardDetailSerializer, fieldset)
+        tasks = plan.get_relation("tasks") if plan is not None else None
+
+        if tasks is not None and stream_requested(request):
+            row = plan.row(instance)
+            data = plan.render_rows([row], skip=(tasks,))[0]
+            response = streaming_json_response(
+                json_document(data, "tasks", tasks.stream([row], chunk_size()))
+            )
+            return set_conditional_headers(response, etag, instance.updated_at)
+
+        if plan is not None:
+            data = plan.render_rows([plan.row(instance)])[0]
+        else:
+            prefetch_related_objects([instance], *board_detail_prefetches(fieldset))
+            data = BoardDetailSerializer(
+                instance, context={"request": request, "fieldset": fieldset}
+            ).data
+
+        return set_conditional_headers(Response(data), etag, instance.updated_at)
 
     def _update_board(self, request, partial, *args, **kwargs):
         """
@@ -136,3 +250,353 @@ class BoardViewSet(viewsets.ModelViewSet):
         Fully update a board (PUT).
         """
         return self._update_board(request, partial=False, *args, **kwargs)
+
+    @action(detail=True, methods=["post"], url_path="move-tasks")
+    def move_tasks(self, request, *args, **kwargs):
+        """
+        Move many tasks of the board to a target status at once.
+
+        Checks membership once, updates all tasks with one query and
+        returns the board with its new counters.
+        """
+        board = self.get_object()
+        serializer = BoardTaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        board = serializer.save(board=board)
+
+        return Response(BoardListSerializer(board).data)
+
+    @action(detail=True, methods=["get"])
+    def columns(self, request, *args, **kwargs):
+        """
+        Return the board's tasks grouped into one column per status.
+
+        Each column carries its count and the first tasks up to its
+        limit, so large columns such as `done` stay out of the first
+        response and are loaded from the column's `next` URL. Supports
+        conditional requests like the board detail.
+        """
+        board = self.get_object()
+        params = BoardColumnsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        etag = make_etag(board.pk, board.version, board.updated_at)
+        not_modified = conditional_response(request, etag, board.updated_at)
+
+        if not_modified is not None:
+            return not_modified
+
+        serializer = BoardColumnsSerializer(
+            board, context={"limits": params.get_limits(), "request": request}
+        )
+        return set_conditional_headers(
+            Response(serializer.data), etag, board.updated_at
+        )
+
+    @action(detail=True, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        """
+        Return the changes to the board's tasks, comments and members
+        after the `since` cursor.
+
+        Without `since`, only the current cursor is returned, to be
+        fetched before loading the board. Each response carries the
+        cursor for the next request and whether more changes are
+        waiting. Cursors older than the compacted log answer 410.
+        """
+        board = self.get_object()
+        params = BoardChangeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data.get("since")
+        limit = params.validated_data["limit"]
+
+        if since is None:
+            cursor = board.changes.aggregate(cursor=Max("id"))["cursor"]
+            return Response({
+                "cursor": cursor or board.changes_compacted_through,
+                "has_more": False,
+                "changes": [],
+            })
+
+        if since < board.changes_compacted_through:
+            raise ChangeCursorExpired()
+
+        page = list(board.changes.filter(id__gt=since)[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        serializer = BoardChangeSerializer(page, many=True, context={"board": board})
+
+        return Response({
+            "cursor": page[-1].id if page else since,
+            "has_more": has_more,
+            "changes": serializer.data,
+        })
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export_all(self, request, *args, **kwargs):
+        """
+        Stream all boards accessible to the user with their members,
+        tasks and comments (see `export`).
+        """
+        return self._export_response(request, self.get_queryset(), "boards")
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        """
+        Stream the board with its members, tasks and comments as NDJSON,
+        or one record type as CSV, optionally gzipped.
+
+        Records are read and encoded in chunks while the response is
+        sent, so memory stays constant for boards of any size. Every
+        record carries a cursor; an interrupted export is resumed by
+        passing the last cursor received as `after`.
+        """
+        board = self.get_object()
+        return self._export_response(
+            request, Board.objects.filter(pk=board.pk), f"board-{board.pk}"
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        permission_classes=[IsAuthenticated, IsAdmin],
+    )
+    def import_boards(self, request, *args, **kwargs):
+        """
+        Import boards, members, tasks and comments from an NDJSON body
+        in the record format of the export (admins only).
+
+        The body is read line by line while the import runs (gzipped
+        with `Content-Encoding: gzip`). The response streams one NDJSON
+        report per committed transaction with the imported and rejected
+        records, followed by the final report marked `finished`.
+        """
+        stream = request.stream
+
+        if stream is not None and request.headers.get("Content-Encoding") == "gzip":
+            stream = gzip.GzipFile(fileobj=stream)
+
+        config = settings.BOARD_IMPORT
+        importer = BoardImport(
+            batch_size=config["BATCH_SIZE"],
+            transaction_size=config["TRANSACTION_SIZE"],
+            max_errors=config["MAX_ERRORS"],
+        )
+
+        def reports():
+            report = {"finished": True}
+
+            try:
+                for progress in importer.run(stream or []):
+                    yield json.dumps({**progress, "finished": False}) + "\n"
+            except (DatabaseError, OSError, EOFError) as exc:
+                report["error"] = f"Import failed: {exc}"
+
+            yield json.dumps({**importer.report(), **report}) + "\n"
+
+        return StreamingHttpResponse(
+            reports(), content_type=CONTENT_TYPES["ndjson"]
+        )
+
+    def _export_response(self, request, boards, name):
+        """
+        Return the streaming export response of the given boards.
+        """
+        params = BoardExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+        compress = params.validated_data["gzip"]
+
+        export = BoardExport(
+            boards,
+            record_types=params.validated_data["records"],
+            after=params.validated_data.get("after"),
+            chunk_size=chunk_size(),
+        )
+        filename = f"{name}.{output}" + (".gz" if compress else "")
+        response = StreamingHttpResponse(
+            export_chunks(export, output, compress),
+            content_type="application/gzip" if compress else CONTENT_TYPES[output],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        return response
+
+
+class AsyncBoardListView(AsyncListAPIView):
+    """
+    Async variant of the board list (`BoardViewSet.list`).
+    """
+
+    serializer_class = BoardListSerializer
+
+    def get_queryset(self, request):
+        """
+        Return the boards accessible to the current user.
+        """
+        return boards_for_user(request.user)
+
+
+class AsyncBoardDetailView(AsyncAPIView):
+    """
+    Async variant of the board detail (`BoardViewSet.retrieve`),
+    including the conditional GET handling.
+    """
+
+    async def get(self, request, pk):
+        """
+        Return the board with its members and tasks, or 304.
+        """
+        instance = await Board.objects.filter(pk=pk).afirst()
+
+        if instance is None:
+            raise NotFound(detail="Board not found.")
+
+        user = request.user
+
+        if not (
+            user.is_superuser
+            or instance.owner_id == user.id
+            or await BoardMembership.for_request(request).ais_member_or_owner(pk)
+        ):
+            raise PermissionDenied()
+
+        fieldset = SparseFieldset.from_request(request)
+        etag = make_etag(
+            instance.pk, instance.version, instance.updated_at, *fieldset.etag_parts()
+        )
+        not_modified = conditional_response(request, etag, instance.updated_at)
+
+        if not_modified is not None:
+            return not_modified
+
+        plan = get_row_plan(BoardDetailSerializer, fieldset)
+        tasks = plan.get_relation("tasks") if plan is not None else None
+
+        if tasks is not None and stream_requested(request):
+            row = plan.row(instance)
+            data = (await plan.arender_rows([row], skip=(tasks,)))[0]
+            response = streaming_json_response(
+                ajson_document(data, "tasks", tasks.astream([row], chunk_size()))
+            )
+            return set_conditional_headers(response, etag, instance.updated_at)
+
+        if plan is not None:
+            data = (await plan.arender_rows([plan.row(instance)]))[0]
+        else:
+            await aprefetch_related_objects([instance], *board_detail_prefetches(fieldset))
+            data = BoardDetailSerializer(
+                instance, context={"request": request, "fieldset": fieldset}
+            ).data
+
+        response = self.render(data)
+        return set_conditional_headers(response, etag, instance.updated_at)
+
+
+def format_event(event, data, event_id=None):
+    """
+    Encode a server-sent event.
+    """
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+class BoardEventsView(View):
+    """
+    Server-sent event stream of the changes to a board.
+
+    Runs as an async view under ASGI, so an open stream does not hold
+    a worker thread. Clients authenticate with the same token header
+    as the REST API and must be members of the board.
+
+    The stream starts with a `ready` event carrying the current change
+    cursor, followed by one `change` event per change log entry
+    (entity, id and action) and keep-alive comments while idle. A client
+    falling behind receives a final `resync` event; it should then load
+    `/api/boards/{id}/changes/?since=<cursor>` and reconnect.
+    """
+
+    async def check_access(self, request, board_id):
+        """
+        Authenticate the request and check board membership.
+
+        Raises:
+            APIException: If the user is not authenticated, the board
+            does not exist or the user is not a member.
+        """
+        authenticated = await CachedTokenAuthentication().aauthenticate(request)
+
+        if authenticated is None:
+            raise NotAuthenticated()
+
+        user = authenticated[0]
+        membership = BoardMembership(user)
+        await membership.apreload([board_id])
+
+        if not membership.board_exists(board_id):
+            raise NotFound("Board not found.")
+
+        if not (user.is_superuser or membership.is_member_or_owner(board_id)):
+            raise PermissionDenied()
+
+    async def current_cursor(self, board_id):
+        """
+        Return the id of the latest change log entry of the board.
+        """
+        cursor = await (
+            Board.objects
+            .filter(pk=board_id)
+            .annotate(cursor=Max("changes__id"))
+            .values_list("cursor", "changes_compacted_through")
+            .afirst()
+        )
+        return max(value or 0 for value in cursor)
+
+    async def get(self, request, pk):
+        """
+        Open the event stream after authenticating the request.
+        """
+        try:
+            await self.check_access(request, pk)
+        except APIException as exc:
+            return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+
+        subscription = get_broker().subscribe(pk)
+
+        try:
+            subscription.cursor = await self.current_cursor(pk)
+        except BaseException:
+            subscription.close()
+            raise
+
+        response = StreamingHttpResponse(
+            self.stream(subscription, live_updates_config()["HEARTBEAT"]),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, subscription, heartbeat):
+        """
+        Yield the events of a subscription until the client disconnects
+        or falls behind.
+        """
+        try:
+            yield format_event("ready", {"cursor": subscription.cursor})
+
+            while True:
+                event = await subscription.get(heartbeat)
+
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif event is OVERFLOW:
+                    yield format_event("resync", {"cursor": subscription.cursor})
+                    return
+                else:
+                    yield format_event("change", event, event_id=event["id"])
+        finally:
+            subscription.close()
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+
+from boards_app.live import publish_changes
+from boards_app.models import Board, BoardChange
+
+
+def record_changes(entries):
+    """
+    Append change log entries with a single insert and publish
+    them to live subscribers once the transaction commits.
+
+    Each entry is a `(board_id, entity, action, entity_id)` tuple;
+    entries without a board are ignored.
+    """
+    changes = [
+        BoardChange(board_id=board_id, entity=entity, action=action, entity_id=entity_id)
+        for board_id, entity, action, entity_id in entries
+        if board_id is not None
+    ]
+
+    if changes:
+        BoardChange.objects.bulk_create(changes)
+        transaction.on_commit(partial(publish_changes, changes))
+
+
+def record_change(board_id, entity, action, entity_id):
+    """
+    Append a single change log entry.
+    """
+    record_changes([(board_id, entity, action, entity_id)])
+
+
+def record_task_transitions(transitions):
+    """
+    Append change log entries for many tasks with a single insert.
+
+    Each transition is `(task_id, old_board_id, new_board_id)`, with
+    None for a board when the task did not exist before / afterwards.
+    A task moving between boards is a delete on the old board and an
+    insert on the new one.
+    """
+    entries = []
+
+    for task_id, old_board_id, new_board_id in transitions:
+        if old_board_id == new_board_id:
+            entries.append((new_board_id, BoardChange.TASK, BoardChange.UPDATE, task_id))
+            continue
+
+        entries.append((old_board_id, BoardChange.TASK, BoardChange.DELETE, task_id))
+        entries.append((new_board_id, BoardChange.TASK, BoardChange.INSERT, task_id))
+
+    record_changes(entries)
+
+
+def compact_changes(retention_days):
+    """
+    Compact the change log.
+
+    First removes entries superseded by a newer entry for the same
+    object, which never changes what a sync returns. Then removes all
+    entries older than `retention_days` and records the highest removed
+    id on every board, so feeds can reject cursors that predate it.
+
+    Returns:
+        tuple[int, int]: Numbers of superseded and expired entries removed.
+    """
+    newer = BoardChange.objects.filter(
+        board_id=OuterRef("board_id"),
+        entity=OuterRef("entity"),
+        entity_id=OuterRef("entity_id"),
+        id__gt=OuterRef("id"),
+    )
+    superseded, _ = BoardChange.objects.filter(Exists(newer)).delete()
+
+    expired_before = timezone.now() - timedelta(days=retention_days)
+    expired = BoardChange.objects.filter(created_at__lt=expired_before)
+    cutoff = expired.aggregate(cutoff=Max("id"))["cutoff"]
+
+    if cutoff is None:
+        return superseded, 0
+
+    removed, _ = BoardChange.objects.filter(id__lte=cutoff).delete()
+    Board.objects.filter(changes_compacted_through__lt=cutoff).update(
+        changes_compacted_through=cutoff
+    )
+    return superseded, removed
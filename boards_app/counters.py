@@ -0,0 +1,172 @@
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from boards_app.models import Board
+
+
+TASK_COUNTER_FIELDS = (
+    "ticket_count",
+    "tasks_to_do_count",
+    "tasks_high_prio_count",
+)
+
+COUNTER_FIELDS = Board.COUNTER_FIELDS
+
+
+def task_contribution(status, priority, sign=1):
+    """
+    Return how much a single task adds to its board's task counters.
+
+    Args:
+        status (str): Workflow status of the task.
+        priority (str): Priority level of the task.
+        sign (int): 1 to add the task, -1 to remove it.
+    """
+    return {
+        "ticket_count": sign,
+        "tasks_to_do_count": sign if status == "todo" else 0,
+        "tasks_high_prio_count": sign if priority == "high" else 0,
+    }
+
+
+def version_bump():
+    """
+    Return `update()` keyword arguments marking a board as changed.
+    """
+    return {"version": F("version") + 1, "updated_at": timezone.now()}
+
+
+def touch_boards(*conditions, **filters):
+    """
+    Bump the version of all boards matching the filters in one query.
+    """
+    Board.objects.filter(*conditions, **filters).update(**version_bump())
+
+
+def apply_counter_delta(board_id, delta):
+    """
+    Atomically shift the stored counters of a board by `delta`
+    and bump its version.
+
+    Uses `F()` expressions so concurrent writers never overwrite
+    each other's increments. Zero entries are skipped, but the
+    version is bumped even if no counter changes.
+    """
+    if board_id is None:
+        return
+
+    changes = {
+        field: F(field) + value
+        for field, value in delta.items()
+        if value
+    }
+
+    Board.objects.filter(pk=board_id).update(**changes, **version_bump())
+
+
+def apply_task_transition(old_state, new_state):
+    """
+    Update board counters for a task moving from `old_state` to `new_state`.
+
+    Each state is a `(board_id, status, priority)` tuple, or `None`
+    when the task did not exist before / does not exist afterwards.
+    Status, priority and board changes are all handled by subtracting
+    the old contribution and adding the new one. Every affected board
+    gets its version bumped.
+    """
+    apply_task_transitions([(old_state, new_state)])
+
+
+def apply_task_transitions(transitions):
+    """
+    Update board counters for many task transitions at once.
+
+    The contributions of all `(old_state, new_state)` pairs are summed
+    per board first, so each affected board receives exactly one
+    `UPDATE` no matter how many of its tasks changed.
+    """
+    deltas = {}
+
+    for old_state, new_state in transitions:
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+
+            board_id, status, priority = state
+            board_delta = deltas.setdefault(
+                board_id, dict.fromkeys(TASK_COUNTER_FIELDS, 0)
+            )
+
+            for field, value in task_contribution(status, priority, sign).items():
+                board_delta[field] += value
+
+    for board_id, delta in deltas.items():
+        apply_counter_delta(board_id, delta)
+
+
+def refresh_member_count(board_ids):
+    """
+    Recount the members of the given boards from the membership table
+    and bump their versions.
+
+    Returns:
+        dict: Mapping of board id to its new member count.
+    """
+    through = Board.members.through
+    counts = {}
+
+    for board_id in set(board_ids):
+        counts[board_id] = through.objects.filter(board_id=board_id).count()
+        Board.objects.filter(pk=board_id).update(
+            member_count=counts[board_id],
+            **version_bump(),
+        )
+
+    return counts
+
+
+def compute_counters(board_ids):
+    """
+    Compute the true counter values for the given boards.
+
+    Runs one grouped query over tasks and one over memberships,
+    regardless of how many boards are requested.
+
+    Returns:
+        dict: Mapping of board id to a dict of counter values.
+    """
+    from tasks_app.models import Task
+
+    counters = {
+        board_id: dict.fromkeys(COUNTER_FIELDS, 0)
+        for board_id in board_ids
+    }
+
+    task_rows = (
+        Task.objects
+        .filter(board_id__in=board_ids)
+        .values("board_id")
+        .annotate(
+            ticket_count=Count("id"),
+            tasks_to_do_count=Count("id", filter=Q(status="todo")),
+            tasks_high_prio_count=Count("id", filter=Q(priority="high")),
+        )
+        .order_by()
+    )
+
+    for row in task_rows:
+        board_id = row.pop("board_id")
+        counters[board_id].update(row)
+
+    member_rows = (
+        Board.members.through.objects
+        .filter(board_id__in=board_ids)
+        .values("board_id")
+        .annotate(member_count=Count("id"))
+        .order_by()
+    )
+
+    for row in member_rows:
+        counters[row["board_id"]]["member_count"] = row["member_count"]
+
+    return counters
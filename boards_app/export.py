@@ -0,0 +1,281 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from boards_app.models import Board
+from tasks_app.models import Comments, Task
+
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Record types in export order. Per board, the board comes first,
+# then its members, tasks and comments, each ordered by its key.
+RECORD_TYPES = ("board", "member", "task", "comment")
+
+# Exported columns per record type.
+RECORD_COLUMNS = {
+    "board": [
+        "id", "title", "owner_id", "member_count", "ticket_count",
+        "tasks_to_do_count", "tasks_high_prio_count", "version", "updated_at",
+    ],
+    "member": ["board_id", "user_id", "email", "fullname"],
+    "task": [
+        "id", "board_id", "title", "description", "status", "priority",
+        "assignee_id", "reviewer_id", "created_by_id", "due_date",
+        "comments_count", "updated_at",
+    ],
+    "comment": [
+        "id", "board_id", "task_id", "author", "content", "created_at", "updated_at",
+    ],
+}
+
+# Column identifying a record within its board and type.
+RECORD_KEYS = {"board": "id", "member": "user_id", "task": "id", "comment": "id"}
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class ExportCursorError(ValueError):
+    """
+    Raised for a malformed export cursor.
+    """
+
+
+def format_cursor(board_id, record_type, key):
+    """
+    Return the cursor of a record, e.g. `12:task:345`.
+    """
+    return f"{board_id}:{record_type}:{key}"
+
+
+def parse_cursor(cursor):
+    """
+    Return `(board_id, record_type, key)` of a cursor.
+
+    Raises:
+        ExportCursorError: If the cursor is malformed.
+    """
+    try:
+        board_id, record_type, key = cursor.split(":")
+        board_id, key = int(board_id), int(key)
+    except ValueError:
+        raise ExportCursorError(f"Invalid export cursor: {cursor!r}.")
+
+    if record_type not in RECORD_TYPES:
+        raise ExportCursorError(f"Invalid export cursor: {cursor!r}.")
+
+    return board_id, record_type, key
+
+
+class BoardExport:
+    """
+    Iterator over the records of a set of boards.
+
+    Boards are read in id order and each record type of a board is read
+    with its own query, iterated on the server side in chunks, so memory
+    stays constant regardless of the size of a board or the number of
+    boards. Every record carries a cursor; passing the cursor of the
+    last record received as `after` resumes an interrupted export
+    right behind it. `cursor` holds the cursor of the last record
+    yielded so far.
+    """
+
+    def __init__(self, boards, record_types=RECORD_TYPES, after=None, chunk_size=500):
+        """
+        Args:
+            boards: Queryset of the boards to export.
+            record_types: Record types to include.
+            after: Cursor of the last record already exported, or None.
+            chunk_size: Rows fetched from the database at a time.
+
+        Raises:
+            ExportCursorError: If `after` is malformed.
+        """
+        self.boards = boards
+        self.record_types = [
+            record_type for record_type in RECORD_TYPES if record_type in record_types
+        ]
+        self.after = parse_cursor(after) if after else None
+        self.chunk_size = chunk_size
+        self.cursor = after
+
+    def __iter__(self):
+        """
+        Yield `(record_type, cursor, row)` for every exported record.
+        """
+        boards = self.boards.order_by("id")
+
+        if self.after is not None:
+            boards = boards.filter(id__gte=self.after[0])
+
+        rows = boards.values(*RECORD_COLUMNS["board"]).iterator(chunk_size=self.chunk_size)
+
+        for board in rows:
+            for record_type in self.record_types:
+                after_key = self.get_after_key(board["id"], record_type)
+
+                if after_key is False:
+                    continue
+
+                if record_type == "board":
+                    records = [] if after_key is not None else [board]
+                else:
+                    records = self.get_queryset(record_type, board["id"], after_key).iterator(
+                        chunk_size=self.chunk_size
+                    )
+
+                key = RECORD_KEYS[record_type]
+
+                for row in records:
+                    self.cursor = format_cursor(board["id"], record_type, row[key])
+                    yield record_type, self.cursor, row
+
+    def get_after_key(self, board_id, record_type):
+        """
+        Return the key after which to resume the records of a board, None
+        to export them all or False to skip them.
+        """
+        if self.after is None or board_id != self.after[0]:
+            return None
+
+        _, after_type, after_key = self.after
+        position = RECORD_TYPES.index(record_type)
+        after_position = RECORD_TYPES.index(after_type)
+
+        if position < after_position:
+            return False
+
+        return after_key if position == after_position else None
+
+    def get_queryset(self, record_type, board_id, after_key=None):
+        """
+        Return the ordered rows of one record type of a board.
+        """
+        key = RECORD_KEYS[record_type]
+
+        if record_type == "member":
+            queryset = (
+                Board.members.through.objects
+                .filter(board_id=board_id)
+                .values("board_id", "user_id", email=F("user__email"), fullname=F("user__username"))
+            )
+        elif record_type == "task":
+            queryset = Task.objects.filter(board_id=board_id).values(*RECORD_COLUMNS["task"])
+        else:
+            queryset = (
+                Comments.objects
+                .filter(task__board_id=board_id)
+                .values(
+                    *(column for column in RECORD_COLUMNS["comment"] if column != "board_id"),
+                    board_id=F("task__board_id"),
+                )
+            )
+
+        if after_key is not None:
+            queryset = queryset.filter(**{f"{key}__gt": after_key})
+
+        return queryset.order_by(key)
+
+
+def ndjson_chunks(records, chunk_size=500):
+    """
+    Yield the records as NDJSON bytes, `chunk_size` lines at a time.
+
+    Each line is `{"type": ..., "cursor": ..., "data": {...}}`.
+    """
+    lines = []
+
+    for record_type, cursor, row in records:
+        data = {column: row[column] for column in RECORD_COLUMNS[record_type]}
+        lines.append(json.dumps(
+            {"type": record_type, "cursor": cursor, "data": data},
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ))
+
+        if len(lines) == chunk_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_chunks(records, record_type, chunk_size=500, header=True):
+    """
+    Yield the records of one type as CSV bytes, `chunk_size` rows at a
+    time. The first column is the cursor. The header row is left out
+    when continuing an export.
+    """
+    columns = RECORD_COLUMNS[record_type]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+
+    if header:
+        writer.writerow(["cursor", *columns])
+
+    for _, cursor, row in records:
+        writer.writerow([cursor, *(format_csv_value(row[column]) for column in columns)])
+        count += 1
+
+        if count == chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+
+    yield buffer.getvalue().encode()
+
+
+def format_csv_value(value):
+    """
+    Return a CSV cell; empty for None, ISO 8601 for dates and times.
+    """
+    if value is None:
+        return ""
+
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return value
+
+
+def gzip_chunks(chunks):
+    """
+    Yield the chunks compressed as a single gzip stream.
+
+    Each chunk is flushed, so everything up to the last record of a
+    chunk can be decompressed as soon as the chunk is sent.
+    """
+    compressor = zlib.compressobj(wbits=31)
+
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    yield compressor.flush()
+
+
+def export_chunks(export, output="ndjson", compress=False):
+    """
+    Yield the encoded bytes of an export.
+
+    Args:
+        export: `BoardExport` to encode.
+        output: "ndjson" or "csv" (one record type only).
+        compress: Whether to gzip the output.
+    """
+    if output == "csv":
+        chunks = csv_chunks(
+            export, export.record_types[0], export.chunk_size, header=export.after is None
+        )
+    else:
+        chunks = ndjson_chunks(export, export.chunk_size)
+
+    return gzip_chunks(chunks) if compress else chunks
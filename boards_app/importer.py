@@ -0,0 +1,461 @@
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+
+from boards_app.counters import COUNTER_FIELDS, compute_counters
+from boards_app.export import RECORD_TYPES
+from boards_app.models import Board
+from core.api.streaming import chunked
+from tasks_app.models import Comments, Task
+
+
+# Model fields validated and written per record type.
+IMPORT_FIELDS = {
+    "board": {"title": Board._meta.get_field("title")},
+    "member": {},
+    "task": {
+        name: Task._meta.get_field(name)
+        for name in ("title", "description", "status", "priority", "due_date")
+    },
+    "comment": {
+        name: Comments._meta.get_field(name) for name in ("author", "content")
+    },
+}
+
+# User references per record type: field -> (id key, email key).
+USER_REFERENCES = {
+    "board": {"owner": ("owner_id", "owner_email")},
+    "member": {"user": ("user_id", "email")},
+    "task": {
+        "assignee": ("assignee_id", "assignee_email"),
+        "reviewer": ("reviewer_id", "reviewer_email"),
+        "created_by": ("created_by_id", "created_by_email"),
+    },
+    "comment": {},
+}
+
+REQUIRED_USERS = {"owner", "user"}
+
+# Parent record type and reference key per record type.
+PARENTS = {"member": ("board", "board_id"), "task": ("board", "board_id"), "comment": ("task", "task_id")}
+
+
+def is_source_id(value):
+    """
+    Return whether `value` is a valid id of the source system.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_user_key(key):
+    """
+    Return whether a user reference key has a valid value.
+    """
+    kind, value = key
+    return is_source_id(value) if kind == "id" else isinstance(value, str)
+
+
+def clean_fields(fields, data):
+    """
+    Validate the values of `data` with the given model fields.
+
+    Missing fields get their default if they have one or may be empty.
+
+    Returns:
+        tuple[dict, dict]: The cleaned values and the errors per field.
+    """
+    values = {}
+    errors = {}
+
+    for name, field in fields.items():
+        if name not in data:
+            if field.has_default() or field.blank or field.null:
+                values[name] = field.get_default()
+            else:
+                errors[name] = ["This field is required."]
+            continue
+
+        try:
+            values[name] = field.clean(data[name], None)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+
+    return values, errors
+
+
+class BoardImport:
+    """
+    Import of boards, members, tasks and comments from NDJSON lines.
+
+    Lines use the record format of the board export
+    (`{"type": ..., "data": {...}}`); ids in the data are those of the
+    source system and are mapped to the ids of the imported objects,
+    so parents must appear before their children, as in exports. Users
+    are referenced by id or, taking precedence, by email.
+
+    Lines are read lazily and processed in batches of `batch_size`:
+    each batch is validated with the model fields, its user references
+    are resolved with at most two queries (results are cached for the
+    whole import) and its rows are written with one `bulk_create` per
+    record type. Board saves, membership signals and the change log
+    are bypassed; the stored board counters and comment counts of the
+    affected objects are recomputed once per transaction of
+    `transaction_size` lines. Invalid records are rejected and
+    reported with their line number without stopping the import.
+    """
+
+    def __init__(self, batch_size=1000, transaction_size=20000, max_errors=100):
+        """
+        Args:
+            batch_size: Lines validated and written at a time.
+            transaction_size: Lines committed per transaction.
+            max_errors: Rejected lines reported with their errors.
+        """
+        self.batch_size = batch_size
+        self.transaction_size = max(transaction_size, batch_size)
+        self.max_errors = max_errors
+
+        self.board_ids = {}
+        self.task_ids = {}
+        self.users = {}
+        self.imported = dict.fromkeys(RECORD_TYPES, 0)
+        self.rejected = 0
+        self.errors = []
+        self.committed_lines = 0
+        self.elapsed = 0.0
+
+        self._touched_boards = set()
+        self._touched_tasks = set()
+
+    def run(self, lines):
+        """
+        Import the lines, yielding the report after every commit.
+
+        A transaction that fails is rolled back and its exception
+        propagates; everything reported before stays committed, and
+        `report()` is reset to it.
+        """
+        started = time.perf_counter()
+        per_transaction = self.transaction_size // self.batch_size
+
+        for batches in chunked(chunked(enumerate(lines, 1), self.batch_size), per_transaction):
+            committed = self.checkpoint()
+
+            try:
+                with transaction.atomic():
+                    for batch in batches:
+                        self.import_batch(batch)
+
+                    self.refresh_counters()
+            except Exception:
+                self.restore(committed)
+                raise
+
+            self.committed_lines = batches[-1][-1][0]
+            self.elapsed = time.perf_counter() - started
+            yield self.report()
+
+    def checkpoint(self):
+        """
+        Return the counts and id mappings as of the last commit.
+
+        The mappings only grow, so their sizes are enough to restore them.
+        """
+        return (
+            dict(self.imported),
+            self.rejected,
+            len(self.errors),
+            len(self.board_ids),
+            len(self.task_ids),
+        )
+
+    def restore(self, checkpoint):
+        """
+        Reset the counts and id mappings to a `checkpoint()` after the
+        transaction that followed it was rolled back.
+        """
+        imported, self.rejected, errors, boards, tasks = checkpoint
+        self.imported = imported
+        del self.errors[errors:]
+
+        for ids, size in ((self.board_ids, boards), (self.task_ids, tasks)):
+            for source_id in list(ids)[size:]:
+                del ids[source_id]
+
+        self._touched_boards.clear()
+        self._touched_tasks.clear()
+
+    def report(self):
+        """
+        Return the progress of the import.
+        """
+        records = sum(self.imported.values())
+
+        return {
+            "lines": self.committed_lines,
+            "imported": dict(self.imported),
+            "rejected": self.rejected,
+            "errors": list(self.errors),
+            "elapsed_s": round(self.elapsed, 3),
+            "records_per_s": round(records / self.elapsed) if self.elapsed else None,
+        }
+
+    def reject(self, line, record_type, errors):
+        """
+        Count a rejected line and keep its errors up to `max_errors`.
+        """
+        self.rejected += 1
+
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "type": record_type, "errors": errors})
+
+    def parse(self, line, text):
+        """
+        Return the type and data of a line, or None if it is rejected.
+        """
+        try:
+            record = json.loads(text)
+        except ValueError as exc:
+            self.reject(line, None, {"record": [f"Invalid JSON: {exc}."]})
+            return None
+
+        if not isinstance(record, dict):
+            self.reject(line, None, {"record": ["Expected an object."]})
+            return None
+
+        record_type = record.get("type")
+
+        if record_type not in RECORD_TYPES:
+            self.reject(line, None, {"type": [f"{record_type!r} is not a valid record type."]})
+            return None
+
+        if not isinstance(record.get("data"), dict):
+            self.reject(line, record_type, {"data": ["Expected an object."]})
+            return None
+
+        return record_type, record["data"]
+
+    def import_batch(self, batch):
+        """
+        Validate and write one batch of `(line number, text)` pairs.
+
+        Record types are written in export order, so a batch may
+        contain a parent after its children.
+        """
+        records = {record_type: [] for record_type in RECORD_TYPES}
+
+        for line, text in batch:
+            if not text.strip():
+                continue
+
+            parsed = self.parse(line, text)
+
+            if parsed is not None:
+                record_type, data = parsed
+                records[record_type].append((line, data))
+
+        self.resolve_users(
+            (record_type, data)
+            for record_type, items in records.items()
+            for _, data in items
+        )
+
+        self.write_boards(self.validate("board", records["board"]))
+        self.write_members(self.validate("member", records["member"]))
+        self.write_tasks(self.validate("task", records["task"]))
+        self.write_comments(self.validate("comment", records["comment"]))
+
+    def user_keys(self, record_type, data):
+        """
+        Yield `(field, key)` for the user references of a record, where
+        key is `("email", value)` or `("id", value)`.
+        """
+        for field, (id_key, email_key) in USER_REFERENCES[record_type].items():
+            if data.get(email_key) is not None:
+                yield field, ("email", data[email_key])
+            elif data.get(id_key) is not None:
+                yield field, ("id", data[id_key])
+
+    def resolve_users(self, records):
+        """
+        Load the users referenced by the records that are not cached
+        yet, with one query for ids and one for emails.
+        """
+        missing = {"id": set(), "email": set()}
+
+        for record_type, data in records:
+            for _, key in self.user_keys(record_type, data):
+                if is_user_key(key) and key not in self.users:
+                    missing[key[0]].add(key[1])
+
+        for kind, values in missing.items():
+            if not values:
+                continue
+
+            lookup = "pk__in" if kind == "id" else "email__in"
+            found = {}
+
+            for user_id, email in (
+                User.objects.filter(**{lookup: values}).order_by("-pk").values_list("pk", "email")
+            ):
+                found[user_id if kind == "id" else email] = user_id
+
+            for value in values:
+                self.users[(kind, value)] = found.get(value)
+
+    def validate(self, record_type, items):
+        """
+        Return `(line, source id, values)` of the valid records of one
+        type, with parents and users replaced by their ids, rejecting
+        the others.
+        """
+        valid = []
+        parent = PARENTS.get(record_type)
+        parent_ids = None if parent is None else (
+            self.board_ids if parent[0] == "board" else self.task_ids
+        )
+
+        for line, data in items:
+            values, errors = clean_fields(IMPORT_FIELDS[record_type], data)
+            source_id = data.get("id")
+
+            if record_type in ("board", "task") and source_id is not None:
+                if not is_source_id(source_id):
+                    errors["id"] = ["A valid integer is required."]
+                elif record_type == "board" and source_id in self.board_ids:
+                    errors["id"] = [f"Board {source_id} appears more than once."]
+                elif record_type == "task" and source_id in self.task_ids:
+                    errors["id"] = [f"Task {source_id} appears more than once."]
+
+            if parent is not None:
+                parent_type, key = parent
+                parent_id = data.get(key)
+
+                if parent_id is None:
+                    errors[key] = ["This field is required."]
+                elif not is_source_id(parent_id):
+                    errors[key] = ["A valid integer is required."]
+                elif parent_id not in parent_ids:
+                    errors[key] = [f"{parent_type.title()} {parent_id} is not part of the import."]
+                else:
+                    values[key] = parent_ids[parent_id]
+
+            references = dict(self.user_keys(record_type, data))
+
+            for field in USER_REFERENCES[record_type]:
+                key = references.get(field)
+
+                if key is None:
+                    if field in REQUIRED_USERS:
+                        errors[field] = ["This field is required."]
+                    continue
+
+                user_id = self.users.get(key) if is_user_key(key) else None
+
+                if user_id is None:
+                    errors[field] = [f"User with {key[0]} {key[1]!r} does not exist."]
+                else:
+                    values[f"{field}_id"] = user_id
+
+            if errors:
+                self.reject(line, record_type, errors)
+                continue
+
+            if record_type in ("board", "task") and source_id is not None:
+                # Reserve the id so later duplicates in the batch are rejected.
+                (self.board_ids if record_type == "board" else self.task_ids)[source_id] = None
+
+            valid.append((line, source_id, values))
+
+        return valid
+
+    def write_boards(self, items):
+        """
+        Insert boards and the owners' memberships.
+        """
+        boards = Board.objects.bulk_create(
+            [Board(**values) for _, _, values in items], batch_size=self.batch_size
+        )
+        Board.members.through.objects.bulk_create(
+            [Board.members.through(board_id=board.pk, user_id=board.owner_id) for board in boards],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+        for (_, source_id, _), board in zip(items, boards):
+            if source_id is not None:
+                self.board_ids[source_id] = board.pk
+            self._touched_boards.add(board.pk)
+
+        self.imported["board"] += len(boards)
+
+    def write_members(self, items):
+        """
+        Insert memberships; existing ones (such as owners) are skipped.
+        """
+        Board.members.through.objects.bulk_create(
+            [Board.members.through(**values) for _, _, values in items],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self._touched_boards.update(values["board_id"] for _, _, values in items)
+        self.imported["member"] += len(items)
+
+    def write_tasks(self, items):
+        """
+        Insert tasks.
+        """
+        tasks = Task.objects.bulk_create(
+            [Task(**values) for _, _, values in items], batch_size=self.batch_size
+        )
+
+        for (_, source_id, _), task in zip(items, tasks):
+            if source_id is not None:
+                self.task_ids[source_id] = task.pk
+            self._touched_boards.add(task.board_id)
+
+        self.imported["task"] += len(tasks)
+
+    def write_comments(self, items):
+        """
+        Insert comments.
+        """
+        Comments.objects.bulk_create(
+            [Comments(**values) for _, _, values in items], batch_size=self.batch_size
+        )
+        self._touched_tasks.update(values["task_id"] for _, _, values in items)
+        self.imported["comment"] += len(items)
+
+    def refresh_counters(self):
+        """
+        Store the counters of the boards and the comment counts of the
+        tasks written since the last call, with one grouped query and
+        one bulk update per batch of objects.
+        """
+        for board_ids in chunked(sorted(self._touched_boards), self.batch_size):
+            counters = compute_counters(board_ids)
+            Board.objects.bulk_update(
+                [Board(pk=board_id, **values) for board_id, values in counters.items()],
+                COUNTER_FIELDS,
+            )
+
+        for task_ids in chunked(sorted(self._touched_tasks), self.batch_size):
+            counts = (
+                Comments.objects
+                .filter(task_id__in=task_ids)
+                .values("task_id")
+                .annotate(total=Count("id"))
+                .order_by()
+                .values_list("task_id", "total")
+            )
+            Task.objects.bulk_update(
+                [Task(pk=task_id, comments_count=total) for task_id, total in counts],
+                ["comments_count"],
+            )
+
+        self._touched_boards.clear()
+        self._touched_tasks.clear()
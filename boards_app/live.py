@@ -0,0 +1,278 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from boards_app.models import BoardChange
+from core.cache import configured_by
+
+
+DEFAULT_LIVE_UPDATES = {
+    "BROKER": "memory",
+    "MAX_QUEUE": 100,
+    "HEARTBEAT": 15,
+    "POLL_INTERVAL": 1.0,
+}
+
+# Returned by `Subscription.get()` once the subscriber fell too far behind.
+OVERFLOW = object()
+
+
+def live_updates_config():
+    """
+    Return the `LIVE_UPDATES` setting merged with its defaults.
+    """
+    return {
+        **DEFAULT_LIVE_UPDATES,
+        **getattr(settings, "LIVE_UPDATES", {}),
+    }
+
+
+def change_event(change):
+    """
+    Return the event published for a change log entry.
+    """
+    return {
+        "id": change.id,
+        "board": change.board_id,
+        "entity": change.entity,
+        "entity_id": change.entity_id,
+        "action": change.action,
+    }
+
+
+class Subscription:
+    """
+    Bounded queue of events for one subscriber of a board.
+
+    The queue belongs to the event loop the subscription was created on;
+    events from other threads are handed over through that loop. When
+    the queue is full the subscription is marked as overflowed instead
+    of blocking the publisher or growing without limit, and the
+    subscriber is expected to resync from the change feed.
+    """
+
+    def __init__(self, board_id, max_queue, on_close=None):
+        """
+        Create a subscription.
+
+        `cursor` is the id of the last change the subscriber knows;
+        events up to it are skipped. It is set by the subscriber after
+        subscribing, so no change can slip between the two.
+        """
+        self.board_id = board_id
+        self.cursor = 0
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+        self._on_close = on_close
+
+    def push(self, event):
+        """
+        Queue an event; must be called on the subscription's event loop.
+        """
+        if self.overflowed:
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """
+        Wait for the next event.
+
+        Returns:
+            dict | object | None: The event, `OVERFLOW` once events were
+            dropped, or None if nothing arrived within `timeout` seconds.
+        """
+        deadline = self.loop.time() + timeout
+
+        while not self.overflowed:
+            try:
+                event = await asyncio.wait_for(
+                    self.queue.get(), max(deadline - self.loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                return None
+
+            if event["id"] > self.cursor:
+                self.cursor = event["id"]
+                return event
+
+        return OVERFLOW
+
+    def close(self):
+        """
+        Stop receiving events.
+        """
+        if self._on_close is not None:
+            self._on_close(self)
+            self._on_close = None
+
+
+class InMemoryBroker:
+    """
+    Broker delivering events to subscribers in the same process.
+
+    Suitable for a single ASGI worker: events published by a request
+    handled in this process reach every subscriber of the board.
+    """
+
+    def __init__(self, max_queue):
+        """
+        Create a broker without subscribers.
+        """
+        self.max_queue = max_queue
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, board_id):
+        """
+        Return a subscription to the events of a board.
+        """
+        subscription = Subscription(
+            board_id, self.max_queue, on_close=self._unsubscribe
+        )
+
+        with self._lock:
+            self._subscriptions[board_id].add(subscription)
+
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        """
+        Remove a closed subscription.
+        """
+        with self._lock:
+            subscriptions = self._subscriptions[subscription.board_id]
+            subscriptions.discard(subscription)
+
+            if not subscriptions:
+                del self._subscriptions[subscription.board_id]
+
+    def publish(self, board_id, event):
+        """
+        Hand an event to every subscriber of the board without blocking.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(board_id, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self._unsubscribe(subscription)
+
+
+class PollingSubscription(Subscription):
+    """
+    Subscription reading its events from the board change log.
+    """
+
+    def __init__(self, board_id, max_queue, poll_interval):
+        """
+        Create a subscription polling every `poll_interval` seconds.
+        """
+        super().__init__(board_id, max_queue)
+        self.poll_interval = poll_interval
+        self._fetched = None
+
+    def _fetch(self):
+        """
+        Return the change log entries after the last fetched one.
+        """
+        fetched = self.cursor if self._fetched is None else self._fetched
+
+        return [
+            change_event(change)
+            for change in (
+                BoardChange.objects
+                .filter(board_id=self.board_id, id__gt=fetched)
+                .order_by("id")[:self.queue.maxsize + 1]
+            )
+        ]
+
+    async def get(self, timeout):
+        """
+        Poll the change log until an event arrives or `timeout` passes.
+        """
+        deadline = self.loop.time() + timeout
+
+        while self.queue.empty() and not self.overflowed:
+            events = await sync_to_async(self._fetch)()
+
+            for event in events:
+                self.push(event)
+
+            if events:
+                self._fetched = events[-1]["id"]
+                break
+
+            remaining = deadline - self.loop.time()
+
+            if remaining <= 0:
+                return None
+
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+        return await super().get(timeout)
+
+
+class ChangeLogBroker:
+    """
+    Broker for several worker processes sharing one database.
+
+    Publishing is a no-op, since every change is already persisted in
+    the board change log; subscribers poll the log instead. Slow
+    subscribers overflow once more events are pending than fit into
+    their queue.
+    """
+
+    def __init__(self, max_queue, poll_interval):
+        """
+        Create a broker with the given queue size and poll interval.
+        """
+        self.max_queue = max_queue
+        self.poll_interval = poll_interval
+
+    def subscribe(self, board_id):
+        """
+        Return a subscription polling the change log of a board.
+        """
+        return PollingSubscription(board_id, self.max_queue, self.poll_interval)
+
+    def publish(self, board_id, event):
+        """
+        Do nothing; subscribers read the change log directly.
+        """
+
+
+@configured_by("LIVE_UPDATES")
+def get_broker():
+    """
+    Return the broker configured by the `LIVE_UPDATES` setting.
+    """
+    config = live_updates_config()
+
+    if config["BROKER"] == "changelog":
+        return ChangeLogBroker(
+            max_queue=config["MAX_QUEUE"],
+            poll_interval=config["POLL_INTERVAL"],
+        )
+
+    return InMemoryBroker(max_queue=config["MAX_QUEUE"])
+
+
+def publish_changes(changes):
+    """
+    Publish change log entries to the subscribers of their boards.
+    """
+    broker = get_broker()
+
+    for change in changes:
+        broker.publish(change.board_id, change_event(change))
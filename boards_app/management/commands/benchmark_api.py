@@ -0,0 +1,351 @@
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from boards_app.management.commands.generate_dataset import (
+    BENCHMARK_PASSWORD,
+    USERNAME_PREFIX,
+)
+from boards_app.models import Board
+from core.benchmarks import QueryCounter, summarize_latencies
+
+
+def _board_list(client, ctx):
+    return client.get("/api/boards/")
+
+
+def _board_create(client, ctx):
+    response = client.post(
+        "/api/boards/",
+        {"title": "Benchmark board", "members": ctx["member_ids"]},
+        format="json",
+    )
+    ctx["new_board_id"] = response.data["id"]
+    return response
+
+
+def _board_detail(client, ctx):
+    return client.get(f"/api/boards/{ctx['board_id']}/")
+
+
+def _board_update(client, ctx):
+    return client.patch(
+        f"/api/boards/{ctx['new_board_id']}/",
+        {"title": "Benchmark board (renamed)"},
+        format="json",
+    )
+
+
+def _board_delete(client, ctx):
+    return client.delete(f"/api/boards/{ctx['new_board_id']}/")
+
+
+def _tasks_assigned(client, ctx):
+    return client.get("/api/tasks/assigned-to-me/")
+
+
+def _tasks_reviewing(client, ctx):
+    return client.get("/api/tasks/reviewing/")
+
+
+def _task_create(client, ctx):
+    response = client.post(
+        "/api/tasks/",
+        {
+            "board": ctx["board_id"],
+            "title": "Benchmark task",
+            "description": "Created by benchmark_api.",
+            "status": "todo",
+            "priority": "high",
+            "assignee_id": ctx["user_id"],
+            "reviewer_id": ctx["member_ids"][-1],
+            "due_date": "2025-06-01",
+        },
+        format="json",
+    )
+    ctx["new_task_id"] = response.data["id"]
+    return response
+
+
+def _task_detail(client, ctx):
+    return client.get(f"/api/tasks/{ctx['task_id']}/")
+
+
+def _task_update(client, ctx):
+    return client.patch(
+        f"/api/tasks/{ctx['new_task_id']}/",
+        {"status": "in_progress", "priority": "medium"},
+        format="json",
+    )
+
+
+def _comment_list(client, ctx):
+    return client.get(f"/api/tasks/{ctx['task_id']}/comments/")
+
+
+def _comment_create(client, ctx):
+    response = client.post(
+        f"/api/tasks/{ctx['new_task_id']}/comments/",
+        {"content": "Benchmark comment."},
+        format="json",
+    )
+    ctx["new_comment_id"] = response.data["id"]
+    return response
+
+
+def _comment_delete(client, ctx):
+    return client.delete(
+        f"/api/tasks/{ctx['new_task_id']}/comments/{ctx['new_comment_id']}/"
+    )
+
+
+def _task_delete(client, ctx):
+    return client.delete(f"/api/tasks/{ctx['new_task_id']}/")
+
+
+def _user_list(client, ctx):
+    return client.get("/api/user/")
+
+
+def _user_detail(client, ctx):
+    return client.get(f"/api/user/{ctx['user_id']}/")
+
+
+def _email_check(client, ctx):
+    return client.get("/api/email-check/", {"email": ctx["email"]})
+
+
+def _login(client, ctx):
+    return client.post(
+        "/api/login/",
+        {"email": ctx["email"], "password": BENCHMARK_PASSWORD},
+        format="json",
+    )
+
+
+def _registration(client, ctx):
+    name = f"{USERNAME_PREFIX}reg_{uuid.uuid4().hex[:12]}"
+    return client.post(
+        "/api/registration/",
+        {
+            "fullname": name,
+            "email": f"{name}@example.com",
+            "password": BENCHMARK_PASSWORD,
+            "repeated_password": BENCHMARK_PASSWORD,
+        },
+        format="json",
+    )
+
+
+def build_context():
+    """
+    Pick the benchmark user, board and task from the generated dataset.
+    """
+    user = (
+        User.objects
+        .filter(username__startswith=USERNAME_PREFIX)
+        .annotate(board_total=Count("boards"))
+        .order_by("-board_total", "pk")
+        .first()
+    )
+
+    if user is None:
+        raise CommandError("No generated dataset found. Run generate_dataset first.")
+
+    board = user.boards.order_by("-ticket_count", "pk").first()
+    task = board.tasks.order_by("-comments_count", "pk").first() if board else None
+
+    if task is None:
+        raise CommandError("The benchmark user has no board with tasks.")
+
+    member_ids = list(
+        board.members.order_by("pk").values_list("pk", flat=True)[:5]
+    )
+
+    return {
+        "user_id": user.pk,
+        "email": user.email,
+        "token": Token.objects.get(user=user).key,
+        "board_id": board.pk,
+        "task_id": task.pk,
+        "member_ids": member_ids,
+        "member_count": board.member_count,
+        "ticket_count": board.ticket_count,
+    }
+
+
+# Endpoints in execution order. Write endpoints create the objects
+# that later steps of the same iteration update and delete again,
+# so repeated runs leave the dataset unchanged.
+ENDPOINTS = [
+    ("GET /api/boards/", _board_list, True),
+    ("POST /api/boards/", _board_create, True),
+    ("GET /api/boards/{id}/", _board_detail, True),
+    ("PATCH /api/boards/{id}/", _board_update, True),
+    ("DELETE /api/boards/{id}/", _board_delete, True),
+    ("GET /api/tasks/assigned-to-me/", _tasks_assigned, True),
+    ("GET /api/tasks/reviewing/", _tasks_reviewing, True),
+    ("POST /api/tasks/", _task_create, True),
+    ("GET /api/tasks/{id}/", _task_detail, True),
+    ("PATCH /api/tasks/{id}/", _task_update, True),
+    ("GET /api/tasks/{id}/comments/", _comment_list, True),
+    ("POST /api/tasks/{id}/comments/", _comment_create, True),
+    ("DELETE /api/tasks/{id}/comments/{id}/", _comment_delete, True),
+    ("DELETE /api/tasks/{id}/", _task_delete, True),
+    ("GET /api/user/", _user_list, True),
+    ("GET /api/user/{id}/", _user_detail, True),
+    ("GET /api/email-check/", _email_check, True),
+    ("POST /api/login/", _login, False),
+    ("POST /api/registration/", _registration, False),
+]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark every API endpoint in-process against the current database.
+
+    Requests are sent through the DRF test client as the generated user
+    with the most board memberships, against that user's largest board.
+    For each endpoint the command reports latency percentiles, SQL query
+    counts and response sizes as JSON, so runs can be diffed.
+    Run `generate_dataset` first.
+    """
+
+    help = "Benchmark all API endpoints and report latency, queries and bytes as JSON."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Measured requests per endpoint.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Unmeasured requests per endpoint before measuring.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            default=[],
+            help="Only run endpoints whose name contains this text (repeatable).",
+        )
+        parser.add_argument(
+            "--include-auth",
+            action="store_true",
+            help="Also benchmark login and registration (password hashing).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run all selected endpoints and emit the JSON report.
+        """
+        ctx = build_context()
+        endpoints = [
+            (name, request)
+            for name, request, default in ENDPOINTS
+            if (default or options["include_auth"])
+            and (
+                not options["endpoint"]
+                or any(part in name for part in options["endpoint"])
+            )
+        ]
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {ctx['token']}")
+        samples = {name: [] for name, _ in endpoints}
+        rounds = options["warmup"] + options["iterations"]
+
+        # Throttling would reject the repeated requests of one client.
+        with override_settings(
+            ALLOWED_HOSTS=["testserver"],
+            THROTTLING={**settings.THROTTLING, "ENABLED": False},
+        ):
+            for round_index in range(rounds):
+                measured = round_index >= options["warmup"]
+
+                for name, request in endpoints:
+                    sample = self._measure(client, request, ctx)
+
+                    if measured:
+                        samples[name].append(sample)
+
+        User.objects.filter(username__startswith=f"{USERNAME_PREFIX}reg_").delete()
+
+        report = {
+            "dataset": {
+                "users": User.objects.count(),
+                "boards": Board.objects.count(),
+                "board_members": ctx["member_count"],
+                "board_tasks": ctx["ticket_count"],
+            },
+            "iterations": options["iterations"],
+            "endpoints": {
+                name: self._summarize(endpoint_samples)
+                for name, endpoint_samples in samples.items()
+            },
+        }
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _measure(self, client, request, ctx):
+        """
+        Send one request and return its latency, query count, size and status.
+        """
+        with QueryCounter() as queries:
+            started = time.perf_counter()
+            response = request(client, ctx)
+
+            if response.streaming:
+                content = b"".join(response.streaming_content)
+            else:
+                content = response.content
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        return {
+            "latency_ms": elapsed_ms,
+            "queries": queries.count,
+            "bytes": len(content),
+            "status": response.status_code,
+        }
+
+    def _summarize(self, samples):
+        """
+        Aggregate the samples of one endpoint.
+        """
+        if not samples:
+            return {}
+
+        queries = [sample["queries"] for sample in samples]
+        sizes = [sample["bytes"] for sample in samples]
+
+        return {
+            **summarize_latencies([sample["latency_ms"] for sample in samples]),
+            "queries_mean": round(sum(queries) / len(queries), 2),
+            "queries_max": max(queries),
+            "bytes_mean": round(sum(sizes) / len(sizes)),
+            "status_codes": sorted({sample["status"] for sample in samples}),
+        }
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+
+from boards_app.management.commands.benchmark_api import build_context
+from core.benchmarks import summarize_latencies
+
+
+# Read endpoints with an async implementation behind ASYNC_READ_VIEWS.
+ENDPOINTS = {
+    "assigned": "/api/tasks/assigned-to-me/",
+    "reviewing": "/api/tasks/reviewing/",
+    "boards": "/api/boards/",
+    "board-detail": "/api/boards/{board_id}/",
+}
+
+# Server setups to compare: (handler, ASYNC_READ_VIEWS).
+MODES = {
+    "wsgi": ("wsgi", False),
+    "asgi-sync": ("asgi", False),
+    "asgi": ("asgi", True),
+}
+
+
+class SimulatedLatency:
+    """
+    Execute wrapper delaying every statement, like a remote database.
+
+    Installed on every connection opened while active, since each
+    worker thread uses its own connection.
+    """
+
+    def __init__(self, latency_ms):
+        """
+        Create a wrapper adding `latency_ms` to every statement.
+        """
+        self.seconds = latency_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Wait, then execute the statement.
+        """
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        """
+        Add the wrapper to a newly created connection.
+
+        It is inserted as the outermost wrapper: `execute_wrapper()`
+        blocks entered before the connection opened remove the last
+        wrapper when they exit.
+        """
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, self)
+
+    def __enter__(self):
+        """
+        Start delaying statements on all new connections.
+        """
+        connections.close_all()
+        connection_created.connect(self.install)
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop delaying statements.
+        """
+        connection_created.disconnect(self.install)
+        connections.close_all()
+
+
+async def asgi_get(application, path, token):
+    """
+    Send a GET request straight to an ASGI application, as a server would.
+
+    Returns:
+        tuple[int, int]: Response status and body size.
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    received = False
+    response = {"status": None, "bytes": 0}
+
+    async def receive():
+        nonlocal received
+
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        # The client stays connected until the response is complete.
+        await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["bytes"] += len(message.get("body", b""))
+
+    await application(scope, receive, send)
+    return response["status"], response["bytes"]
+
+
+class Command(BaseCommand):
+    """
+    Compare the concurrency of the read endpoints under WSGI and ASGI.
+
+    Keeps `--concurrency` requests in flight against one endpoint and
+    reports throughput and client-side latency per server setup:
+
+    * `wsgi`: the synchronous views behind a thread pool of `--threads`
+      workers, like a threaded WSGI server.
+    * `asgi-sync`: the synchronous views under the ASGI handler, each
+      request running in a thread.
+    * `asgi`: the async views (`ASYNC_READ_VIEWS`) under the ASGI
+      handler, awaiting the database instead of occupying a worker.
+
+    `--db-latency-ms` adds a delay to every SQL statement to model a
+    database across the network, where most of a request is spent
+    waiting. Run `generate_dataset` first.
+    """
+
+    help = "Benchmark read endpoint concurrency under WSGI and ASGI as JSON."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--endpoint",
+            choices=sorted(ENDPOINTS),
+            default="assigned",
+            help="Endpoint to request.",
+        )
+        parser.add_argument(
+            "--mode",
+            action="append",
+            choices=sorted(MODES),
+            default=[],
+            help="Server setup to benchmark (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Measured requests per mode.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Requests kept in flight by the client.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Worker threads of the simulated WSGI server.",
+        )
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=0,
+            help="Delay added to every SQL statement.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run every selected mode and emit the JSON report.
+        """
+        ctx = build_context()
+        path = ENDPOINTS[options["endpoint"]].format(**ctx)
+        modes = options["mode"] or list(MODES)
+        results = {}
+
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            with SimulatedLatency(options["db_latency_ms"]):
+                for mode in modes:
+                    handler, async_views = MODES[mode]
+
+                    with override_settings(ASYNC_READ_VIEWS=async_views):
+                        if handler == "wsgi":
+                            samples, elapsed = self._run_wsgi(path, ctx["token"], options)
+                        else:
+                            samples, elapsed = asyncio.run(
+                                self._run_asgi(path, ctx["token"], options)
+                            )
+
+                    results[mode] = self._summarize(samples, elapsed)
+
+        report = {
+            "endpoint": path,
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "wsgi_threads": options["threads"],
+            "db_latency_ms": options["db_latency_ms"],
+            "modes": results,
+        }
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _run_wsgi(self, path, token, options):
+        """
+        Send the requests through a fixed pool of WSGI worker threads.
+
+        Latency is measured from when the client sends a request, so it
+        includes the time spent waiting for a free worker.
+        """
+        local = threading.local()
+        in_flight = threading.Semaphore(options["concurrency"])
+
+        def request(sent):
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+
+            try:
+                response = local.client.get(path)
+                return time.perf_counter() - sent, response.status_code, len(response.content)
+            finally:
+                in_flight.release()
+
+        futures = []
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            for _ in range(options["requests"]):
+                in_flight.acquire()
+                futures.append(pool.submit(request, time.perf_counter()))
+
+            samples = [future.result() for future in futures]
+
+        return samples, time.perf_counter() - started
+
+    async def _run_asgi(self, path, token, options):
+        """
+        Send the requests to the ASGI application on one event loop.
+        """
+        application = get_asgi_application()
+        in_flight = asyncio.Semaphore(options["concurrency"])
+
+        async def request():
+            async with in_flight:
+                sent = time.perf_counter()
+                status, size = await asgi_get(application, path, token)
+                return time.perf_counter() - sent, status, size
+
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(request() for _ in range(options["requests"])))
+        return samples, time.perf_counter() - started
+
+    def _summarize(self, samples, elapsed):
+        """
+        Aggregate the samples of one mode.
+        """
+        return {
+            **summarize_latencies([latency * 1000 for latency, _, _ in samples]),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "wall_s": round(elapsed, 3),
+            "bytes_mean": round(sum(size for _, _, size in samples) / len(samples)),
+            "status_codes": sorted({status for _, status, _ in samples}),
+        }
@@ -0,0 +1,182 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import prefetch_related_objects
+from rest_framework.renderers import JSONRenderer
+
+from boards_app.api.serializers import BoardDetailSerializer, BoardListSerializer
+from boards_app.api.views import board_detail_prefetches
+from boards_app.management.commands.benchmark_api import build_context
+from boards_app.models import Board
+from core.api.rows import get_row_plan
+from core.api.sparse import SparseFieldset
+from core.benchmarks import QueryCounter, summarize_latencies
+from tasks_app.api.serializers import TaskListSerializer
+from tasks_app.models import Task
+
+
+def _board_detail(ctx, page_size):
+    """
+    The largest board of the benchmark user with members and tasks.
+    """
+    boards = Board.objects.filter(pk=ctx["board_id"])
+    plan = get_row_plan(BoardDetailSerializer)
+
+    def serialize():
+        board = boards.get()
+        prefetch_related_objects([board], *board_detail_prefetches(SparseFieldset()))
+        return BoardDetailSerializer(board).data
+
+    return {
+        "serializer": serialize,
+        "rows": lambda: plan.render_rows(list(plan.values(boards)))[0],
+        "objects": ctx["ticket_count"] + ctx["member_count"] + 1,
+    }
+
+
+def _task_page(ctx, page_size):
+    """
+    One page of the task list of that board.
+    """
+    tasks = Task.objects.filter(board_id=ctx["board_id"]).order_by("id")[:page_size]
+    plan = get_row_plan(TaskListSerializer)
+    return {
+        "serializer": lambda: TaskListSerializer(
+            tasks.select_related("assignee", "reviewer"), many=True
+        ).data,
+        "rows": lambda: plan.render_rows(list(plan.values(tasks))),
+        "objects": min(page_size, ctx["ticket_count"]),
+    }
+
+
+def _board_page(ctx, page_size):
+    """
+    One page of the board list.
+    """
+    boards = Board.objects.order_by("id")[:page_size]
+    plan = get_row_plan(BoardListSerializer)
+    return {
+        "serializer": lambda: BoardListSerializer(boards.all(), many=True).data,
+        "rows": lambda: plan.render_rows(list(plan.values(boards))),
+        "objects": min(page_size, Board.objects.count()),
+    }
+
+
+PAYLOADS = {
+    "board-detail": _board_detail,
+    "task-page": _task_page,
+    "board-page": _board_page,
+}
+
+
+class Command(BaseCommand):
+    """
+    Compare DRF serializers with row plans on the read payloads.
+
+    Builds each payload from the database both ways: model instances
+    rendered by the serializer (with the prefetches of the views), and
+    `.values()` rows rendered by the row plan (core/api/rows.py). Both
+    results are rendered to JSON and must be identical. Reports build
+    time percentiles, queries and objects per second per variant as
+    JSON. Run `generate_dataset` first.
+    """
+
+    help = "Benchmark serializer vs. row plan rendering of read payloads as JSON."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--payload",
+            action="append",
+            choices=sorted(PAYLOADS),
+            default=[],
+            help="Payload to build (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=30,
+            help="Measured builds per payload and variant.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=3,
+            help="Unmeasured builds before measuring.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=200,
+            help="Objects per list page.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Build every selected payload both ways and emit the JSON report.
+        """
+        ctx = build_context()
+        renderer = JSONRenderer()
+        results = {}
+
+        for name in options["payload"] or list(PAYLOADS):
+            payload = PAYLOADS[name](ctx, options["page_size"])
+            serializer_bytes = renderer.render(payload["serializer"]())
+            rows_bytes = renderer.render(payload["rows"]())
+
+            if serializer_bytes != rows_bytes:
+                raise CommandError(f"The row plan output of {name} differs from the serializer.")
+
+            results[name] = {
+                "objects": payload["objects"],
+                "bytes": len(rows_bytes),
+                "variants": {
+                    variant: self._measure(payload[variant], renderer, payload["objects"], options)
+                    for variant in ("serializer", "rows")
+                },
+            }
+            serializer_ms = results[name]["variants"]["serializer"]["mean_ms"]
+            rows_ms = results[name]["variants"]["rows"]["mean_ms"]
+            results[name]["speedup"] = round(serializer_ms / rows_ms, 2) if rows_ms else None
+
+        report = {
+            "page_size": options["page_size"],
+            "iterations": options["iterations"],
+            "payloads": results,
+        }
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _measure(self, build, renderer, objects, options):
+        """
+        Time building and rendering one payload variant.
+        """
+        latencies = []
+        queries = 0
+
+        for index in range(options["warmup"] + options["iterations"]):
+            with QueryCounter() as counter:
+                started = time.perf_counter()
+                renderer.render(build())
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if index >= options["warmup"]:
+                latencies.append(elapsed_ms)
+                queries = counter.count
+
+        summary = summarize_latencies(latencies)
+        summary["queries"] = queries
+        summary["objects_per_s"] = round(objects / (summary["mean_ms"] / 1000))
+        return summary
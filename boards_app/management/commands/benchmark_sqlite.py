@@ -0,0 +1,174 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from boards_app.management.commands.benchmark_api import build_context
+from core.benchmarks import run_load_worker, setup_worker, summarize_latencies
+from core.database import SQLITE_PROFILES
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Compare the SQLite connection profiles under concurrent reads and writes.
+
+    For every profile (core/database.py), copies the current database
+    to a temporary file and runs `--processes` worker processes with
+    `--threads` threads each against it, like a multi-process server
+    with threaded workers. Each thread sends board detail and task
+    list reads and task status writes through the full request stack
+    for `--duration` seconds. Reports throughput, latency percentiles
+    per operation kind and failed requests ("database is locked") per
+    profile as JSON. Run `generate_dataset` first.
+    """
+
+    help = "Benchmark SQLite profiles with concurrent readers and writers as JSON."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(SQLITE_PROFILES),
+            default=[],
+            help="Database profile to benchmark (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=4,
+            help="Worker processes.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Threads per worker process.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10,
+            help="Seconds of load per profile.",
+        )
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Share of operations that are writes.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the workload once per profile and emit the JSON report.
+        """
+        database = settings.DATABASES["default"]
+
+        if database["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("The default database is not SQLite.")
+
+        ctx = build_context()
+        ctx["task_ids"] = list(
+            Task.objects.filter(board_id=ctx["board_id"]).values_list("pk", flat=True)
+        )
+        ctx["statuses"] = [status for status, _ in Task.STATUS_CHOICES]
+        connections.close_all()
+        results = {}
+
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options["profile"] or list(SQLITE_PROFILES):
+                path = os.path.join(directory, f"{profile}.sqlite3")
+                self._copy_database(database["NAME"], path)
+                results[profile] = self._run_profile(profile, path, ctx, options)
+
+        if "default" in results and "production" in results:
+            default_ops = results["default"]["throughput_ops"]
+            results["production"]["speedup"] = (
+                round(results["production"]["throughput_ops"] / default_ops, 2)
+                if default_ops else None
+            )
+
+        report = {
+            "processes": options["processes"],
+            "threads": options["threads"],
+            "duration_s": options["duration"],
+            "write_ratio": options["write_ratio"],
+            "profiles": results,
+        }
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _copy_database(self, source, target):
+        """
+        Copy the database in rollback journal mode, so every profile
+        starts from the same file whatever mode the source is in.
+        """
+        with closing(sqlite3.connect(source)) as connection:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        shutil.copyfile(source, target)
+
+        with closing(sqlite3.connect(target)) as connection:
+            connection.execute("PRAGMA journal_mode=DELETE")
+
+    def _run_profile(self, profile, path, ctx, options):
+        """
+        Run the worker processes against one copy of the database.
+        """
+        environ = {"DATABASE_PROFILE": profile, "DATABASE_PATH": path}
+        context = multiprocessing.get_context("spawn")
+        # Leave time for the workers to start before the load begins.
+        start_at = time.time() + 2 + options["processes"] * 0.5
+
+        with context.Pool(
+            options["processes"], initializer=setup_worker, initargs=(environ,)
+        ) as pool:
+            outcomes = pool.starmap(run_load_worker, [
+                (ctx, options["threads"], start_at, options["duration"],
+                 options["write_ratio"], seed)
+                for seed in range(options["processes"])
+            ])
+
+        reads = [latency for outcome in outcomes for latency in outcome["read"]]
+        writes = [latency for outcome in outcomes for latency in outcome["write"]]
+        operations = len(reads) + len(writes)
+
+        return {
+            "throughput_ops": round(operations / options["duration"], 1),
+            "reads": self._summarize(reads, options["duration"]),
+            "writes": self._summarize(writes, options["duration"]),
+            "errors": sum(outcome["errors"] for outcome in outcomes),
+        }
+
+    def _summarize(self, latencies, duration):
+        """
+        Aggregate the latencies of one operation kind.
+        """
+        if not latencies:
+            return {"count": 0}
+
+        return {
+            "count": len(latencies),
+            "ops_per_s": round(len(latencies) / duration, 1),
+            **summarize_latencies(latencies),
+        }
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from boards_app.changes import compact_changes
+
+
+class Command(BaseCommand):
+    """
+    Compact the board change log.
+
+    Removes entries superseded by a newer entry for the same object
+    and entries older than the retention period. Clients whose cursor
+    predates the removed entries must reload the board.
+    """
+
+    help = "Remove superseded and expired entries from the board change log."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.BOARD_CHANGES["RETENTION_DAYS"],
+            help="Age in days after which change log entries are removed.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Compact the change log in one transaction and report the result.
+        """
+        with transaction.atomic():
+            superseded, expired = compact_changes(options["retention_days"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {superseded} superseded and {expired} expired change log entries."
+            )
+        )
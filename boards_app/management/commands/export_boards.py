@@ -0,0 +1,136 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.export import (
+    EXPORT_FORMATS,
+    RECORD_TYPES,
+    BoardExport,
+    ExportCursorError,
+    export_chunks,
+)
+from boards_app.models import Board
+
+
+class Command(BaseCommand):
+    """
+    Export boards with their members, tasks and comments.
+
+    Writes NDJSON (all record types) or CSV (one record type), optionally
+    gzipped, to a file or stdout. Records are read and encoded in chunks,
+    so memory stays constant regardless of the number of boards. If the
+    export is interrupted, the cursor of the last record written is
+    reported; rerunning with `--after` appends the rest to the same file.
+    """
+
+    help = "Export boards, members, tasks and comments as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--output-format",
+            choices=EXPORT_FORMATS,
+            default="ndjson",
+            help="ndjson for all record types, csv for a single one.",
+        )
+        parser.add_argument(
+            "--records",
+            action="append",
+            choices=RECORD_TYPES,
+            default=[],
+            help="Record type to export (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--board",
+            action="append",
+            type=int,
+            default=[],
+            help="Board id to export (repeatable, default: all boards).",
+        )
+        parser.add_argument(
+            "--after",
+            help="Cursor of the last record already exported, to resume an export.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the export with gzip.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the export to this file instead of stdout (appended with --after).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.STREAMING["CHUNK_SIZE"],
+            help="Rows read and encoded at a time.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Write the export chunk by chunk and report the resume cursor if
+        it is interrupted.
+        """
+        record_types = options["records"] or list(RECORD_TYPES)
+
+        if options["output_format"] == "csv" and len(set(record_types)) != 1:
+            raise CommandError("CSV exports contain exactly one record type (--records).")
+
+        boards = Board.objects.all()
+
+        if options["board"]:
+            boards = boards.filter(pk__in=options["board"])
+
+        try:
+            export = BoardExport(
+                boards,
+                record_types=record_types,
+                after=options["after"],
+                chunk_size=options["chunk_size"],
+            )
+        except ExportCursorError as exc:
+            raise CommandError(str(exc))
+
+        chunks = export_chunks(export, options["output_format"], options["gzip"])
+
+        if options["output"]:
+            mode = "ab" if options["after"] else "wb"
+
+            with open(options["output"], mode) as file:
+                self._write(chunks, file, export)
+
+            self.stderr.write(self.style.SUCCESS(f"Exported to {options['output']}."))
+        else:
+            self._write(chunks, sys.stdout.buffer, export)
+
+    def _write(self, chunks, file, export):
+        """
+        Write the chunks to the file.
+
+        A chunk is complete once the encoder has consumed all of its
+        records, so after each write the export's cursor is that of the
+        last record written.
+        """
+        written = export.cursor
+
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+                written = export.cursor
+        except (KeyboardInterrupt, Exception) as exc:
+            file.flush()
+
+            if written:
+                self.stderr.write(
+                    f"Export interrupted; rerun with --after {written} to resume."
+                )
+
+            if isinstance(exc, KeyboardInterrupt):
+                raise
+            raise CommandError(f"Export failed: {exc}") from exc
+
+        file.flush()
@@ -0,0 +1,241 @@
+import datetime
+import heapq
+import itertools
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from boards_app.models import Board
+from tasks_app.models import Comments, Task
+
+
+USERNAME_PREFIX = "bench_user_"
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+    """
+    Generate a deterministic synthetic dataset for benchmarking.
+
+    All rows are written with `bulk_create`. The same seed and scale
+    always produce the same users, boards, tasks, comments and tokens.
+    Board membership is skewed: a few boards have most of the users,
+    and a few users are members of most boards.
+    Stored counters are recomputed by the existing repair commands
+    once all rows are in place.
+    """
+
+    help = "Generate a deterministic synthetic dataset for benchmarks."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Scale factor applied to all row counts.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Seed for the random number generator.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows per bulk insert.",
+        )
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete a previously generated dataset first.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Generate users, boards, memberships, tasks and comments.
+        """
+        scale = options["scale"]
+        batch_size = options["batch_size"]
+        rng = random.Random(options["seed"])
+
+        generated = User.objects.filter(username__startswith=USERNAME_PREFIX)
+
+        if generated.exists():
+            if not options["flush"]:
+                raise CommandError(
+                    "A generated dataset already exists. Use --flush to replace it."
+                )
+            generated.delete()
+
+        user_count = max(2, int(100 * scale))
+        board_count = max(1, int(20 * scale))
+        task_count = int(2000 * scale)
+        comment_count = int(4000 * scale)
+
+        with transaction.atomic():
+            users = self._create_users(rng, user_count, batch_size)
+            boards, board_members = self._create_boards(
+                rng, users, board_count, batch_size
+            )
+            tasks = self._create_tasks(
+                rng, boards, board_members, task_count, batch_size
+            )
+            self._create_comments(
+                rng, tasks, board_members, comment_count, batch_size
+            )
+
+        call_command("repair_board_counters", verbosity=0, stdout=self.stdout)
+        call_command("backfill_comments_count", stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(users)} users, {len(boards)} boards, "
+                f"{len(tasks)} tasks and {comment_count} comments."
+            )
+        )
+
+    def _create_users(self, rng, count, batch_size):
+        """
+        Create users with a shared password hash and deterministic tokens.
+        """
+        password = make_password(BENCHMARK_PASSWORD)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{USERNAME_PREFIX}{index}",
+                    email=f"{USERNAME_PREFIX}{index}@example.com",
+                    password=password,
+                )
+                for index in range(count)
+            ],
+            batch_size=batch_size,
+        )
+
+        Token.objects.bulk_create(
+            [
+                Token(key=f"{rng.getrandbits(160):040x}", user=user)
+                for user in users
+            ],
+            batch_size=batch_size,
+        )
+
+        return users
+
+    def _create_boards(self, rng, users, count, batch_size):
+        """
+        Create boards with a Zipf-like distribution of member counts.
+
+        Members are drawn by weighted sampling without replacement, with
+        weights favouring low indexes, so the first users are members
+        of many boards.
+
+        Returns:
+            tuple: The boards and a mapping of board id to member user ids.
+        """
+        boards = Board.objects.bulk_create(
+            [
+                Board(title=f"Board {index}", owner=rng.choice(users))
+                for index in range(count)
+            ],
+            batch_size=batch_size,
+        )
+
+        through = Board.members.through
+        memberships = []
+        board_members = {}
+
+        for rank, board in enumerate(boards):
+            size = max(1, int(len(users) / (rank + 1)))
+            keyed_users = (
+                (rng.random() ** (index + 1), user.id)
+                for index, user in enumerate(users)
+            )
+            members = {user_id for _, user_id in heapq.nlargest(size, keyed_users)}
+            members.add(board.owner_id)
+
+            board_members[board.id] = sorted(members)
+            memberships.extend(
+                through(board_id=board.id, user_id=user_id)
+                for user_id in board_members[board.id]
+            )
+
+        through.objects.bulk_create(memberships, batch_size=batch_size)
+
+        return boards, board_members
+
+    def _create_tasks(self, rng, boards, board_members, count, batch_size):
+        """
+        Create tasks across all statuses and priorities.
+
+        Large boards receive proportionally more tasks, and most tasks
+        are done, mirroring long-lived real boards.
+        """
+        statuses = [value for value, _ in Task.STATUS_CHOICES]
+        priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+        board_weights = list(
+            itertools.accumulate(len(board_members[board.id]) for board in boards)
+        )
+        base_date = datetime.date(2025, 1, 1)
+        tasks = []
+
+        for index in range(count):
+            board = rng.choices(boards, cum_weights=board_weights)[0]
+            members = board_members[board.id]
+            tasks.append(
+                Task(
+                    board=board,
+                    created_by_id=rng.choice(members),
+                    title=f"Task {index}",
+                    description=f"Generated task {index} on {board.title}.",
+                    status=rng.choices(statuses, weights=[2, 1, 1, 6])[0],
+                    priority=rng.choices(priorities, weights=[3, 5, 2])[0],
+                    assignee_id=rng.choice(members) if rng.random() < 0.9 else None,
+                    reviewer_id=rng.choice(members) if rng.random() < 0.6 else None,
+                    due_date=(
+                        base_date + datetime.timedelta(days=rng.randint(-60, 120))
+                        if rng.random() < 0.7
+                        else None
+                    ),
+                )
+            )
+
+        return Task.objects.bulk_create(tasks, batch_size=batch_size)
+
+    def _create_comments(self, rng, tasks, board_members, count, batch_size):
+        """
+        Create comments, concentrated on a subset of busy tasks.
+        """
+        if not tasks:
+            return
+
+        usernames = dict(
+            User.objects
+            .filter(username__startswith=USERNAME_PREFIX)
+            .values_list("id", "username")
+        )
+        busy_tasks = tasks[: max(1, len(tasks) // 5)]
+        comments = []
+
+        for index in range(count):
+            task = rng.choice(busy_tasks if rng.random() < 0.8 else tasks)
+            author_id = rng.choice(board_members[task.board_id])
+            comments.append(
+                Comments(
+                    task=task,
+                    author=usernames[author_id],
+                    content=f"Generated comment {index}.",
+                )
+            )
+
+        Comments.objects.bulk_create(comments, batch_size=batch_size)
@@ -0,0 +1,102 @@
+import gzip
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from boards_app.importer import BoardImport
+
+
+class Command(BaseCommand):
+    """
+    Import boards, members, tasks and comments from NDJSON.
+
+    Reads the record format written by `export_boards` from a file
+    (gzipped if it ends in `.gz`) or stdin, line by line, and writes
+    it in batches with `bulk_create` inside chunked transactions (see
+    `BoardImport`). Progress is reported on stderr after every commit;
+    the final report with throughput and rejected lines is written as
+    JSON.
+    """
+
+    help = "Import boards, members, tasks and comments from NDJSON."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        config = settings.BOARD_IMPORT
+
+        parser.add_argument(
+            "path",
+            help="NDJSON file to import (.gz for gzip), or - for stdin.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config["BATCH_SIZE"],
+            help="Lines validated and written at a time.",
+        )
+        parser.add_argument(
+            "--transaction-size",
+            type=int,
+            default=config["TRANSACTION_SIZE"],
+            help="Lines committed per transaction.",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=config["MAX_ERRORS"],
+            help="Rejected lines reported with their errors.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the import and emit the JSON report.
+        """
+        importer = BoardImport(
+            batch_size=options["batch_size"],
+            transaction_size=options["transaction_size"],
+            max_errors=options["max_errors"],
+        )
+
+        if options["path"] == "-":
+            self._import(importer, sys.stdin.buffer)
+        else:
+            opener = gzip.open if options["path"].endswith(".gz") else open
+
+            try:
+                with opener(options["path"], "rb") as file:
+                    self._import(importer, file)
+            except FileNotFoundError as exc:
+                raise CommandError(str(exc))
+
+        output = json.dumps(importer.report(), indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def _import(self, importer, lines):
+        """
+        Import the lines, reporting progress after every commit.
+        """
+        try:
+            for report in importer.run(lines):
+                self.stderr.write(
+                    f"Committed {report['lines']} lines: "
+                    f"{sum(report['imported'].values())} records imported, "
+                    f"{report['rejected']} rejected, {report['records_per_s']} records/s."
+                )
+        except (DatabaseError, OSError, EOFError) as exc:
+            raise CommandError(
+                f"Import failed after line {importer.committed_lines} was committed: {exc}"
+            ) from exc
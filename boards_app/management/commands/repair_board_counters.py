@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from boards_app.counters import COUNTER_FIELDS, compute_counters
+from boards_app.models import Board
+
+
+class Command(BaseCommand):
+    """
+    Verify the counters stored on boards and repair any drift.
+
+    Boards are processed in primary key order and in fixed-size batches,
+    each batch being recounted and repaired inside its own transaction.
+    """
+
+    help = "Verify stored board counters and repair drift in batches."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of boards checked per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifting boards without repairing them.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Walk all boards in batches and compare stored with actual counters.
+        """
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        verbose = options["verbosity"] >= 1
+        last_id = 0
+        checked = 0
+        drifted = 0
+
+        while True:
+            with transaction.atomic():
+                boards = list(
+                    Board.objects
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .select_for_update()
+                    .only("pk", *COUNTER_FIELDS)[:batch_size]
+                )
+
+                if not boards:
+                    break
+
+                actual = compute_counters([board.pk for board in boards])
+                repaired = []
+
+                for board in boards:
+                    expected = actual[board.pk]
+                    stored = {field: getattr(board, field) for field in COUNTER_FIELDS}
+
+                    if stored == expected:
+                        continue
+
+                    if verbose:
+                        self.stdout.write(
+                            f"Board {board.pk}: stored {stored}, actual {expected}"
+                        )
+
+                    for field, value in expected.items():
+                        setattr(board, field, value)
+                    repaired.append(board)
+
+                if repaired and not dry_run:
+                    Board.objects.bulk_update(repaired, COUNTER_FIELDS)
+
+            checked += len(boards)
+            drifted += len(repaired)
+            last_id = boards[-1].pk
+
+        action = "found" if dry_run else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} boards, {action} {drifted} with drift."
+            )
+        )
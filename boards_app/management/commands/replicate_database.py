@@ -0,0 +1,77 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.routing import routing_config
+
+
+class Command(BaseCommand):
+    """
+    Copy the primary database to its read replicas.
+
+    SQLite has no replication, so this stands in for it: the primary is
+    copied to every replica of `DATABASE_ROUTING['REPLICAS']` with the
+    online backup API, which takes a consistent snapshot while other
+    connections keep writing, and lets open readers of a WAL replica
+    continue until they start their next transaction. With `--interval`
+    the copy is repeated until interrupted; replicas then lag the
+    primary by up to that many seconds (plus the copy time), which
+    `DATABASE_ROUTING['STICKY_SECONDS']` should cover.
+    """
+
+    help = "Copy the primary SQLite database to the read replicas."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--replica",
+            action="append",
+            default=[],
+            help="Replica alias to update (repeatable, default: all).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Repeat the copy every this many seconds until interrupted.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Copy the primary once, or repeatedly with `--interval`.
+        """
+        replicas = options["replica"] or routing_config()["REPLICAS"]
+
+        if not replicas:
+            raise CommandError("No replicas are configured (DATABASE_REPLICA_PATHS).")
+
+        for alias in replicas:
+            if alias == DEFAULT_DB_ALIAS or alias not in connections:
+                raise CommandError(f"{alias!r} is not a replica database.")
+
+        while True:
+            for alias in replicas:
+                elapsed = self.replicate(alias)
+                self.stdout.write(f"Copied the primary to {alias} in {elapsed:.3f}s.")
+
+            if options["interval"] is None:
+                break
+
+            time.sleep(options["interval"])
+
+    def replicate(self, alias):
+        """
+        Copy the primary to one replica and return the seconds it took.
+        """
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        started = time.perf_counter()
+
+        with closing(sqlite3.connect(connections[alias].settings_dict["NAME"])) as target:
+            primary.connection.backup(target)
+
+        return time.perf_counter() - started
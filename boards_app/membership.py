@@ -0,0 +1,156 @@
+from django.db.models import Exists, OuterRef
+
+from boards_app.models import Board
+
+
+class BoardMembership:
+    """
+    Request-scoped resolver answering whether a user belongs to a board.
+
+    Each board is looked up at most once per request with a single query
+    that returns the owner id and an indexed EXISTS check on the
+    membership table, so no member rows are ever loaded into Python.
+    Answers are memoized on the resolver, which lives on the request.
+    """
+
+    def __init__(self, user):
+        """
+        Create a resolver for the given user.
+        """
+        self.user = user
+        self._boards = {}
+        self._task_boards = {}
+
+    @classmethod
+    def for_request(cls, request):
+        """
+        Return the resolver bound to `request`, creating it on first use.
+        """
+        resolver = getattr(request, "_board_membership", None)
+
+        if resolver is None or resolver.user != request.user:
+            resolver = cls(request.user)
+            request._board_membership = resolver
+
+        return resolver
+
+    def _pending(self, board_ids):
+        """
+        Return the valid ids among `board_ids` that are not resolved yet.
+        """
+        pending = set()
+
+        for board_id in board_ids:
+            try:
+                board_id = int(board_id)
+            except (TypeError, ValueError):
+                continue
+            if board_id not in self._boards:
+                pending.add(board_id)
+
+        return pending
+
+    def _access_rows(self, board_ids):
+        """
+        Return a queryset of `(pk, owner_id, is_member)` for the boards.
+        """
+        membership = Board.members.through.objects.filter(
+            board_id=OuterRef("pk"),
+            user_id=self.user.id,
+        )
+        return (
+            Board.objects
+            .filter(pk__in=board_ids)
+            .annotate(is_member=Exists(membership))
+            .values_list("pk", "owner_id", "is_member")
+        )
+
+    def _store(self, pending, rows):
+        """
+        Memoize the fetched rows; boards without a row do not exist.
+        """
+        self._boards.update(dict.fromkeys(pending))
+
+        for board_id, owner_id, is_member in rows:
+            self._boards[board_id] = (owner_id, is_member)
+
+    def preload(self, board_ids):
+        """
+        Resolve several boards at once with a single query.
+
+        Boards already resolved are skipped; ids of boards that do not
+        exist are remembered as missing.
+        """
+        pending = self._pending(board_ids)
+
+        if pending:
+            self._store(pending, list(self._access_rows(pending)))
+
+    async def apreload(self, board_ids):
+        """
+        Async counterpart of `preload()`.
+        """
+        pending = self._pending(board_ids)
+
+        if pending:
+            self._store(pending, [row async for row in self._access_rows(pending)])
+
+    def _lookup(self, board_id):
+        """
+        Return `(owner_id, is_member)` for a board, or None if it does not exist.
+        """
+        try:
+            board_id = int(board_id)
+        except (TypeError, ValueError):
+            return None
+
+        self.preload([board_id])
+        return self._boards[board_id]
+
+    def board_exists(self, board_id):
+        """
+        Return True if the board exists.
+        """
+        return self._lookup(board_id) is not None
+
+    def is_owner(self, board_id):
+        """
+        Return True if the user owns the board.
+        """
+        access = self._lookup(board_id)
+        return access is not None and access[0] == self.user.id
+
+    def is_member_or_owner(self, board_id):
+        """
+        Return True if the user owns the board or is one of its members.
+        """
+        access = self._lookup(board_id)
+        return access is not None and (access[0] == self.user.id or access[1])
+
+    async def ais_member_or_owner(self, board_id):
+        """
+        Async counterpart of `is_member_or_owner()`.
+        """
+        await self.apreload([board_id])
+        return self.is_member_or_owner(board_id)
+
+    def board_id_for_task(self, task_id):
+        """
+        Return the board id of a task, or None if the task does not exist.
+        """
+        from tasks_app.models import Task
+
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            return None
+
+        if task_id not in self._task_boards:
+            self._task_boards[task_id] = (
+                Task.objects
+                .filter(pk=task_id)
+                .values_list("board_id", flat=True)
+                .first()
+            )
+
+        return self._task_boards[task_id]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_board_counters(apps, schema_editor):
+    """
+    Fill the new counter columns from the existing members and tasks.
+    """
+    Board = apps.get_model('boards_app', 'Board')
+    Task = apps.get_model('tasks_app', 'Task')
+
+    def count_of(queryset, condition=Q()):
+        return Coalesce(
+            Subquery(
+                queryset
+                .filter(condition, board_id=OuterRef('pk'))
+                .values('board_id')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            Value(0),
+        )
+
+    Board.objects.update(
+        member_count=count_of(Board.members.through.objects),
+        ticket_count=count_of(Task.objects),
+        tasks_to_do_count=count_of(Task.objects, Q(status='todo')),
+        tasks_high_prio_count=count_of(Task.objects, Q(priority='high')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0003_alter_board_members_alter_board_owner_and_more'),
+        ('tasks_app', '0008_alter_comments_author_alter_comments_content_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of members of the board.'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0, help_text="Number of tasks on the board with priority 'high'."),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0, help_text="Number of tasks on the board with status 'todo'."),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of tasks on the board.'),
+        ),
+        migrations.RunPython(backfill_board_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0004_board_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp of the last change to the board or its content.'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, help_text='Incremented whenever a task, comment or member of the board changes.'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0005_board_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='changes_compacted_through',
+            field=models.PositiveBigIntegerField(default=0, help_text='Highest change log id removed by compaction; older cursors are expired.'),
+        ),
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment'), ('member', 'Member')], help_text='Kind of object that changed.', max_length=10)),
+                ('entity_id', models.PositiveBigIntegerField(help_text='Primary key of the object that changed.')),
+                ('action', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], help_text='Whether the object was inserted, updated or deleted.', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Timestamp when the change was recorded.')),
+                ('board', models.ForeignKey(help_text='Board whose content changed.', on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='boards_app.board')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['board', 'id'], name='boardchange_board_cursor')],
+            },
+        ),
+    ]
@@ -8,6 +8,12 @@ class Board(models.Model):
 
     A board has an owner and can contain multiple members.
     The owner is automatically added as a member when the board is created.
+
+    Member and task counters are stored on the board itself and kept
+    up to date by the task and membership write paths, so listing boards
+    does not need to aggregate over members and tasks. The same write paths
+    bump `version` and `updated_at`, so any change to the board or its
+    tasks, comments and members changes the board's ETag.
     """
 
     title = models.CharField(
@@ -29,6 +35,50 @@ class Board(models.Model):
         help_text="User who owns the board."
     )
 
+    member_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of members of the board."
+    )
+
+    ticket_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of tasks on the board."
+    )
+
+    tasks_to_do_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of tasks on the board with status 'todo'."
+    )
+
+    tasks_high_prio_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of tasks on the board with priority 'high'."
+    )
+
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Incremented whenever a task, comment or member of the board changes."
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp of the last change to the board or its content."
+    )
+
+    changes_compacted_through = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Highest change log id removed by compaction; older cursors are expired."
+    )
+
+    COUNTER_FIELDS = (
+        "member_count",
+        "ticket_count",
+        "tasks_to_do_count",
+        "tasks_high_prio_count",
+    )
+
+    MAINTAINED_FIELDS = (*COUNTER_FIELDS, "version", "changes_compacted_through")
+
     class Meta:
         """
         Model metadata.
@@ -40,9 +90,22 @@ class Board(models.Model):
         Save the board instance.
 
         Automatically adds the owner to the members list
-        when the board is created for the first time.
+        when the board is created for the first time. Updates never
+        write the stored counters and version, which are maintained
+        separately, but always refresh `updated_at`.
         """
         is_new = self.pk is None
+        update_fields = kwargs.get("update_fields")
+
+        if not self._state.adding and update_fields is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MAINTAINED_FIELDS
+            ]
+        elif update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+
         super().save(*args, **kwargs)
 
         if is_new:
@@ -53,3 +116,80 @@ class Board(models.Model):
         Return the string representation of the board.
         """
         return self.title
+
+
+class BoardChange(models.Model):
+    """
+    Append-only log entry recording a change to a board's content.
+
+    Every insert, update and delete of a task, comment or membership
+    appends one entry. The auto-incrementing id serves as the sync
+    cursor: clients fetch the entries after the last id they have seen.
+    Deletes are kept as tombstones until the log is compacted.
+    """
+
+    TASK = "task"
+    COMMENT = "comment"
+    MEMBER = "member"
+
+    ENTITY_CHOICES = [
+        (TASK, "Task"),
+        (COMMENT, "Comment"),
+        (MEMBER, "Member"),
+    ]
+
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+    ACTION_CHOICES = [
+        (INSERT, "Insert"),
+        (UPDATE, "Update"),
+        (DELETE, "Delete"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+
+    board = models.ForeignKey(
+        Board,
+        related_name="changes",
+        on_delete=models.CASCADE,
+        help_text="Board whose content changed."
+    )
+
+    entity = models.CharField(
+        max_length=10,
+        choices=ENTITY_CHOICES,
+        help_text="Kind of object that changed."
+    )
+
+    entity_id = models.PositiveBigIntegerField(
+        help_text="Primary key of the object that changed."
+    )
+
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        help_text="Whether the object was inserted, updated or deleted."
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        help_text="Timestamp when the change was recorded."
+    )
+
+    class Meta:
+        """
+        Model metadata.
+        """
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["board", "id"], name="boardchange_board_cursor"),
+        ]
+
+    def __str__(self):
+        """
+        Return the string representation of the change.
+        """
+        return f"{self.action} {self.entity} {self.entity_id}"
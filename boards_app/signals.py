@@ -0,0 +1,113 @@
+import threading
+
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from boards_app.changes import record_changes
+from boards_app.counters import refresh_member_count
+from boards_app.models import Board, BoardChange
+
+
+# Boards being deleted in the current thread, by id, with the object
+# whose deletion cascaded to them.
+_deletions = threading.local()
+
+
+def _deleting_boards():
+    """
+    Return the boards being deleted in the current thread.
+    """
+    if not hasattr(_deletions, "boards"):
+        _deletions.boards = {}
+
+    return _deletions.boards
+
+
+def is_deleted_with(board_id, origin):
+    """
+    Return True if the board is deleted by the deletion of `origin`.
+
+    Rows depending on a board are deleted before the board itself, so
+    their `post_delete` handlers use this to skip counter and change
+    log writes for a board that is about to disappear; the change log
+    rows they would insert could not reference it any more.
+    """
+    boards = _deleting_boards()
+    return board_id in boards and boards[board_id] is origin
+
+
+@receiver(pre_delete, sender=Board)
+def mark_board_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Remember that a board is part of the deletion of `origin`.
+
+    `pre_delete` is sent for every collected object before any row is
+    deleted, including boards reached by a cascade (e.g. from their
+    owner).
+    """
+    _deleting_boards()[instance.pk] = origin
+
+
+@receiver(post_delete, sender=Board)
+def unmark_board_deletion(sender, instance, **kwargs):
+    """
+    Forget a deleted board.
+    """
+    _deleting_boards().pop(instance.pk, None)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def update_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recount board members whenever a membership is added or removed
+    and append the change to the change log of the affected boards.
+
+    Handles both directions of the relation (`board.members` and
+    `user.boards`). For a `clear()` the affected rows are collected
+    before they disappear.
+    """
+    if action == "pre_clear":
+        if reverse:
+            instance._cleared_board_ids = list(
+                sender.objects.filter(user_id=instance.pk)
+                .values_list("board_id", flat=True)
+            )
+        else:
+            instance._cleared_member_ids = list(
+                sender.objects.filter(board_id=instance.pk)
+                .values_list("user_id", flat=True)
+            )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if action != "post_clear" and not pk_set:
+        return
+
+    change = BoardChange.INSERT if action == "post_add" else BoardChange.DELETE
+
+    if not reverse:
+        if action == "post_clear":
+            member_ids = getattr(instance, "_cleared_member_ids", [])
+        else:
+            member_ids = pk_set
+
+        counts = refresh_member_count([instance.pk])
+        instance.member_count = counts[instance.pk]
+        record_changes(
+            (instance.pk, BoardChange.MEMBER, change, member_id)
+            for member_id in member_ids
+        )
+        return
+
+    if action == "post_clear":
+        board_ids = getattr(instance, "_cleared_board_ids", [])
+    else:
+        board_ids = pk_set
+
+    refresh_member_count(board_ids)
+    record_changes(
+        (board_id, BoardChange.MEMBER, change, instance.pk)
+        for board_id in board_ids
+    )
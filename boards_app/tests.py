@@ -1,3 +1,1193 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, connections
+from django.db.utils import ConnectionHandler
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.benchmarks import QueryCounter
+from core.database import sqlite_database
+from core.middleware import QueryRecorder, normalize_sql
+from core.routing import PrimaryReplicaRouter, reading_from, replica_health
+from core.query_budgets import QUERY_BUDGETS, api_endpoints
+from boards_app.live import OVERFLOW, InMemoryBroker, get_broker
+from boards_app.counters import COUNTER_FIELDS, compute_counters
+from boards_app.importer import BoardImport
+from boards_app.management.commands.generate_dataset import USERNAME_PREFIX
+from boards_app.membership import BoardMembership
+from boards_app.models import Board, BoardChange
+from core.testing import STRICT_QUERY_INSPECTION, ApiTestCase, sqlite_replica
+from tasks_app.models import Comments, Task
+
+
+class QueryBudgetCoverageTests(TestCase):
+    """
+    Every API endpoint must declare a query budget.
+    """
+
+    def test_every_endpoint_has_a_budget(self):
+        missing = sorted(set(api_endpoints()) - set(QUERY_BUDGETS))
+        self.assertEqual(missing, [])
+
+
+class QueryInspectionTests(TestCase):
+    """
+    Tests for SQL normalization and repeated shape detection.
+    """
+
+    def test_normalize_sql_replaces_literals_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 5 AND b = 'x' AND c IN (%s, %s)"),
+            "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)",
+        )
+
+    def test_repeated_shapes_above_threshold(self):
+        recorder = QueryRecorder()
+        recorder.statements = [
+            f'SELECT * FROM "auth_user" WHERE "id" = {index}' for index in range(4)
+        ]
+        self.assertEqual(len(recorder.repeated_shapes(3)), 1)
+        self.assertEqual(recorder.repeated_shapes(4), [])
+
+    def test_transaction_control_is_not_recorded(self):
+        recorder = QueryRecorder()
+
+        for sql in ("BEGIN", "BEGIN IMMEDIATE", 'SAVEPOINT "s1"', 'RELEASE SAVEPOINT "s1"', "SELECT 1"):
+            recorder(lambda *args: None, sql, None, False, {})
+
+        self.assertEqual(recorder.statements, ["SELECT 1"])
+
+
+@override_settings(QUERY_INSPECTION=STRICT_QUERY_INSPECTION)
+class TransactionBudgetTests(TransactionTestCase):
+    """
+    Writes stay within their budgets outside a wrapping transaction,
+    where `atomic()` starts a transaction instead of a savepoint.
+    """
+
+    def test_board_create(self):
+        owner = User.objects.create_user("owner", "owner@example.com")
+        member = User.objects.create_user("member", "member@example.com")
+        token = Token.objects.create(user=owner)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        with QueryCounter() as queries:
+            response = client.post(
+                "/api/boards/", {"title": "New", "members": [member.id]}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Benchmarks count statements the way the budgets do.
+        self.assertLessEqual(queries.count, QUERY_BUDGETS[("POST", "board-list")])
+
+
+class DatabaseProfileTests(TestCase):
+    """
+    SQLite connection profiles are built from the environment.
+    """
+
+    def test_default_profile_is_plain(self):
+        self.assertEqual(sqlite_database("db.sqlite3", environ={})["OPTIONS"], {})
+
+    def test_production_profile_with_overrides(self):
+        options = sqlite_database(
+            "db.sqlite3", "production", environ={"SQLITE_BUSY_TIMEOUT": "250"}
+        )["OPTIONS"]
+
+        self.assertIn("PRAGMA journal_mode=WAL", options["init_command"])
+        self.assertIn("PRAGMA synchronous=NORMAL", options["init_command"])
+        self.assertEqual(options["timeout"], 0.25)
+        self.assertEqual(options["transaction_mode"], "IMMEDIATE")
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ImproperlyConfigured):
+            sqlite_database("db.sqlite3", "fast", environ={})
+
+    def test_pragmas_are_applied_on_connect(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "db.sqlite3")
+            handler = ConnectionHandler(
+                {"default": sqlite_database(path, "production", environ={})}
+            )
+
+            try:
+                with handler["default"].cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], "wal")
+                    cursor.execute("PRAGMA synchronous")
+                    self.assertEqual(cursor.fetchone()[0], 1)
+            finally:
+                handler.close_all()
+
+
+@override_settings(QUERY_INSPECTION=STRICT_QUERY_INSPECTION)
+class DatabaseRoutingTests(TransactionTestCase):
+    """
+    List reads go to a replica; clients that wrote read the primary.
+
+    The replica is a copy of the test database made with SQLite's
+    backup API, which waits for open write transactions, so the tests
+    commit their data instead of running in a transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(sqlite_replica("replica"))
+        # Allow connections to the replica, which does not exist when
+        # the test runner validates `databases`.
+        cls.databases = cls.databases | {"replica"}
+
+    def setUp(self):
+        replica_health.reset()
+        self.owner = User.objects.create_user("owner", "owner@example.com")
+        self.member = User.objects.create_user("member", "member@example.com")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.add(self.member)
+        self.task = Task.objects.create(
+            board=self.board, title="Task", status="todo", priority="high",
+            assignee=self.member, created_by=self.owner,
+        )
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def client_for(self, user):
+        client = APIClient()
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return client
+
+    def titles(self, client):
+        response = client.get("/api/boards/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [board["title"] for board in response.data["results"]]
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+
+        with reading_from("replica"):
+            self.assertEqual(router.db_for_read(Board), "replica")
+            self.assertEqual(router.db_for_read(Token), "default")
+            self.assertEqual(router.db_for_write(Board), "default")
+
+        self.assertEqual(router.db_for_read(Board), "default")
+
+    def test_lists_read_from_the_replica(self):
+        owner, member = self.client_for(self.owner), self.client_for(self.member)
+
+        call_command("replicate_database", stdout=StringIO())
+        Board.objects.filter(pk=self.board.pk).update(title="Renamed")
+
+        self.assertEqual(self.titles(owner), ["Board"])
+        self.assertEqual(owner.get(f"/api/boards/{self.board.pk}/").data["title"], "Renamed")
+
+        call_command("replicate_database", stdout=StringIO())
+        self.assertEqual(self.titles(member), ["Renamed"])
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_lists_read_from_the_replica(self):
+        token, _ = Token.objects.get_or_create(user=self.owner)
+        call_command("replicate_database", stdout=StringIO())
+        Board.objects.filter(pk=self.board.pk).update(title="Renamed")
+
+        response = async_to_sync(self.async_client.get)(
+            "/api/boards/", headers={"Authorization": f"Token {token.key}"}
+        )
+        self.assertEqual([board["title"] for board in response.json()["results"]], ["Board"])
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        owner, member = self.client_for(self.owner), self.client_for(self.member)
+
+        call_command("replicate_database", stdout=StringIO())
+        response = owner.patch(
+            f"/api/boards/{self.board.pk}/", {"title": "Renamed"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.titles(owner), ["Renamed"])
+        self.assertEqual(self.titles(member), ["Board"])
+
+        with override_settings(
+            DATABASE_ROUTING={**settings.DATABASE_ROUTING, "STICKY_SECONDS": 0}
+        ):
+            owner.patch(f"/api/boards/{self.board.pk}/", {"title": "Again"}, format="json")
+            self.assertEqual(self.titles(owner), ["Board"])
+
+    def test_unhealthy_replica_falls_back_to_the_primary(self):
+        call_command("replicate_database", stdout=StringIO())
+        connections["replica"].close()
+        # An emptied replica file has no tables.
+        open(connections["replica"].settings_dict["NAME"], "w").close()
+        Board.objects.filter(pk=self.board.pk).update(title="Renamed")
+
+        self.assertEqual(self.titles(self.client_for(self.owner)), ["Renamed"])
+
+
+class GenerateDatasetTests(TestCase):
+    """
+    `generate_dataset` writes a small deterministic dataset with
+    accurate counters.
+    """
+
+    def generate(self, *args):
+        call_command("generate_dataset", "--scale", "0.05", *args, stdout=StringIO())
+        return list(Token.objects.order_by("key").values_list("key", flat=True))
+
+    def test_small_dataset(self):
+        tokens = self.generate()
+
+        self.assertEqual(User.objects.filter(username__startswith=USERNAME_PREFIX).count(), 5)
+        self.assertEqual(Board.objects.count(), 1)
+        self.assertEqual(Task.objects.count(), 100)
+        self.assertEqual(Comments.objects.count(), 200)
+        self.assertEqual(len(tokens), 5)
+
+        board = Board.objects.get()
+        self.assertEqual(
+            {field: getattr(board, field) for field in COUNTER_FIELDS},
+            compute_counters([board.pk])[board.pk],
+        )
+        self.assertEqual(
+            sum(Task.objects.values_list("comments_count", flat=True)), 200
+        )
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+        self.assertEqual(self.generate("--flush"), tokens)
+        self.assertEqual(Board.objects.count(), 1)
+
+
+class BoardEndpointBudgetTests(ApiTestCase):
+    """
+    Board endpoints stay within their query budgets.
+    """
+
+    def test_list(self):
+        response = self.client_for(self.owner).get("/api/boards/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create(self):
+        response = self.client_for(self.owner).post(
+            "/api/boards/",
+            {"title": "New", "members": [member.id for member in self.members]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["member_count"], self.member_count + 1)
+
+    def test_retrieve(self):
+        response = self.client_for(self.members[0]).get(f"/api/boards/{self.board.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["tasks"]), self.task_count)
+
+    def test_update(self):
+        response = self.client_for(self.owner).put(
+            f"/api/boards/{self.board.id}/",
+            {"title": "Renamed", "members": [member.id for member in self.members]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_partial_update(self):
+        response = self.client_for(self.owner).patch(
+            f"/api/boards/{self.board.id}/",
+            {"members": [member.id for member in self.members[:4]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_destroy(self):
+        response = self.client_for(self.owner).delete(f"/api/boards/{self.board.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class BoardCounterTests(ApiTestCase):
+    """
+    Stored board counters follow task and membership writes and are
+    repaired by `repair_board_counters`.
+    """
+
+    def counters(self, board):
+        board.refresh_from_db()
+        return {field: getattr(board, field) for field in COUNTER_FIELDS}
+
+    def assertCountersAccurate(self, *boards):
+        actual = compute_counters([board.pk for board in boards])
+
+        for board in boards:
+            self.assertEqual(self.counters(board), actual[board.pk])
+
+    def test_task_transitions(self):
+        other = Board.objects.create(title="Other", owner=self.owner)
+        before = self.counters(self.board)
+
+        task = Task.objects.create(
+            board=self.board, title="New", status="todo", priority="high", created_by=self.owner
+        )
+        self.assertEqual(self.counters(self.board)["ticket_count"], before["ticket_count"] + 1)
+        self.assertCountersAccurate(self.board)
+
+        task.status = "done"
+        task.priority = "low"
+        task.save()
+        self.assertCountersAccurate(self.board)
+
+        task.board = other
+        task.save()
+        self.assertEqual(self.counters(self.board), before)
+        self.assertCountersAccurate(self.board, other)
+
+        task.delete()
+        self.assertEqual(self.counters(other)["ticket_count"], 0)
+
+    def test_stale_instances(self):
+        first = Task.objects.get(pk=self.task.pk)
+        second = Task.objects.get(pk=self.task.pk)
+
+        first.status = "done"
+        first.save()
+        second.status = "done"
+        second.save()
+        self.assertCountersAccurate(self.board)
+
+        first.status = "review"
+        first.save()
+        self.assertCountersAccurate(self.board)
+
+    def test_member_changes(self):
+        other = Board.objects.create(title="Other", owner=self.owner)
+
+        other.members.add(*self.members[:3])
+        self.assertCountersAccurate(other)
+        other.members.remove(self.members[0])
+        self.members[1].boards.remove(other)
+        self.assertEqual(self.counters(other)["member_count"], 2)
+        other.members.clear()
+        self.assertCountersAccurate(other)
+
+    def test_repair_board_counters(self):
+        Board.objects.filter(pk=self.board.pk).update(ticket_count=0, member_count=99)
+        out = StringIO()
+
+        call_command("repair_board_counters", "--dry-run", stdout=out)
+        self.assertIn("found 1 with drift", out.getvalue())
+        self.assertEqual(self.counters(self.board)["member_count"], 99)
+
+        call_command("repair_board_counters", "--batch-size", "1", stdout=StringIO())
+        self.assertCountersAccurate(self.board)
+
+
+class BoardMembershipTests(ApiTestCase):
+    """
+    The membership resolver answers each board with one query per request.
+    """
+
+    def test_answers(self):
+        other = Board.objects.create(title="Other", owner=self.outsider)
+
+        owner = BoardMembership(self.owner)
+        member = BoardMembership(self.members[0])
+        outsider = BoardMembership(self.outsider)
+
+        self.assertTrue(owner.is_owner(self.board.pk))
+        self.assertTrue(owner.is_member_or_owner(self.board.pk))
+        self.assertFalse(member.is_owner(self.board.pk))
+        self.assertTrue(member.is_member_or_owner(str(self.board.pk)))
+        self.assertFalse(member.is_member_or_owner(other.pk))
+        self.assertFalse(outsider.is_member_or_owner(self.board.pk))
+        self.assertTrue(outsider.is_owner(other.pk))
+        self.assertFalse(outsider.board_exists(0))
+        self.assertFalse(outsider.board_exists("invalid"))
+
+    def test_lookups_are_memoized(self):
+        other = Board.objects.create(title="Other", owner=self.outsider)
+        resolver = BoardMembership(self.members[0])
+
+        with self.assertNumQueries(1):
+            resolver.preload([self.board.pk, other.pk, 0])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(resolver.is_member_or_owner(self.board.pk))
+            self.assertFalse(resolver.is_member_or_owner(other.pk))
+            self.assertFalse(resolver.board_exists(0))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(resolver.board_id_for_task(self.task.pk), self.board.pk)
+            self.assertEqual(resolver.board_id_for_task(self.task.pk), self.board.pk)
+
+    def test_for_request(self):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = self.owner
+        resolver = BoardMembership.for_request(request)
+
+        self.assertIs(BoardMembership.for_request(request), resolver)
+
+        request.user = self.members[0]
+        self.assertEqual(BoardMembership.for_request(request).user, self.members[0])
+
+    def test_board_access(self):
+        path = f"/api/boards/{self.board.id}/"
+
+        self.assertEqual(self.client_for(self.members[0]).get(path).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client_for(self.outsider).get(path).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BoardMemberDeletionTests(ApiTestCase):
+    """
+    Deleting a user updates the boards they were a member of.
+    """
+
+    def test_delete_member(self):
+        member = self.members[0]
+        member_id = member.id
+        tasks = list(Task.objects.filter(assignee=member).values_list("pk", flat=True))
+        version = self.board.version
+        etag = self.client_for(self.owner).get(f"/api/boards/{self.board.id}/")["ETag"]
+
+        member.delete()
+
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.member_count, self.board.members.count())
+        self.assertEqual(self.board.member_count, self.member_count)
+        self.assertGreater(self.board.version, version)
+        self.assertNotEqual(
+            self.client_for(self.owner).get(f"/api/boards/{self.board.id}/")["ETag"], etag
+        )
+        changes = self.board.changes.values_list("entity", "action", "entity_id")
+        self.assertIn((BoardChange.MEMBER, BoardChange.DELETE, member_id), changes)
+        self.assertIn((BoardChange.TASK, BoardChange.UPDATE, tasks[0]), changes)
+        self.assertFalse(Task.objects.filter(assignee_id=member_id).exists())
+
+
+class BoardConditionalGetTests(ApiTestCase):
+    """
+    Board detail supports ETag based conditional requests.
+    """
+
+    def test_unchanged_board_returns_304(self):
+        client = self.client_for(self.members[0])
+        etag = client.get(f"/api/boards/{self.board.id}/")["ETag"]
+
+        response = client.get(f"/api/boards/{self.board.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_task_change_changes_board_etag(self):
+        client = self.client_for(self.members[0])
+        etag = client.get(f"/api/boards/{self.board.id}/")["ETag"]
+
+        client.patch(f"/api/tasks/{self.task.id}/", {"title": "Changed"}, format="json")
+        response = client.get(f"/api/boards/{self.board.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class BoardMoveTasksTests(ApiTestCase):
+    """
+    Moving many tasks at once updates them and the board counters together.
+    """
+
+    def test_move_returns_new_counters(self):
+        task_ids = [task.id for task in self.tasks[:6]]
+
+        response = self.client_for(self.members[0]).post(
+            f"/api/boards/{self.board.id}/move-tasks/",
+            {
+                "tasks": task_ids,
+                "status": "done",
+                "priority": "low",
+                "assignee_id": self.members[3].id,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["ticket_count"], self.task_count)
+        self.assertEqual(response.data["tasks_to_do_count"], self.task_count - 6)
+        self.assertEqual(response.data["tasks_high_prio_count"], self.task_count - 6)
+        self.assertEqual(
+            set(self.board.tasks.filter(status="done").values_list("id", flat=True)),
+            set(task_ids),
+        )
+
+    def test_foreign_task_is_rejected(self):
+        other_board = Board.objects.create(title="Other", owner=self.members[0])
+        foreign = Task.objects.create(
+            board=other_board, title="Foreign", status="todo", priority="low"
+        )
+
+        response = self.client_for(self.members[0]).post(
+            f"/api/boards/{self.board.id}/move-tasks/",
+            {"tasks": [self.task.id, foreign.id], "status": "done"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "todo")
+
+    def test_outsider_is_forbidden(self):
+        response = self.client_for(self.outsider).post(
+            f"/api/boards/{self.board.id}/move-tasks/",
+            {"tasks": [self.task.id], "status": "done"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BoardChangeFeedTests(ApiTestCase):
+    """
+    The change feed returns only what changed after a cursor, including tombstones.
+    """
+
+    def changes(self, client, **params):
+        return client.get(f"/api/boards/{self.board.id}/changes/", params)
+
+    def test_feed_returns_changes_after_cursor(self):
+        client = self.client_for(self.members[0])
+        cursor = self.changes(client).data["cursor"]
+
+        client.patch(f"/api/tasks/{self.task.id}/", {"status": "done"}, format="json")
+        client.patch(f"/api/tasks/{self.task.id}/", {"title": "Renamed"}, format="json")
+        client.post(
+            f"/api/tasks/{self.task.id}/comments/", {"content": "New"}, format="json"
+        )
+        self.client_for(self.owner).delete(f"/api/tasks/{self.tasks[1].id}/")
+        self.board.members.remove(self.members[7])
+
+        response = self.changes(client, since=cursor)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["has_more"])
+        changes = {
+            (change["entity"], change["entity_id"]): change
+            for change in response.data["changes"]
+        }
+        self.assertEqual(len(changes), len(response.data["changes"]))
+        self.assertEqual(changes[("task", self.task.id)]["data"]["title"], "Renamed")
+        self.assertEqual(changes[("task", self.tasks[1].id)]["action"], "delete")
+        self.assertEqual(changes[("member", self.members[7].id)]["action"], "delete")
+        self.assertIn("comment", {entity for entity, _ in changes})
+
+        latest = self.changes(client, since=response.data["cursor"])
+        self.assertEqual(latest.data["changes"], [])
+
+    def test_task_moved_away_is_a_tombstone(self):
+        client = self.client_for(self.owner)
+        cursor = self.changes(client).data["cursor"]
+        other_board = Board.objects.create(title="Other", owner=self.owner)
+
+        client.patch(
+            f"/api/tasks/{self.task.id}/", {"board": other_board.id}, format="json"
+        )
+        response = self.changes(client, since=cursor)
+
+        self.assertEqual(
+            [(change["entity_id"], change["action"]) for change in response.data["changes"]],
+            [(self.task.id, "delete")],
+        )
+
+    def test_paging_and_expired_cursor(self):
+        client = self.client_for(self.members[0])
+        cursor = self.changes(client).data["cursor"]
+
+        for task in self.tasks[:3]:
+            client.patch(f"/api/tasks/{task.id}/", {"status": "done"}, format="json")
+
+        first = self.changes(client, since=cursor, limit=2)
+        self.assertTrue(first.data["has_more"])
+        self.assertEqual(len(first.data["changes"]), 2)
+
+        call_command("compact_board_changes", retention_days=0, stdout=StringIO())
+        expired = self.changes(client, since=cursor)
+
+        self.assertEqual(expired.status_code, status.HTTP_410_GONE)
+
+
+class LiveUpdatesTests(ApiTestCase):
+    """
+    Board events are pushed to subscribers with bounded queues.
+    """
+
+    def change(self, change_id):
+        return {"id": change_id, "board": self.board.id, "entity": "task",
+                "entity_id": self.task.id, "action": "update"}
+
+    async def test_in_memory_broker_delivers_and_overflows(self):
+        broker = InMemoryBroker(max_queue=2)
+        subscription = broker.subscribe(self.board.id)
+        subscription.cursor = 1
+
+        for change_id in (1, 2):
+            broker.publish(self.board.id, self.change(change_id))
+        await asyncio.sleep(0)
+        self.assertEqual((await subscription.get(1))["id"], 2)
+
+        for change_id in (3, 4, 5):
+            broker.publish(self.board.id, self.change(change_id))
+        await asyncio.sleep(0)
+        self.assertIs(await subscription.get(1), OVERFLOW)
+        subscription.close()
+        self.assertFalse(broker._subscriptions)
+
+    async def test_stream_sends_ready_and_change_events(self):
+        token = await sync_to_async(Token.objects.create)(user=self.members[0])
+        response = await self.async_client.get(
+            f"/api/boards/{self.board.id}/events/",
+            headers={"Authorization": f"Token {token.key}"},
+        )
+        events = aiter(response.streaming_content)
+
+        ready = await anext(events)
+        get_broker().publish(self.board.id, self.change(10**6))
+        change = await anext(events)
+        await events.aclose()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"event: ready", ready)
+        self.assertIn(b"event: change", change)
+
+    def test_outsider_is_forbidden(self):
+        response = self.client_for(self.outsider).get(
+            f"/api/boards/{self.board.id}/events/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(ASYNC_READ_VIEWS=True)
+class AsyncBoardReadTests(ApiTestCase):
+    """
+    The async board list and detail match the synchronous views under ASGI.
+    """
+
+    def get_async(self, user, path, **headers):
+        token, _ = Token.objects.get_or_create(user=user)
+        return async_to_sync(self.async_client.get)(
+            path, headers={"Authorization": f"Token {token.key}", **headers}
+        )
+
+    def test_list_and_detail_match_sync_views(self):
+        for path in ("/api/boards/", f"/api/boards/{self.board.id}/"):
+            response = self.get_async(self.members[0], path)
+
+            with override_settings(ASYNC_READ_VIEWS=False):
+                expected = self.client_for(self.members[0]).get(path)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+
+    def test_detail_conditional_and_permissions(self):
+        path = f"/api/boards/{self.board.id}/"
+        etag = self.get_async(self.members[0], path)["ETag"]
+
+        not_modified = self.get_async(self.members[0], path, **{"If-None-Match": etag})
+        forbidden = self.get_async(self.outsider, path)
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_writes_still_use_sync_views(self):
+        response = self.client_for(self.owner).patch(
+            f"/api/boards/{self.board.id}/", {"title": "Renamed"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BoardQueryPlanTests(ApiTestCase):
+    """
+    The board reads are answered from indexes.
+    """
+
+    def test_board_reads_use_indexes(self):
+        client = self.client_for(self.members[1])
+
+        self.assertNoFullScans(client, "/api/boards/")
+        self.assertNoFullScans(client, f"/api/boards/{self.board.id}/")
+        self.assertNoFullScans(client, f"/api/boards/{self.board.id}/changes/?since=0")
+        self.assertNoFullScans(client, f"/api/boards/{self.board.id}/columns/")
+
+
+class BoardColumnsTests(ApiTestCase):
+    """
+    The column view groups tasks by status with per-column windows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.done = [
+            Task.objects.create(board=cls.board, title=f"Done {index}", status="done", priority="low")
+            for index in range(5)
+        ]
+
+    def test_groups_tasks_with_counts_and_windows(self):
+        response = self.client_for(self.members[0]).get(
+            f"/api/boards/{self.board.id}/columns/?limit=3&limit_done=0"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        columns = {column["status"]: column for column in response.json()["columns"]}
+        self.assertEqual(list(columns), ["todo", "in_progress", "review", "done"])
+        self.assertEqual(columns["todo"]["count"], self.task_count)
+        self.assertEqual(
+            [task["id"] for task in columns["todo"]["tasks"]],
+            [task.id for task in self.tasks[:3]],
+        )
+        self.assertEqual(columns["done"]["count"], 5)
+        self.assertEqual(columns["done"]["tasks"], [])
+        self.assertEqual(columns["review"], {
+            "status": "review", "title": "In Review", "count": 0, "tasks": [], "next": None,
+        })
+
+    def test_next_url_continues_the_column(self):
+        client = self.client_for(self.members[0])
+        columns = client.get(f"/api/boards/{self.board.id}/columns/?limit=4").json()["columns"]
+        todo, done = columns[0], columns[3]
+
+        rest = client.get(todo["next"]).json()
+        self.assertEqual(
+            [task["id"] for task in todo["tasks"] + rest["results"]],
+            [task.id for task in self.tasks[:8]],
+        )
+        self.assertEqual(
+            [task["id"] for task in client.get(done["next"]).json()["results"]],
+            [self.done[4].id],
+        )
+
+    def test_conditional_request(self):
+        client = self.client_for(self.members[0])
+        path = f"/api/boards/{self.board.id}/columns/"
+        etag = client.get(path)["ETag"]
+
+        self.assertEqual(
+            client.get(path, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        self.assertEqual(
+            self.client_for(self.outsider).get(path).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+
+class BoardSparseFieldsTests(ApiTestCase):
+    """
+    Board reads load only the members and tasks that are rendered.
+    """
+
+    def get(self, path, user=None):
+        client = self.client_for(user or self.members[0])
+        client.get("/api/boards/")  # Warm the token and membership caches.
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json(), [query["sql"] for query in queries.captured_queries]
+
+    def test_fields_skip_unrendered_prefetches(self):
+        path = f"/api/boards/{self.board.id}/"
+        full, full_queries = self.get(path)
+        sparse, sparse_queries = self.get(f"{path}?fields=id,title")
+
+        self.assertEqual(sparse, {"id": self.board.id, "title": "Board"})
+        self.assertEqual(len(sparse_queries), len(full_queries) - 2)
+        self.assertEqual(len(full["tasks"]), self.task_count)
+
+    def test_unexpanded_members_and_tasks_are_ids(self):
+        data, queries = self.get(
+            f"/api/boards/{self.board.id}/?fields=members,tasks&expand=members"
+        )
+
+        self.assertEqual(
+            sorted(member["id"] for member in data["members"]),
+            sorted(self.board.members.values_list("id", flat=True)),
+        )
+        self.assertEqual(sorted(data["tasks"]), sorted(task.id for task in self.tasks))
+        self.assertFalse(any("tasks_app_task" in sql and "auth_user" in sql for sql in queries))
+
+    def test_expanded_tasks_join_only_expanded_users(self):
+        data, queries = self.get(
+            f"/api/boards/{self.board.id}/?fields=tasks.title,tasks.assignee"
+            "&expand=tasks.assignee"
+        )
+        task_queries = [sql for sql in queries if 'FROM "tasks_app_task"' in sql]
+
+        self.assertEqual(data["tasks"][0], {
+            "title": self.task.title,
+            "assignee": {"id": self.task.assignee_id, "email": self.task.assignee.email,
+                         "fullname": self.task.assignee.username},
+        })
+        self.assertEqual(len(task_queries), 1)
+        self.assertEqual(task_queries[0].count('JOIN "auth_user"'), 1)
+
+    def test_list_fields(self):
+        data, _ = self.get("/api/boards/?fields=id,ticket_count")
+
+        self.assertEqual(data["results"], [{"id": self.board.id, "ticket_count": self.task_count}])
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_detail_matches_sync_view(self):
+        path = f"/api/boards/{self.board.id}/?fields=id,tasks.id,tasks.reviewer&expand="
+        token, _ = Token.objects.get_or_create(user=self.members[0])
+        response = async_to_sync(self.async_client.get)(
+            path, headers={"Authorization": f"Token {token.key}"}
+        )
+
+        with override_settings(ASYNC_READ_VIEWS=False):
+            expected = self.client_for(self.members[0]).get(path)
+
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+
+class BoardRowSerializationTests(ApiTestCase):
+    """
+    Board reads rendered from row plans are identical to the serializer output.
+    """
+
+    def assertSameContent(self, path):
+        client = self.client_for(self.members[0])
+        response = client.get(path)
+
+        with override_settings(ROW_SERIALIZATION=False):
+            expected = client.get(path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+
+    def test_reads_match_serializers(self):
+        detail = f"/api/boards/{self.board.id}/"
+
+        self.assertSameContent("/api/boards/")
+        self.assertSameContent(detail)
+        self.assertSameContent(f"{detail}?expand=members")
+        self.assertSameContent(f"{detail}?fields=tasks.title,tasks.reviewer&expand=tasks")
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_detail_matches_serializer(self):
+        token, _ = Token.objects.get_or_create(user=self.members[0])
+        headers = {"Authorization": f"Token {token.key}"}
+        path = f"/api/boards/{self.board.id}/"
+        response = async_to_sync(self.async_client.get)(path, headers=headers)
+
+        with override_settings(ROW_SERIALIZATION=False):
+            expected = async_to_sync(self.async_client.get)(path, headers=headers)
+
+        self.assertEqual(response.content, expected.content)
+
+
+@override_settings(STREAMING={"CHUNK_SIZE": 4})
+class BoardStreamingTests(ApiTestCase):
+    """
+    The board detail streams its tasks with `?stream=true`.
+    """
+
+    def test_stream_matches_detail(self):
+        client = self.client_for(self.members[0])
+
+        for params in ("", "?expand=tasks", "?fields=id,tasks.title"):
+            path = f"/api/boards/{self.board.id}/{params}"
+            separator = "&" if params else "?"
+            expected = client.get(path)
+            response = client.get(f"{path}{separator}stream=true")
+
+            self.assertTrue(response.streaming)
+            self.assertEqual(b"".join(response.streaming_content), expected.content)
+            self.assertEqual(response["ETag"], expected["ETag"])
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_stream(self):
+        token, _ = Token.objects.get_or_create(user=self.members[0])
+        path = f"/api/boards/{self.board.id}/"
+        headers = {"Authorization": f"Token {token.key}"}
+        expected = async_to_sync(self.async_client.get)(path, headers=headers)
+        response = async_to_sync(self.async_client.get)(f"{path}?stream=true", headers=headers)
+
+        async def read():
+            return b"".join([part async for part in response.streaming_content])
+
+        self.assertEqual(async_to_sync(read)(), expected.content)
+
+
+@override_settings(STREAMING={"CHUNK_SIZE": 3})
+class BoardExportTests(ApiTestCase):
+    """
+    Boards are exported as NDJSON or CSV and exports can be resumed.
+    """
+
+    def read_ndjson(self, response):
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_ndjson_contains_all_record_types_in_order(self):
+        response = self.client_for(self.members[0]).get(f"/api/boards/{self.board.id}/export/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = self.read_ndjson(response)
+
+        types = [record["type"] for record in records]
+        self.assertEqual(types, sorted(types, key=["board", "member", "task", "comment"].index))
+        self.assertEqual(types.count("member"), self.board.members.count())
+        self.assertEqual(types.count("task"), self.task_count)
+        self.assertEqual(types.count("comment"), self.member_count)
+        self.assertEqual(records[0]["data"]["ticket_count"], self.task_count)
+        self.assertEqual(records[-1]["data"]["board_id"], self.board.id)
+
+    def test_resume_after_cursor_returns_the_rest(self):
+        client = self.client_for(self.members[0])
+        path = f"/api/boards/{self.board.id}/export/"
+        records = self.read_ndjson(client.get(path))
+
+        for index in (0, 5, 12, len(records) - 1):
+            rest = self.read_ndjson(client.get(path, {"after": records[index]["cursor"]}))
+            self.assertEqual(rest, records[index + 1:])
+
+    def test_csv_of_one_record_type(self):
+        response = self.client_for(self.owner).get(
+            f"/api/boards/{self.board.id}/export/", {"output": "csv", "records": "task"}
+        )
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode())))
+
+        self.assertEqual(rows[0][:3], ["cursor", "id", "board_id"])
+        self.assertEqual(len(rows), self.task_count + 1)
+        self.assertEqual(rows[1][0], f"{self.board.id}:task:{self.tasks[0].id}")
+
+    def test_csv_requires_one_record_type(self):
+        response = self.client_for(self.owner).get(
+            f"/api/boards/{self.board.id}/export/", {"output": "csv"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self):
+        response = self.client_for(self.owner).get(
+            f"/api/boards/{self.board.id}/export/", {"after": "1:tasks:x"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_gzip(self):
+        client = self.client_for(self.owner)
+        path = f"/api/boards/{self.board.id}/export/"
+        plain = b"".join(client.get(path).streaming_content)
+        response = client.get(path, {"gzip": "true"})
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(f'board-{self.board.id}.ndjson.gz', response["Content-Disposition"])
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), plain)
+
+    def test_outsider_is_forbidden(self):
+        response = self.client_for(self.outsider).get(f"/api/boards/{self.board.id}/export/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_all_is_scoped_to_the_user(self):
+        other = Board.objects.create(title="Other", owner=self.outsider)
+        response = self.client_for(self.outsider).get("/api/boards/export/", {"records": "board"})
+        records = self.read_ndjson(response)
+
+        self.assertEqual([record["data"]["id"] for record in records], [other.id])
+
+    def test_command_resumes_into_the_same_file(self):
+        Board.objects.create(title="Other", owner=self.outsider)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.ndjson.gz")
+            call_command("export_boards", gzip=True, output=path, chunk_size=2, stderr=StringIO())
+
+            with gzip.open(path, "rt") as file:
+                records = [json.loads(line) for line in file]
+
+            call_command(
+                "export_boards", gzip=True, output=path, after=records[9]["cursor"],
+                chunk_size=2, stderr=StringIO(),
+            )
+
+            with gzip.open(path, "rt") as file:
+                resumed = [json.loads(line) for line in file]
+
+        self.assertEqual(resumed, records + records[10:])
+        self.assertEqual([record["type"] for record in records].count("board"), 2)
+
+
+@override_settings(BOARD_IMPORT={"BATCH_SIZE": 4, "TRANSACTION_SIZE": 8, "MAX_ERRORS": 100})
+class BoardImportTests(ApiTestCase):
+    """
+    Boards are imported from NDJSON in batches with rejected lines reported.
+    """
+
+    def export_lines(self):
+        response = self.client_for(self.owner).get(f"/api/boards/{self.board.id}/export/")
+        return b"".join(response.streaming_content).decode().splitlines()
+
+    def post_import(self, lines, user=None, **extra):
+        response = self.client_for(user or self.admin).post(
+            "/api/boards/import/",
+            data="\n".join(lines).encode(),
+            content_type="application/x-ndjson",
+            **extra,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_round_trip_of_an_export(self):
+        lines = self.export_lines()
+        reports = self.post_import(lines)
+        report = reports[-1]
+
+        self.assertTrue(report["finished"])
+        self.assertEqual(report["lines"], len(lines))
+        self.assertEqual(report["rejected"], 0)
+        self.assertGreater(len(reports), 2)
+
+        self.board.refresh_from_db()
+        board = Board.objects.exclude(pk=self.board.pk).get()
+        self.assertEqual(board.title, self.board.title)
+        self.assertEqual(board.owner_id, self.owner.id)
+        self.assertEqual(
+            set(board.members.values_list("id", flat=True)),
+            set(self.board.members.values_list("id", flat=True)),
+        )
+
+        for field in Board.COUNTER_FIELDS:
+            self.assertEqual(getattr(board, field), getattr(self.board, field))
+
+        comments_counts = board.tasks.order_by("id").values_list("comments_count", flat=True)
+        expected = self.board.tasks.order_by("id").values_list("comments_count", flat=True)
+        self.assertEqual(list(comments_counts), list(expected))
+        self.assertEqual(board.tasks.get(comments_count__gt=0).comments.count(), self.member_count)
+
+    def test_invalid_lines_are_rejected_and_reported(self):
+        lines = [
+            json.dumps({"type": "board", "data": {"id": 1, "title": "B", "owner_email": "owner@example.com"}}),
+            "{not json",
+            json.dumps({"type": "task", "data": {"id": 1, "board_id": 1, "title": "T", "status": "todo", "priority": "high", "assignee_email": "nobody@example.com"}}),
+            json.dumps({"type": "task", "data": {"id": 2, "board_id": 1, "title": "T", "status": "later", "priority": "high"}}),
+            json.dumps({"type": "task", "data": {"id": 3, "board_id": 9, "title": "T", "status": "todo", "priority": "low"}}),
+            json.dumps({"type": "task", "data": {"id": 4, "board_id": 1, "title": "T", "status": "todo", "priority": "low", "assignee_id": self.members[0].id}}),
+            json.dumps({"type": "comment", "data": {"task_id": 1, "author": "a", "content": "c"}}),
+            json.dumps({"type": "comment", "data": {"task_id": 4, "author": "a", "content": "c"}}),
+        ]
+        report = self.post_import(lines)[-1]
+        errors = {error["line"]: error["errors"] for error in report["errors"]}
+
+        self.assertEqual(report["imported"], {"board": 1, "member": 0, "task": 1, "comment": 1})
+        self.assertEqual(report["rejected"], 5)
+        self.assertEqual(set(errors), {2, 3, 4, 5, 7})
+        self.assertIn("assignee", errors[3])
+        self.assertIn("status", errors[4])
+        self.assertIn("board_id", errors[5])
+        self.assertIn("task_id", errors[7])
+
+        task = Task.objects.get(board__title="B")
+        self.assertEqual(task.assignee_id, self.members[0].id)
+        self.assertEqual(task.comments_count, 1)
+        self.assertEqual(task.board.ticket_count, 1)
+        self.assertEqual(task.board.member_count, 1)
+
+    def test_users_are_resolved_once(self):
+        lines = [json.dumps({"type": "board", "data": {"id": 1, "title": "B", "owner_id": self.owner.id}})]
+        lines += [
+            json.dumps({"type": "task", "data": {
+                "board_id": 1, "title": f"T{index}", "status": "todo", "priority": "low",
+                "assignee_email": self.members[index % 2].email,
+            }})
+            for index in range(12)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = self.post_import(lines)[-1]
+
+        email_queries = [query for query in queries if '"auth_user"."email" IN' in query["sql"]]
+        self.assertEqual(report["imported"]["task"], 12)
+        self.assertEqual(len(email_queries), 1)
+
+    def test_gzip_body(self):
+        lines = self.export_lines()
+        response = self.client_for(self.admin).post(
+            "/api/boards/import/",
+            data=gzip.compress("\n".join(lines).encode()),
+            content_type="application/x-ndjson",
+            headers={"Content-Encoding": "gzip"},
+        )
+        report = json.loads(b"".join(response.streaming_content).decode().splitlines()[-1])
+        self.assertEqual(report["lines"], len(lines))
+        self.assertEqual(report["rejected"], 0)
+
+    def test_only_admins_may_import(self):
+        response = self.client_for(self.owner).post(
+            "/api/boards/import/", data=b"", content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_imports_a_gzipped_export(self):
+        lines = self.export_lines()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.ndjson.gz")
+
+            with gzip.open(path, "wt") as file:
+                file.write("\n".join(lines) + "\n")
+
+            stdout = StringIO()
+            call_command("import_boards", path, batch_size=3, stdout=stdout, stderr=StringIO())
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["imported"]["task"], self.task_count)
+        self.assertEqual(Board.objects.count(), 2)
+
+    def test_failed_transaction_is_not_reported(self):
+        lines = self.export_lines()
+        refresh_counters = BoardImport.refresh_counters
+        commits = []
+
+        def fail_second_commit(importer):
+            commits.append(importer)
+
+            if len(commits) == 2:
+                raise DatabaseError("disk I/O error")
+
+            refresh_counters(importer)
+
+        with (
+            override_settings(BOARD_IMPORT={
+                **settings.BOARD_IMPORT, "BATCH_SIZE": 5, "TRANSACTION_SIZE": 15
+            }),
+            patch.object(BoardImport, "refresh_counters", fail_second_commit),
+        ):
+            reports = self.post_import(lines)
+
+        committed, report = reports
+        self.assertIn("error", report)
+        self.assertEqual(report["lines"], 15)
+        self.assertEqual(report["imported"], committed["imported"])
+        self.assertEqual(report["rejected"], 0)
+
+        board = Board.objects.exclude(pk=self.board.pk).get()
+        self.assertEqual(board.tasks.count(), report["imported"]["task"])
+        self.assertEqual(board.members.count(), report["imported"]["member"])
@@ -0,0 +1,200 @@
+import importlib
+import sys
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseBase
+from django.urls import clear_url_caches
+from django.utils.module_loading import import_string
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from core.api.rows import get_row_plan
+from core.api.sparse import SparseFieldset
+from core.api.streaming import (
+    achunked,
+    ajson_array,
+    chunk_size,
+    stream_requested,
+    streaming_json_response,
+)
+from user_auth_app.authentication import CachedTokenAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Base class for read-only API views running natively under ASGI.
+
+    Does what DRF's `APIView` does for the endpoints it replaces, but
+    awaits the database through Django's async ORM instead of holding
+    a worker thread: token authentication, an authenticated-user check,
+    DRF exceptions mapped to the usual JSON error bodies and JSON
+    rendering with DRF's renderer, so responses are identical.
+
+    Subclasses implement `async def get(self, request, *args, **kwargs)`
+    returning `(data, status)` or a response.
+    """
+
+    http_method_names = ["get"]
+    authentication_class = CachedTokenAuthentication
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Authenticate the request and run the handler.
+        """
+        if request.method.lower() not in self.http_method_names:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+
+        api_request = Request(request)
+        authenticator = self.authentication_class()
+
+        try:
+            authenticated = await authenticator.aauthenticate(request)
+
+            if authenticated is None:
+                raise NotAuthenticated()
+
+            api_request.user, api_request.auth = authenticated
+            await self.check_permissions(api_request)
+            result = await self.get(api_request, *args, **kwargs)
+        except APIException as exc:
+            # Same body as DRF's exception handler.
+            if isinstance(exc.detail, (list, dict)):
+                data = exc.detail
+            else:
+                data = {"detail": exc.detail}
+
+            response = self.render(data, exc.status_code)
+
+            if exc.status_code == 401:
+                response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+
+            return response
+
+        if isinstance(result, HttpResponseBase):
+            return result
+
+        return self.render(*result)
+
+    async def check_permissions(self, request):
+        """
+        Hook for additional permission checks; raise to deny access.
+        """
+
+    def render(self, data, status=200):
+        """
+        Return `data` rendered as JSON.
+        """
+        return HttpResponse(
+            JSONRenderer().render(data),
+            status=status,
+            content_type="application/json",
+        )
+
+
+class AsyncListAPIView(AsyncAPIView):
+    """
+    Async list view filtered and paginated like the synchronous list
+    endpoints.
+    """
+
+    serializer_class = None
+    filter_backends = []
+
+    def get_queryset(self, request):
+        """
+        Return the queryset to list for the request.
+        """
+        raise NotImplementedError
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Return one page of serialized objects, or the streamed list.
+        """
+        queryset = self.get_queryset(request)
+
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+
+        paginator = import_string(settings.REST_FRAMEWORK["DEFAULT_PAGINATION_CLASS"])()
+        plan = get_row_plan(self.serializer_class, SparseFieldset.from_request(request))
+
+        if stream_requested(request):
+            return self.stream_list(request, queryset, paginator, plan)
+
+        if plan is not None:
+            page = await paginator.apaginate_queryset(plan.values(queryset), request, self)
+            data = await plan.arender_rows(page)
+        else:
+            page = await paginator.apaginate_queryset(queryset, request, self)
+            data = self.serializer_class(page, many=True, context={"request": request}).data
+
+        return paginator.get_paginated_response(data).data, 200
+
+    def stream_list(self, request, queryset, paginator, plan):
+        """
+        Return the whole list as a JSON array streamed from the async
+        ORM, like `RowListMixin.stream_list()`.
+        """
+        ordering = paginator.get_ordering(request, queryset, self)
+        queryset = queryset.order_by(*ordering)
+        size = chunk_size()
+
+        if plan is not None:
+            chunks = plan.astream(queryset, size)
+        else:
+            chunks = self.serialize_chunks(request, queryset, size)
+
+        return streaming_json_response(ajson_array(chunks))
+
+    async def serialize_chunks(self, request, queryset, size):
+        """
+        Yield the serialized objects of `queryset` in chunks.
+        """
+        async for instances in achunked(queryset.aiterator(chunk_size=size), size):
+            yield self.serializer_class(instances, many=True, context={"request": request}).data
+
+
+def read_async(sync_view, async_view):
+    """
+    Combine a synchronous API view with an async view for its reads.
+
+    GET requests go to `async_view`; all other methods are passed to
+    `sync_view` in a thread. The DRF attributes of `sync_view` are kept
+    so URL introspection still sees all supported methods.
+    """
+    async def view(request, *args, **kwargs):
+        if request.method == "GET":
+            return await async_view(request, *args, **kwargs)
+
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    for attribute in ("cls", "actions", "initkwargs"):
+        if hasattr(sync_view, attribute):
+            setattr(view, attribute, getattr(sync_view, attribute))
+
+    return csrf_exempt(view)
+
+
+# URL modules choosing views by ASYNC_READ_VIEWS, in reload order.
+ASYNC_VIEW_URLCONFS = ("tasks_app.api.urls", "boards_app.api.urls")
+
+
+@receiver(setting_changed)
+def reload_urlconfs(setting, **kwargs):
+    """
+    Rebuild the URL configuration when `ASYNC_READ_VIEWS` is overridden.
+    """
+    if setting != "ASYNC_READ_VIEWS":
+        return
+
+    for module in (*ASYNC_VIEW_URLCONFS, settings.ROOT_URLCONF):
+        if module in sys.modules:
+            importlib.reload(sys.modules[module])
+
+    clear_url_caches()
@@ -0,0 +1,48 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from the given version parts.
+
+    Datetimes are encoded with microsecond precision, so two changes
+    within the same second still produce different tags.
+    """
+    values = [
+        str(int(part.timestamp() * 1_000_000)) if hasattr(part, "timestamp") else str(part)
+        for part in parts
+    ]
+    return quote_etag("-".join(values))
+
+
+def conditional_response(request, etag, last_modified):
+    """
+    Evaluate the conditional request headers against a resource state.
+
+    Handles `If-None-Match` / `If-Modified-Since` (304) and `If-Match` /
+    `If-Unmodified-Since` (412).
+
+    Returns:
+        HttpResponse | None: The 304/412 response, or None if the full
+        response should be sent.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()),
+    )
+
+    if response is not None:
+        set_conditional_headers(response, etag, last_modified)
+
+    return response
+
+
+def set_conditional_headers(response, etag, last_modified):
+    """
+    Attach `ETag` and `Last-Modified` headers to a response.
+    """
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,64 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    Many-to-many field that resolves all submitted primary keys
+    with a single `IN` query instead of one query per key.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Validate the list of primary keys and return the matching objects
+        in the order they were submitted.
+        """
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_model_field = queryset.model._meta.pk
+        pks = []
+
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+
+            try:
+                if isinstance(item, (bool, dict, list)):
+                    raise TypeError
+                pks.append(pk_model_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        objects = queryset.in_bulk(pks)
+
+        for pk in pks:
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    `PrimaryKeyRelatedField` whose `many=True` form validates
+    all primary keys with one query.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        """
+        Wrap the field in a `BulkManyRelatedField` for `many=True`.
+        """
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+
+        return BulkManyRelatedField(**list_kwargs)
@@ -0,0 +1,182 @@
+import json
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor-based (keyset) pagination used by all list endpoints.
+
+    Pages are addressed by an opaque, encoded cursor instead of an offset,
+    so the database seeks directly to the primary key of the last row seen.
+    Response time therefore stays flat no matter how deep a client scrolls.
+
+    `apaginate_queryset()` fetches the page with the async ORM for async
+    views; both variants share the cursor handling of `CursorPagination`.
+
+    Views may order by a non-unique sort key followed by the id (see
+    `get_ordering()` of their filter backends). The cursor then holds
+    the values of all ordering fields and pages seek past that tuple,
+    instead of the offset `CursorPagination` uses for duplicate values.
+
+    Query Parameters:
+        cursor (str): Opaque cursor taken from the `next` / `previous` link.
+        page_size (int): Optional page size, capped at `max_page_size`.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "PAGINATION_MAX_PAGE_SIZE", 200)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return the requested page of `queryset` as a list.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of `paginate_queryset()`.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+
+        if queryset is None:
+            return None
+
+        return self.set_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Decode the cursor and return the sliced queryset of the page,
+        including one extra row to detect a following page.
+
+        Same as the first half of `CursorPagination.paginate_queryset()`.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.get_position_filter(current_position))
+
+        self._page_state = (offset, reverse, current_position)
+        return queryset[offset:offset + self.page_size + 1]
+
+    def get_url_after(self, url, position):
+        """
+        Return `url` with a cursor for the page after `position` in the
+        default ordering, for links into a list built elsewhere.
+        """
+        self.base_url = url
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=str(position)))
+
+    def get_position_filter(self, position):
+        """
+        Return the condition selecting the rows after `position` in the
+        direction being paged.
+
+        For orderings over several fields, the row comparison
+        `(a, b) > (x, y)` is spelled out as `a > x OR (a = x AND b > y)`,
+        which the database answers from an index on the ordering fields.
+        """
+        if len(self.ordering) == 1:
+            values = [position]
+        else:
+            try:
+                values = json.loads(position)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+
+        conditions = []
+        equal = Q()
+
+        for order, value in zip(self.ordering, values):
+            order_attr = order.lstrip("-")
+            lookup = "lt" if self.cursor.reverse != order.startswith("-") else "gt"
+            conditions.append(equal & Q(**{f"{order_attr}__{lookup}": value}))
+            equal &= Q(**{order_attr: value})
+
+        return reduce(operator.or_, conditions)
+
+    def _get_position_from_instance(self, instance, ordering):
+        """
+        Return the cursor position of `instance`; JSON-encoded values
+        of all fields for orderings over several fields.
+        """
+        if len(ordering) == 1:
+            return super()._get_position_from_instance(instance, ordering)
+
+        values = [
+            instance[order.lstrip("-")] if isinstance(instance, dict)
+            else getattr(instance, order.lstrip("-"))
+            for order in ordering
+        ]
+        return json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+    def set_page(self, results):
+        """
+        Store the fetched rows as the current page and work out the
+        previous and next positions.
+
+        Same as the second half of `CursorPagination.paginate_queryset()`.
+        """
+        offset, reverse, current_position = self._page_state
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
@@ -0,0 +1,468 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from core.api.sparse import SparseFieldset
+from core.api.streaming import (
+    achunked,
+    chunk_size,
+    chunked,
+    json_array,
+    stream_requested,
+    streaming_json_response,
+)
+
+
+# Fields whose representation of a database value is the value itself.
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    PrimaryKeyRelatedField,
+)
+
+
+class UnsupportedSerializer(Exception):
+    """
+    Raised when a serializer cannot be compiled into a row plan.
+    """
+
+
+def get_row_plan(serializer_class, fieldset=None):
+    """
+    Return the row plan of a serializer class for a fieldset, or None
+    if it is unsupported or `ROW_SERIALIZATION` is off.
+
+    Plans are compiled once per serializer class and fieldset.
+    """
+    if not settings.ROW_SERIALIZATION:
+        return None
+
+    fieldset = fieldset or SparseFieldset()
+    return _compile_row_plan(
+        serializer_class,
+        *(
+            None if paths is None else ",".join(sorted(paths))
+            for paths in (fieldset.fields, fieldset.expand)
+        ),
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_row_plan(serializer_class, fields, expand):
+    """
+    Compile the plan of `serializer_class` for the given parameters.
+    """
+    serializer = serializer_class(context={"fieldset": SparseFieldset(fields, expand)})
+
+    try:
+        return RowPlan(serializer)
+    except UnsupportedSerializer:
+        return None
+
+
+class RowListMixin:
+    """
+    List action of a generic view rendering its pages through the row
+    plan of its serializer, falling back to the serializer.
+
+    With `?stream=true` the whole list is streamed as a JSON array
+    instead, in the pagination's order, reading and rendering
+    `STREAMING["CHUNK_SIZE"]` rows at a time.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return one page of the list, or the streamed list.
+        """
+        plan = get_row_plan(
+            self.get_serializer_class(), SparseFieldset.from_request(request)
+        )
+
+        if stream_requested(request):
+            return self.stream_list(request, plan)
+
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+
+        if page is None:
+            return Response(plan.render_rows(list(queryset)))
+
+        return self.get_paginated_response(plan.render_rows(page))
+
+    def stream_list(self, request, plan):
+        """
+        Return the whole list as a streaming JSON array.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = self.paginator.get_ordering(request, queryset, self) if self.paginator else None
+
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        size = chunk_size()
+
+        if plan is not None:
+            chunks = plan.stream(queryset, size)
+        else:
+            chunks = (
+                self.get_serializer(instances, many=True).data
+                for instances in chunked(queryset.iterator(chunk_size=size), size)
+            )
+
+        return streaming_json_response(json_array(chunks))
+
+
+class RowPlan:
+    """
+    Precompiled plan rendering `.values()` rows like a model serializer.
+
+    Compiling walks the serializer's fields once and records, per
+    output key, the column to read and how to convert it:
+
+    * Plain model fields are copied; other model fields (dates) are
+      converted by their serializer field.
+    * Nested objects on a foreign key are read from columns joined
+      into the same query, like `select_related`. Each distinct object
+      is built once per response and reused.
+    * Nested lists and id lists on reverse foreign keys and many-to-many
+      relations are loaded with one extra query per relation, like
+      `prefetch_related`.
+
+    Rendering then skips serializer instances and per-field dispatch
+    while producing the same data as the serializer. Serializers with
+    anything else (method fields, custom `to_representation()`, dotted
+    sources) raise `UnsupportedSerializer`.
+    """
+
+    def __init__(self, serializer, prefix=""):
+        """
+        Compile the plan of a bound serializer instance.
+
+        Args:
+            serializer: Model serializer whose fields to render.
+            prefix: Lookup path from the queried model to the rows of
+                this plan (`assignee__` for a joined user).
+        """
+        if (
+            not isinstance(serializer, serializers.ModelSerializer)
+            or type(serializer).to_representation is not serializers.Serializer.to_representation
+        ):
+            raise UnsupportedSerializer(type(serializer).__name__)
+
+        self.model = serializer.Meta.model
+        self.prefix = prefix
+        self.pk_column = f"{prefix}{self.model._meta.pk.attname}"
+        self.columns = [self.pk_column]
+        self.steps = []
+        self.relations = []
+
+        for key, field in serializer.fields.items():
+            if not field.write_only:
+                self.add_field(key, field)
+
+        self.columns = list(dict.fromkeys(self.columns))
+        self.shape = (self.model, tuple(
+            (key, kind, column[len(prefix):] if isinstance(column, str) else None)
+            for key, kind, column, _ in self.steps
+        ))
+
+    def add_field(self, key, field):
+        """
+        Add the step rendering one serializer field.
+        """
+        if field.source == "*" or len(field.source_attrs) != 1:
+            raise UnsupportedSerializer(key)
+
+        try:
+            model_field = self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise UnsupportedSerializer(key)
+
+        if isinstance(field, serializers.ListSerializer):
+            if type(field) is not serializers.ListSerializer:
+                raise UnsupportedSerializer(key)
+
+            relation = ManyRelation(model_field, RowPlan(field.child), self.pk_column)
+            self.relations.append(relation)
+            self.steps.append((key, "many", None, relation))
+        elif isinstance(field, ManyRelatedField):
+            if not isinstance(field.child_relation, PrimaryKeyRelatedField):
+                raise UnsupportedSerializer(key)
+
+            relation = ManyRelation(model_field, None, self.pk_column)
+            self.relations.append(relation)
+            self.steps.append((key, "ids", None, relation))
+        elif isinstance(field, serializers.BaseSerializer):
+            if not (model_field.many_to_one or model_field.one_to_one) or model_field.auto_created:
+                raise UnsupportedSerializer(key)
+
+            plan = RowPlan(field, prefix=f"{self.prefix}{model_field.name}__")
+
+            if plan.relations:
+                raise UnsupportedSerializer(key)
+
+            column = f"{self.prefix}{model_field.attname}"
+            plan.use_pk_column(column)
+            self.columns += plan.columns
+            self.steps.append((key, "object", column, plan))
+        elif model_field.is_relation and not model_field.concrete:
+            raise UnsupportedSerializer(key)
+        else:
+            column = f"{self.prefix}{model_field.attname}"
+            convert = None if isinstance(field, PLAIN_FIELDS) else field.to_representation
+            self.columns.append(column)
+            self.steps.append((key, "value", column, convert))
+
+    def use_pk_column(self, column):
+        """
+        Read the primary key from `column`, the foreign key pointing
+        to the rows of this plan, instead of the joined table.
+        """
+        self.columns = [column if name == self.pk_column else name for name in self.columns]
+        self.steps = [
+            (key, kind, column if source == self.pk_column else source, extra)
+            for key, kind, source, extra in self.steps
+        ]
+        self.pk_column = column
+
+    def values(self, queryset):
+        """
+        Return `queryset` as rows with the plan's columns and the
+        queryset's annotations (sort keys for the pagination).
+        """
+        return queryset.values(*self.columns, *queryset.query.annotations)
+
+    def row(self, instance):
+        """
+        Return the row of an already loaded instance.
+        """
+        row = {}
+
+        for column in self.columns:
+            value = instance
+
+            for name in column.split("__"):
+                value = None if value is None else getattr(value, name)
+
+            row[column] = value
+
+        return row
+
+    def get_relation(self, key):
+        """
+        Return the related list rendered at `key`, or None.
+        """
+        for step_key, kind, _, extra in self.steps:
+            if step_key == key and kind in ("many", "ids"):
+                return extra
+
+        return None
+
+    def render_rows(self, rows, skip=()):
+        """
+        Return the rendered rows, loading related lists as needed.
+
+        Related lists in `skip` are not loaded and render empty.
+        """
+        related = {
+            relation: (
+                {} if relation in skip
+                else relation.group(relation.render(relation.fetch(rows)))
+            )
+            for relation in self.relations
+        }
+        return self.render_all(rows, related)
+
+    async def arender_rows(self, rows, skip=()):
+        """
+        Async counterpart of `render_rows()`.
+        """
+        related = {}
+
+        for relation in self.relations:
+            if relation in skip:
+                related[relation] = {}
+                continue
+
+            fetched = await relation.afetch(rows)
+            rendered = await relation.arender(fetched)
+            related[relation] = relation.group(rendered)
+
+        return self.render_all(rows, related)
+
+    def stream(self, queryset, size):
+        """
+        Yield the rendered rows of `queryset` in chunks of `size`,
+        reading them from the database as they are needed.
+        """
+        for rows in chunked(self.values(queryset).iterator(chunk_size=size), size):
+            yield self.render_rows(rows)
+
+    async def astream(self, queryset, size):
+        """
+        Async counterpart of `stream()`.
+        """
+        async for rows in achunked(self.values(queryset).aiterator(chunk_size=size), size):
+            yield await self.arender_rows(rows)
+
+    def render_all(self, rows, related):
+        """
+        Render rows with their related lists already grouped by parent.
+        """
+        objects = {}
+        return [self.render_row(row, related, objects) for row in rows]
+
+    def render_row(self, row, related, objects):
+        """
+        Render a single row.
+
+        `objects` maps nested objects already built in this response
+        by their shape and id.
+        """
+        data = {}
+
+        for key, kind, column, extra in self.steps:
+            if kind == "value":
+                value = row[column]
+                data[key] = value if value is None or extra is None else extra(value)
+            elif kind == "object":
+                value = row[column]
+
+                if value is None:
+                    data[key] = None
+                else:
+                    cache = objects.setdefault(extra.shape, {})
+
+                    if value not in cache:
+                        cache[value] = extra.render_row(row, related, objects)
+
+                    data[key] = cache[value]
+            else:
+                data[key] = related[extra].get(row[self.pk_column], [])
+
+        return data
+
+
+class ManyRelation:
+    """
+    Reverse foreign key or many-to-many relation loaded with one query
+    for all parent rows, as a list of rendered rows (`plan`) or of ids.
+    """
+
+    def __init__(self, model_field, plan, parent_column):
+        """
+        Describe the relation `model_field` of the parent model, whose
+        rows hold their id in `parent_column`.
+        """
+        if not (model_field.one_to_many or model_field.many_to_many):
+            raise UnsupportedSerializer(model_field.name)
+
+        self.related_model = model_field.related_model
+        self.plan = plan
+        self.parent_column = parent_column
+        self.pk_column = self.related_model._meta.pk.attname
+
+        # Lookup from the related model back to the parent.
+        if model_field.auto_created:
+            self.lookup = model_field.field.name
+        else:
+            self.lookup = model_field.related_query_name()
+
+    def get_queryset(self, rows):
+        """
+        Return the query for the related rows of all parents, or None.
+        """
+        parent_ids = {row[self.parent_column] for row in rows}
+
+        if not parent_ids:
+            return None
+
+        columns = self.plan.columns if self.plan else [self.pk_column]
+        return (
+            self.related_model._default_manager
+            .filter(**{f"{self.lookup}__in": parent_ids})
+            .values(*columns, _parent=F(self.lookup))
+        )
+
+    def fetch(self, rows):
+        """
+        Load the related rows.
+        """
+        queryset = self.get_queryset(rows)
+        return [] if queryset is None else list(queryset)
+
+    async def afetch(self, rows):
+        """
+        Async counterpart of `fetch()`.
+        """
+        queryset = self.get_queryset(rows)
+        return [] if queryset is None else [row async for row in queryset]
+
+    def render(self, fetched):
+        """
+        Return `(parent id, rendered row)` pairs.
+        """
+        if self.plan is None:
+            return [(row["_parent"], row[self.pk_column]) for row in fetched]
+
+        return list(zip(
+            (row["_parent"] for row in fetched),
+            self.plan.render_rows(fetched),
+        ))
+
+    async def arender(self, fetched):
+        """
+        Async counterpart of `render()`.
+        """
+        if self.plan is None:
+            return self.render(fetched)
+
+        return list(zip(
+            (row["_parent"] for row in fetched),
+            await self.plan.arender_rows(fetched),
+        ))
+
+    def stream(self, rows, size):
+        """
+        Yield the rendered related rows of all parents in chunks.
+        """
+        queryset = self.get_queryset(rows)
+
+        if queryset is None:
+            return
+
+        for fetched in chunked(queryset.iterator(chunk_size=size), size):
+            yield [data for _, data in self.render(fetched)]
+
+    async def astream(self, rows, size):
+        """
+        Async counterpart of `stream()`.
+        """
+        queryset = self.get_queryset(rows)
+
+        if queryset is None:
+            return
+
+        async for fetched in achunked(queryset.aiterator(chunk_size=size), size):
+            yield [data for _, data in await self.arender(fetched)]
+
+    def group(self, pairs):
+        """
+        Return the rendered rows grouped by parent id.
+        """
+        grouped = {}
+
+        for parent_id, data in pairs:
+            grouped.setdefault(parent_id, []).append(data)
+
+        return grouped
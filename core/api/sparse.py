@@ -0,0 +1,228 @@
+from rest_framework import serializers
+
+
+class SparseFieldset:
+    """
+    The `fields` and `expand` query parameters of a read request.
+
+    Both are comma-separated lists of field paths, with dots for fields
+    of nested objects (`tasks.title`, `tasks.assignee`):
+
+    * `fields` keeps only the listed fields. A nested object lists all
+      of its fields unless some of them are named.
+    * `expand` switches relations to explicit expansion: listed
+      relations are embedded as objects, all other expandable
+      relations are returned as ids. Without `expand`, relations are
+      embedded as before.
+
+    Views use `includes()` and `expands()` to skip the joins and
+    prefetches of relations that are not rendered.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        """
+        Create a fieldset from the parameter values (None if absent).
+        """
+        self.fields = self.parse(fields)
+        self.expand = self.parse(expand)
+
+    @staticmethod
+    def parse(value):
+        """
+        Return the paths of a comma-separated parameter, or None.
+        """
+        if value is None:
+            return None
+
+        return {path.strip() for path in value.split(",") if path.strip()}
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Return the fieldset of a request.
+
+        Only reads are sparse; writes always validate and return
+        complete objects.
+        """
+        if request is None or request.method not in ("GET", "HEAD"):
+            return cls()
+
+        params = request.query_params if hasattr(request, "query_params") else request.GET
+        return cls(params.get("fields"), params.get("expand"))
+
+    @staticmethod
+    def names_at(paths, prefix):
+        """
+        Return the first names of the paths below `prefix`, or None if
+        no path is below it.
+        """
+        if paths is None:
+            return None
+
+        start = f"{prefix}." if prefix else ""
+        names = {
+            path[len(start):].split(".")[0]
+            for path in paths
+            if path.startswith(start) and len(path) > len(start)
+        }
+        return names or None
+
+    def fields_at(self, prefix=""):
+        """
+        Return the field names requested at `prefix`, or None for all.
+        """
+        return self.names_at(self.fields, prefix)
+
+    def expand_at(self, prefix=""):
+        """
+        Return the relations to expand at `prefix`, or None for all.
+        """
+        if self.expand is None:
+            return None
+
+        return self.names_at(self.expand, prefix) or set()
+
+    def includes(self, path):
+        """
+        Return whether the field at `path` is rendered.
+        """
+        prefix = ""
+
+        for name in path.split("."):
+            names = self.fields_at(prefix)
+
+            if names is not None and name not in names:
+                return False
+
+            prefix = f"{prefix}.{name}" if prefix else name
+
+        return True
+
+    def expands(self, path):
+        """
+        Return whether the relation at `path` is rendered as an object.
+        """
+        if not self.includes(path):
+            return False
+
+        prefix = ""
+
+        for name in path.split("."):
+            names = self.expand_at(prefix)
+
+            if names is not None and name not in names:
+                return False
+
+            prefix = f"{prefix}.{name}" if prefix else name
+
+        return True
+
+    def select_related(self, queryset, *relations, prefix=""):
+        """
+        Return `queryset` joining only the `relations` that are expanded.
+
+        Args:
+            queryset: Queryset of the objects serialized at `prefix`.
+            relations: Foreign key names on those objects.
+            prefix: Field path of the objects below the root.
+        """
+        selected = [
+            relation for relation in relations
+            if self.expands(f"{prefix}.{relation}" if prefix else relation)
+        ]
+
+        if not selected:
+            return queryset
+
+        return queryset.select_related(*selected)
+
+    def etag_parts(self):
+        """
+        Return parts distinguishing this representation in an ETag.
+
+        Empty for the full representation, so its tag is unchanged.
+        """
+        return [
+            f"{name}={','.join(sorted(paths))}"
+            for name, paths in (("fields", self.fields), ("expand", self.expand))
+            if paths is not None
+        ]
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin applying the request's `SparseFieldset`.
+
+    Works for root and nested serializers: a nested serializer applies
+    the part of the fieldset below its field path. Relations named in
+    `expandable_fields` are replaced with their ids when not expanded;
+    the value is the attribute holding the id (`assignee_id`), or the
+    relation itself for to-many relations.
+    """
+
+    expandable_fields = {}
+
+    def get_fields(self):
+        """
+        Return the fields selected by the fieldset.
+        """
+        fields = super().get_fields()
+        fieldset = self.get_fieldset()
+        prefix = self.get_field_path()
+
+        requested = fieldset.fields_at(prefix)
+
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items()
+                if name in requested or field.write_only
+            }
+
+        expanded = fieldset.expand_at(prefix)
+
+        if expanded is not None:
+            for name, source in self.expandable_fields.items():
+                if name in fields and name not in expanded:
+                    fields[name] = self.get_collapsed_field(name, fields[name], source)
+
+        return fields
+
+    def get_collapsed_field(self, name, field, source):
+        """
+        Return the field rendering a relation as ids.
+        """
+        # DRF rejects a source equal to the field name.
+        kwargs = {"read_only": True}
+
+        if source != name:
+            kwargs["source"] = source
+
+        if isinstance(field, serializers.ListSerializer):
+            return serializers.PrimaryKeyRelatedField(many=True, **kwargs)
+
+        return serializers.IntegerField(**kwargs)
+
+    def get_fieldset(self):
+        """
+        Return the fieldset of the request, parsed once per response.
+        """
+        context = self.context
+
+        if "fieldset" not in context:
+            context["fieldset"] = SparseFieldset.from_request(context.get("request"))
+
+        return context["fieldset"]
+
+    def get_field_path(self):
+        """
+        Return the dotted path of this serializer below the root.
+        """
+        names = []
+        node = self
+
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+
+        return ".".join(reversed(names))
@@ -0,0 +1,138 @@
+import uuid
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def stream_requested(request):
+    """
+    Return whether a GET request asks for a streamed response
+    (`?stream=true`).
+    """
+    params = request.query_params if hasattr(request, "query_params") else request.GET
+    return request.method == "GET" and params.get("stream", "").lower() in TRUE_VALUES
+
+
+def chunk_size():
+    """
+    Return the number of rows fetched and rendered at a time.
+    """
+    return settings.STREAMING["CHUNK_SIZE"]
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of up to `size` items of `iterable`.
+    """
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(aiterable, size):
+    """
+    Async counterpart of `chunked()`.
+    """
+    chunk = []
+
+    async for item in aiterable:
+        chunk.append(item)
+
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _render_items(renderer, items):
+    """
+    Return the rendered items of a chunk without the array brackets.
+    """
+    return renderer.render(items)[1:-1]
+
+
+def json_array(chunks):
+    """
+    Yield a JSON array of the items in `chunks` (lists of items), one
+    chunk at a time. Items are rendered like DRF's `JSONRenderer`.
+    """
+    renderer = JSONRenderer()
+    separator = b""
+    yield b"["
+
+    for items in chunks:
+        if items:
+            yield separator + _render_items(renderer, items)
+            separator = b","
+
+    yield b"]"
+
+
+async def ajson_array(chunks):
+    """
+    Async counterpart of `json_array()` for an async iterable of chunks.
+    """
+    renderer = JSONRenderer()
+    separator = b""
+    yield b"["
+
+    async for items in chunks:
+        if items:
+            yield separator + _render_items(renderer, items)
+            separator = b","
+
+    yield b"]"
+
+
+def split_document(data, key):
+    """
+    Return the JSON of `data` before and after the value at `key`.
+    """
+    renderer = JSONRenderer()
+    placeholder = f"\x00{uuid.uuid4().hex}"
+    head, tail = renderer.render({**data, key: placeholder}).split(
+        renderer.render(placeholder), 1
+    )
+    return head, tail
+
+
+def json_document(data, key, chunks):
+    """
+    Yield the JSON of `data` with the list at `key` streamed from
+    `chunks`, keeping the key's position.
+    """
+    head, tail = split_document(data, key)
+    yield head
+    yield from json_array(chunks)
+    yield tail
+
+
+async def ajson_document(data, key, chunks):
+    """
+    Async counterpart of `json_document()`.
+    """
+    head, tail = split_document(data, key)
+    yield head
+
+    async for part in ajson_array(chunks):
+        yield part
+
+    yield tail
+
+
+def streaming_json_response(content):
+    """
+    Return a streaming JSON response over the parts in `content`.
+
+    Under ASGI only async iterators are streamed; Django collects
+    synchronous iterators before sending them.
+    """
+    return StreamingHttpResponse(content, content_type="application/json")
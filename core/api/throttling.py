@@ -0,0 +1,289 @@
+import hashlib
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+from core.cache import NamespacedCache, configured_by
+
+
+DEFAULT_THROTTLING = {
+    "ENABLED": True,
+    "BACKEND": "local",
+    "MAX_ENTRIES": 100000,
+    "CACHE_ALIAS": "default",
+    "KEY_PREFIX": "throttle",
+    "RATES": {},
+}
+
+# Buckets of a scope, in the order they are charged.
+BUCKET_KINDS = ("ip", "email", "global")
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def throttling_config():
+    """
+    Return the `THROTTLING` setting merged with its defaults.
+    """
+    return {
+        **DEFAULT_THROTTLING,
+        **getattr(settings, "THROTTLING", {}),
+    }
+
+
+def parse_rate(rate):
+    """
+    Return the capacity and the refill rate (tokens per second) of a
+    rate such as `"10/min"`.
+
+    Raises:
+        ImproperlyConfigured: If the rate is malformed.
+    """
+    try:
+        count, period = rate.split("/")
+        capacity = int(count)
+        seconds = PERIODS[period.strip()[0]]
+    except (AttributeError, ValueError, IndexError, KeyError):
+        raise ImproperlyConfigured(
+            f"Invalid throttle rate {rate!r}; use '<requests>/<s|min|hour|day>'."
+        )
+
+    if capacity < 1:
+        raise ImproperlyConfigured(f"Invalid throttle rate {rate!r}; allow at least one request.")
+
+    return capacity, capacity / seconds
+
+
+def bucket_key(scope, kind, ident):
+    """
+    Return the key of a bucket; only a hash of the client's IP address
+    or email is stored.
+    """
+    digest = hashlib.sha256(ident.encode()).hexdigest()
+    return f"{scope}:{kind}:{digest}"
+
+
+def refill(bucket, capacity, refill_rate, now):
+    """
+    Take one token from a bucket.
+
+    Args:
+        bucket: `(tokens, updated_at)`, or None for a full bucket.
+
+    Returns:
+        tuple: The new bucket, and 0 if a token was taken or else the
+        seconds until one is available.
+    """
+    tokens, updated_at = bucket if bucket is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(now - updated_at, 0) * refill_rate)
+
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+
+    return (tokens, now), (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+    """
+    In-process token buckets and rejection counts.
+
+    Buckets are kept per worker process, so every process allows the
+    full rate; the least recently used bucket is dropped (which counts
+    as refilled) once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries):
+        """
+        Create an empty store.
+        """
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._rejections = Counter()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        """
+        Take a token from bucket `key` and return 0, or the seconds
+        until one is available.
+        """
+        with self._lock:
+            bucket, wait = refill(
+                self._buckets.get(key), capacity, refill_rate, time.monotonic()
+            )
+            self._buckets[key] = bucket
+            self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def record_rejection(self, scope, kind):
+        """
+        Count a request rejected by a bucket of `scope`.
+        """
+        with self._lock:
+            self._rejections[(scope, kind)] += 1
+
+    def rejections(self, scopes):
+        """
+        Return the rejection counts per scope and bucket kind.
+        """
+        with self._lock:
+            return {
+                scope: {kind: self._rejections[(scope, kind)] for kind in BUCKET_KINDS}
+                for scope in scopes
+            }
+
+    def clear(self):
+        """
+        Refill all buckets and reset the counts.
+        """
+        with self._lock:
+            self._buckets.clear()
+            self._rejections.clear()
+
+
+class DjangoBucketStore(NamespacedCache):
+    """
+    Token buckets and rejection counts in one of the caches configured
+    in `CACHES`, shared by all worker processes.
+
+    Buckets are read and written without a lock, so concurrent requests
+    may occasionally both take the last token of a bucket. Buckets
+    expire once they would be full again.
+    """
+
+    def consume(self, key, capacity, refill_rate):
+        """
+        Take a token from bucket `key` and return 0, or the seconds
+        until one is available.
+        """
+        cache_key = self._make_key("bucket", key)
+        bucket, wait = refill(self.cache.get(cache_key), capacity, refill_rate, time.time())
+        self.cache.set(cache_key, bucket, math.ceil(capacity / refill_rate))
+        return wait
+
+    def record_rejection(self, scope, kind):
+        """
+        Count a request rejected by a bucket of `scope`.
+        """
+        key = self._make_key("rejected", scope, kind)
+        self.cache.add(key, 0, None)
+
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr().
+            self.cache.set(key, 1, None)
+
+    def rejections(self, scopes):
+        """
+        Return the rejection counts per scope and bucket kind.
+        """
+        keys = {
+            (scope, kind): self._make_key("rejected", scope, kind)
+            for scope in scopes
+            for kind in BUCKET_KINDS
+        }
+        counts = self.cache.get_many(keys.values())
+
+        return {
+            scope: {kind: counts.get(keys[(scope, kind)], 0) for kind in BUCKET_KINDS}
+            for scope in scopes
+        }
+
+
+@configured_by("THROTTLING")
+def get_throttle_store():
+    """
+    Return the bucket store configured by the `THROTTLING` setting.
+    """
+    config = throttling_config()
+
+    if config["BACKEND"] == "django":
+        return DjangoBucketStore(
+            alias=config["CACHE_ALIAS"],
+            key_prefix=config["KEY_PREFIX"],
+        )
+
+    return LocalBucketStore(max_entries=config["MAX_ENTRIES"])
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket throttle for the scope named by the view's
+    `throttle_scope`, or by `scope` in subclasses.
+
+    `THROTTLING['RATES'][scope]` sets the rate of up to three buckets:
+    one per client IP, one per email address submitted in the request
+    (body, or query string for GET) and one shared by all clients. A
+    request takes a token from each bucket in that order and is
+    rejected by the first empty one, so clients that are already
+    throttled do not drain the global bucket. Rejected requests are
+    answered with 429 and a `Retry-After` header and counted per scope
+    and bucket (see `throttling_metrics`).
+    """
+
+    scope = None
+
+    def __init__(self):
+        """
+        Start without a pending wait.
+        """
+        self.retry_after = None
+
+    def allow_request(self, request, view):
+        """
+        Return whether every bucket of the view's scope has a token.
+        """
+        config = throttling_config()
+        scope = getattr(view, "throttle_scope", None) or self.scope
+        rates = config["RATES"].get(scope) if config["ENABLED"] else None
+
+        if not rates:
+            return True
+
+        store = get_throttle_store()
+
+        for kind in BUCKET_KINDS:
+            ident = self.get_bucket_ident(request, kind)
+
+            if rates.get(kind) is None or ident is None:
+                continue
+
+            capacity, refill_rate = parse_rate(rates[kind])
+            wait = store.consume(bucket_key(scope, kind, ident), capacity, refill_rate)
+
+            if wait:
+                store.record_rejection(scope, kind)
+                self.retry_after = wait
+                return False
+
+        return True
+
+    def get_bucket_ident(self, request, kind):
+        """
+        Return what identifies the request's bucket of `kind`, or None
+        if the request has none (no email submitted).
+        """
+        if kind == "ip":
+            return self.get_ident(request)
+
+        if kind == "email":
+            data = request.query_params if request.method == "GET" else request.data
+            email = data.get("email") if hasattr(data, "get") else None
+            return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+        return ""
+
+    def wait(self):
+        """
+        Return the seconds until the rejecting bucket has a token.
+        """
+        return self.retry_after
@@ -1,11 +1,24 @@
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+
+from core.api.throttling import TokenBucketThrottle, get_throttle_store, throttling_config
+
+
+class EmailCheckThrottle(TokenBucketThrottle):
+    """
+    Token bucket throttle of `check_email`, which has no view class to
+    name its scope.
+    """
+
+    scope = "email-check"
 
 
 @api_view(["GET"])
+@throttle_classes([EmailCheckThrottle])
 def check_email(request):
     """
     Check whether a user with the given email address exists.
@@ -17,6 +30,7 @@ def check_email(request):
         200 OK: User ID, email, and full name if found.
         400 BAD REQUEST: If the email parameter is missing or invalid.
         404 NOT FOUND: If no user with the given email exists.
+        429 TOO MANY REQUESTS: Throttled (see `THROTTLING`).
     """
     email = request.query_params.get("email")
 
@@ -42,3 +56,26 @@ def check_email(request):
         },
         status=status.HTTP_200_OK,
     )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def throttling_metrics(request):
+    """
+    Return the number of requests rejected by each throttle bucket.
+
+    With the local backend, the counts are those of the worker process
+    serving the request since it started.
+
+    Returns:
+        200 OK: The backend and the rejections per scope and bucket.
+    """
+    config = throttling_config()
+
+    return Response(
+        {
+            "backend": config["BACKEND"],
+            "rejected": get_throttle_store().rejections(config["RATES"]),
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -2,6 +2,8 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project with an ASGI server (e.g. uvicorn or daphne) to keep the
+live board event streams (/api/boards/<id>/events/) from blocking threads.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,167 @@
+import math
+import os
+import random
+import statistics
+import threading
+import time
+
+from django.db import connections
+
+from core.middleware import TRANSACTION_CONTROL
+
+
+def percentile(values, pct):
+    """
+    Return the `pct` percentile of `values` using linear interpolation.
+    """
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+
+    if lower == upper:
+        return ordered[lower]
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_latencies(latencies_ms):
+    """
+    Return p50/p95/p99, mean, min and max of latencies in milliseconds.
+    """
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "min_ms": round(min(latencies_ms), 3),
+        "max_ms": round(max(latencies_ms), 3),
+    }
+
+
+class QueryCounter:
+    """
+    Context manager counting the SQL statements executed on a database.
+
+    Uses a connection execute wrapper, so it works regardless of `DEBUG`
+    and is not affected by `reset_queries()` at the start of a request.
+    Transaction control statements are not counted, as in the query
+    budgets of `QueryInspectionMiddleware`.
+    """
+
+    def __init__(self, using="default"):
+        """
+        Create a counter for the database alias `using`.
+        """
+        self.using = using
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Count and execute a single statement.
+        """
+        if not TRANSACTION_CONTROL.match(sql):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        """
+        Start counting.
+        """
+        self._wrapper = connections[self.using].execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop counting.
+        """
+        self._wrapper.__exit__(*exc_info)
+
+
+def setup_worker(environ):
+    """
+    Configure Django in a spawned worker process with `environ` added
+    to its environment.
+
+    Lives here rather than in a management command, as the worker
+    imports it before Django is set up.
+    """
+    import django
+
+    os.environ.update(environ)
+    django.setup()
+
+
+def run_load_worker(ctx, threads, start_at, duration, write_ratio, seed):
+    """
+    Run a mixed read/write workload on `threads` threads of this process.
+
+    Reads fetch the board detail and the assigned task list, writes
+    change the status of a random task of the board (`ctx` as built by
+    the `benchmark_sqlite` command). All threads start at `start_at`
+    and stop after `duration` seconds.
+
+    Returns:
+        dict: Latencies in ms per operation kind and failed operations.
+    """
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    results = {"read": [], "write": [], "errors": 0}
+    lock = threading.Lock()
+    board_path = f"/api/boards/{ctx['board_id']}/"
+
+    def work(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(
+            HTTP_AUTHORIZATION=f"Token {ctx['token']}", raise_request_exception=False
+        )
+        latencies = {"read": [], "write": []}
+        errors = 0
+
+        time.sleep(max(0, start_at - time.time()))
+        deadline = time.time() + duration
+
+        while time.time() < deadline:
+            started = time.perf_counter()
+
+            if rng.random() < write_ratio:
+                kind = "write"
+                response = client.patch(
+                    f"/api/tasks/{rng.choice(ctx['task_ids'])}/",
+                    {"status": rng.choice(ctx["statuses"])},
+                    content_type="application/json",
+                )
+            else:
+                kind = "read"
+                response = client.get(
+                    board_path if rng.random() < 0.5 else "/api/tasks/assigned-to-me/"
+                )
+
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+
+        connections.close_all()
+
+        with lock:
+            results["read"] += latencies["read"]
+            results["write"] += latencies["write"]
+            results["errors"] += errors
+
+    workers = [threading.Thread(target=work, args=(index,)) for index in range(threads)]
+
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+    return results
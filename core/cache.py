@@ -0,0 +1,71 @@
+import functools
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+
+
+class NamespacedCache:
+    """
+    Base for stores that keep their entries in a Django cache under
+    a common key prefix.
+
+    `clear()` does nothing: Django can only clear a cache as a whole,
+    which would also wipe the entries of everything else that uses it.
+    """
+
+    def __init__(self, alias, key_prefix):
+        """
+        Create a store around the Django cache `alias`.
+        """
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        """
+        Return the Django cache instance for the current thread.
+        """
+        return caches[self.alias]
+
+    def _make_key(self, *parts):
+        """
+        Return the namespaced cache key for the given parts.
+        """
+        return ":".join((self.key_prefix, *parts))
+
+    def clear(self):
+        """
+        Do nothing; see the class docstring.
+        """
+
+
+def configured_by(setting):
+    """
+    Decorator turning a function that builds an object from `setting`
+    into one that returns the same object on every call.
+
+    The object is built on first use and rebuilt after `setting` is
+    overridden, e.g. with `override_settings` in tests.
+    """
+    def decorator(build):
+        instance = None
+
+        @functools.wraps(build)
+        def get():
+            nonlocal instance
+
+            if instance is None:
+                instance = build()
+
+            return instance
+
+        def reset(**kwargs):
+            nonlocal instance
+
+            if kwargs["setting"] == setting:
+                instance = None
+
+        setting_changed.connect(reset, weak=False)
+        return get
+
+    return decorator
@@ -0,0 +1,117 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+# SQLite connection profiles selected with DATABASE_PROFILE.
+#
+# "default" is Django's plain SQLite configuration: rollback journal,
+# deferred transactions. "production" serves concurrent requests:
+# WAL lets readers proceed while a write is in progress, and
+# immediate transactions take the write lock at BEGIN, so a
+# transaction that reads before writing waits for the busy timeout
+# instead of failing with "database is locked" when it upgrades its
+# lock. Every pragma can be overridden with its SQLITE_* environment
+# variable.
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "JOURNAL_MODE": "WAL",
+        "SYNCHRONOUS": "NORMAL",
+        "MMAP_SIZE": 256 * 1024 * 1024,
+        # Negative values are in KiB: 64 MiB per connection.
+        "CACHE_SIZE": -64 * 1024,
+        "BUSY_TIMEOUT": 5000,
+        "TRANSACTION_MODE": "IMMEDIATE",
+    },
+}
+
+# Settings applied as pragmas on every new connection, in this order.
+SQLITE_PRAGMAS = ("JOURNAL_MODE", "SYNCHRONOUS", "MMAP_SIZE", "CACHE_SIZE")
+
+SQLITE_SETTINGS = (*SQLITE_PRAGMAS, "BUSY_TIMEOUT", "TRANSACTION_MODE")
+
+
+def sqlite_profile(name, environ=os.environ):
+    """
+    Return the settings of a SQLite profile with the SQLITE_*
+    environment overrides applied.
+
+    Raises:
+        ImproperlyConfigured: If the profile does not exist.
+    """
+    if name not in SQLITE_PROFILES:
+        raise ImproperlyConfigured(
+            f"Unknown DATABASE_PROFILE {name!r}; use one of {', '.join(SQLITE_PROFILES)}."
+        )
+
+    profile = dict(SQLITE_PROFILES[name])
+
+    for setting in SQLITE_SETTINGS:
+        value = environ.get(f"SQLITE_{setting}")
+
+        if value:
+            profile[setting] = value
+
+    return profile
+
+
+def sqlite_database(name, profile="default", environ=os.environ, read_only=False):
+    """
+    Return the `DATABASES` entry of a SQLite database file.
+
+    Pragmas run as `init_command` on every new connection. The busy
+    timeout (in milliseconds) is passed to the driver as `timeout`,
+    which installs SQLite's busy handler.
+
+    Read-only connections (replicas) keep the journal mode of the file,
+    refuse writes with `query_only` and start deferred transactions,
+    so readers never wait for each other. In tests they mirror the
+    primary.
+    """
+    profile = sqlite_profile(profile, environ)
+    options = {}
+    pragmas = [
+        f"PRAGMA {setting.lower()}={profile[setting]}"
+        for setting in SQLITE_PRAGMAS
+        if setting in profile and not (read_only and setting == "JOURNAL_MODE")
+    ]
+
+    if read_only:
+        pragmas.append("PRAGMA query_only=1")
+        profile.pop("TRANSACTION_MODE", None)
+
+    init_command = ";".join(pragmas)
+
+    if init_command:
+        options["init_command"] = init_command
+
+    if "BUSY_TIMEOUT" in profile:
+        options["timeout"] = int(profile["BUSY_TIMEOUT"]) / 1000
+
+    if "TRANSACTION_MODE" in profile:
+        options["transaction_mode"] = profile["TRANSACTION_MODE"]
+
+    database = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "OPTIONS": options,
+    }
+
+    if read_only:
+        database["TEST"] = {"MIRROR": "default"}
+
+    return database
+
+
+def sqlite_replicas(paths, profile="default", environ=os.environ):
+    """
+    Return the `DATABASES` entries of read-only replicas named
+    `replica1`, `replica2`, ... for a comma-separated list of files.
+    """
+    paths = [path.strip() for path in paths.split(",") if path.strip()]
+
+    return {
+        f"replica{index}": sqlite_database(path, profile, environ, read_only=True)
+        for index, path in enumerate(paths, 1)
+    }
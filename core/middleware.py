@@ -0,0 +1,339 @@
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import Resolver404, resolve
+
+from core.query_budgets import QUERY_BUDGETS
+from core.routing import (
+    choose_replica,
+    current_read_alias,
+    reading_from,
+    replica_health,
+    routing_config,
+    sticky_cache,
+    sticky_key,
+)
+
+
+logger = logging.getLogger("core.query_inspection")
+
+DEFAULT_QUERY_INSPECTION = {
+    "ENABLED": False,
+    "REPEAT_THRESHOLD": 10,
+    "RAISE": False,
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"IN \((?:\?(?:, )?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+# Transaction control is not counted: `atomic()` runs BEGIN (or BEGIN
+# IMMEDIATE) outside a transaction and a savepoint inside one, e.g. in
+# TestCase, so counting either would make budgets depend on the caller.
+TRANSACTION_CONTROL = re.compile(
+    r"^\s*(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE
+)
+
+
+class QueryInspectionError(AssertionError):
+    """
+    Raised in test mode when a request repeats a query shape too often
+    or exceeds the query budget of its endpoint.
+    """
+
+
+def normalize_sql(sql):
+    """
+    Reduce a SQL statement to its shape.
+
+    Literals and placeholders become `?` and `IN` lists collapse to
+    `IN (...)`, so the same query with different parameters maps
+    to the same shape.
+    """
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording every statement of a request.
+
+    Savepoint statements are executed but not recorded, since whether
+    they appear depends on the surrounding transaction (e.g. in tests).
+    """
+
+    def __init__(self):
+        """
+        Create an empty recorder.
+        """
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Record and execute a single statement.
+        """
+        if not TRANSACTION_CONTROL.match(sql):
+            self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def repeated_shapes(self, threshold):
+        """
+        Return `(shape, count)` pairs for shapes seen more than `threshold` times.
+        """
+        shapes = Counter(normalize_sql(sql) for sql in self.statements)
+        return [
+            (shape, count)
+            for shape, count in shapes.most_common()
+            if count > threshold
+        ]
+
+
+def get_query_budget(request):
+    """
+    Return the query budget for the endpoint of `request`, or None.
+
+    Budgets are declared in `core.query_budgets.QUERY_BUDGETS` by
+    HTTP method and URL name.
+    """
+    match = getattr(request, "resolver_match", None)
+
+    if match is None:
+        return None
+
+    return QUERY_BUDGETS.get((request.method, match.view_name))
+
+
+class QueryInspectionMiddleware:
+    """
+    Record all SQL of a request and detect N+1 patterns and budget overruns.
+
+    Enabled through the `QUERY_INSPECTION` setting. Every statement is
+    grouped by its normalized shape; a shape repeating more than
+    `REPEAT_THRESHOLD` times is reported, as is a request exceeding the
+    query budget of its endpoint. Problems are logged, or raised as
+    `QueryInspectionError` when `RAISE` is set (used by the test suite).
+    The total is exposed in the `X-Query-Count` response header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Store the next handler in the middleware chain.
+        """
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process the request while recording its SQL statements.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        config = self.get_config()
+
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+
+        with self.recording(recorder):
+            response = self.get_response(request)
+
+        return self.inspect(request, response, recorder, config)
+
+    async def __acall__(self, request):
+        """
+        Async counterpart of `__call__()` for requests served under ASGI.
+
+        The execute wrappers are installed from the thread that runs the
+        request's database queries (the thread-sensitive executor of
+        `sync_to_async`), since database connections are per thread.
+        """
+        config = self.get_config()
+
+        if not config["ENABLED"]:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        stack = await sync_to_async(self.recording)(recorder)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        return self.inspect(request, response, recorder, config)
+
+    def get_config(self):
+        """
+        Return the `QUERY_INSPECTION` setting merged with its defaults.
+        """
+        return {
+            **DEFAULT_QUERY_INSPECTION,
+            **getattr(settings, "QUERY_INSPECTION", {}),
+        }
+
+    def recording(self, recorder):
+        """
+        Return a context that installs `recorder` on every connection.
+        """
+        stack = ExitStack()
+
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+        return stack
+
+    def inspect(self, request, response, recorder, config):
+        """
+        Report repeated query shapes and budget overruns of a request.
+        """
+        response["X-Query-Count"] = str(len(recorder.statements))
+        problems = []
+
+        for shape, count in recorder.repeated_shapes(config["REPEAT_THRESHOLD"]):
+            problems.append(f"Query repeated {count} times: {shape}")
+
+        budget = get_query_budget(request)
+
+        if budget is not None and len(recorder.statements) > budget:
+            problems.append(
+                f"{len(recorder.statements)} queries exceed the budget of {budget}."
+            )
+
+        for problem in problems:
+            message = f"{request.method} {request.path}: {problem}"
+
+            if config["RAISE"]:
+                raise QueryInspectionError(message)
+
+            logger.warning(message)
+
+        return response
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Serve the reads of list requests from a read replica.
+
+    GET and HEAD requests to views that name the handling action in
+    their `replica_actions` read from a healthy replica of
+    `DATABASE_ROUTING['REPLICAS']` (see `core.routing`); all other
+    requests and all writes use the primary. Every request with an
+    unsafe method pins its client to the primary for `STICKY_SECONDS`,
+    so clients always read their own writes. A replica whose queries
+    fail is taken out of rotation until its next health check.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    # Methods that may read from a replica, and methods that never pin.
+    replica_methods = ("GET", "HEAD")
+    safe_methods = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, get_response):
+        """
+        Store the next handler in the middleware chain.
+        """
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process the request with its reads routed to the chosen database.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        config = routing_config()
+
+        with reading_from(self.get_read_alias(request, config)):
+            response = self.get_response(request)
+
+        self.pin_to_primary(request, config)
+        return response
+
+    async def __acall__(self, request):
+        """
+        Async counterpart of `__call__()`. Health checks and the cache
+        run in a thread; the chosen database is inherited by the
+        threads running the request's queries.
+        """
+        config = routing_config()
+        alias = await sync_to_async(self.get_read_alias)(request, config)
+
+        with reading_from(alias):
+            response = await self.get_response(request)
+
+        await sync_to_async(self.pin_to_primary)(request, config)
+        return response
+
+    def process_exception(self, request, exception):
+        """
+        Take the replica out of rotation if one of its queries failed.
+        """
+        alias = current_read_alias()
+
+        if alias is not None and isinstance(exception, DatabaseError):
+            replica_health.mark_down(alias)
+
+    def get_read_alias(self, request, config):
+        """
+        Return the replica to read from, or None for the primary.
+        """
+        if not config["REPLICAS"] or request.method not in self.replica_methods:
+            return None
+
+        if not self.reads_from_replica(request):
+            return None
+
+        key = sticky_key(request, config)
+
+        if key is not None and sticky_cache(config).get(key):
+            return None
+
+        return choose_replica(config)
+
+    def reads_from_replica(self, request):
+        """
+        Return whether the view of the request allows replica reads.
+        """
+        try:
+            callback = resolve(request.path_info).func
+        except Resolver404:
+            return False
+
+        view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+        actions = getattr(callback, "actions", None)
+        action = actions.get("get") if actions else "get"
+
+        return action in getattr(view_class, "replica_actions", ())
+
+    def pin_to_primary(self, request, config):
+        """
+        Pin the client of a writing request to the primary.
+        """
+        if not config["REPLICAS"] or request.method in self.safe_methods:
+            return
+
+        key = sticky_key(request, config)
+
+        if key is not None:
+            sticky_cache(config).set(key, True, timeout=config["STICKY_SECONDS"])
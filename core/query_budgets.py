@@ -0,0 +1,101 @@
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+# Maximum number of SQL statements per request, keyed by HTTP method
+# and URL name. Counts include the token lookup of an uncached token
+# but not transaction control statements (BEGIN, savepoints).
+# Enforced by QueryInspectionMiddleware.
+QUERY_BUDGETS = {
+    ("GET", "board-list"): 2,
+    ("POST", "board-list"): 13,
+    ("GET", "board-detail"): 5,
+    ("PUT", "board-detail"): 11,
+    ("PATCH", "board-detail"): 11,
+    ("DELETE", "board-detail"): 9,
+    ("POST", "board-move-tasks"): 10,
+    ("GET", "board-columns"): 5,
+    ("GET", "board-changes"): 7,
+    # Export rows are read while the response streams, after the view.
+    ("GET", "board-export"): 3,
+    ("GET", "board-export-all"): 1,
+    # The import runs while its progress streams, after the view.
+    ("POST", "board-import"): 1,
+    ("GET", "board-events"): 3,
+    ("GET", "tasks-list"): 2,
+    ("POST", "tasks-list"): 8,
+    ("GET", "tasks-detail"): 3,
+    ("PUT", "tasks-detail"): 8,
+    ("PATCH", "tasks-detail"): 8,
+    ("DELETE", "tasks-detail"): 7,
+    ("GET", "tasks-assigned-to-me"): 2,
+    ("GET", "tasks-reviewing"): 2,
+    # Large batches are split by the database's parameter limit.
+    ("POST", "tasks-bulk"): 16,
+    ("GET", "tasks-search"): 4,
+    ("GET", "task-comments-list"): 4,
+    ("POST", "task-comments-list"): 8,
+    ("GET", "task-comments-detail"): 4,
+    ("DELETE", "task-comments-detail"): 9,
+    ("GET", "user-list"): 2,
+    ("POST", "user-list"): 4,
+    ("GET", "user-detail"): 2,
+    ("PUT", "user-detail"): 10,
+    ("PATCH", "user-detail"): 10,
+    ("DELETE", "user-detail"): 2,
+    ("POST", "registration"): 6,
+    ("POST", "login"): 4,
+    ("GET", "email-check"): 2,
+    ("GET", "throttling-metrics"): 1,
+}
+
+# URL names that are routed but never reachable or not part of the API.
+EXCLUDED_URL_NAMES = {"api-root"}
+
+EXCLUDED_NAMESPACES = {"admin"}
+
+_IGNORED_METHODS = {"options", "head", "trace"}
+
+
+def _view_methods(callback):
+    """
+    Return the HTTP methods a resolved view callback handles.
+    """
+    actions = getattr(callback, "actions", None)
+
+    if actions:
+        return {
+            method.upper()
+            for method in actions
+            if method not in _IGNORED_METHODS
+        }
+
+    view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+
+    if view_class is None:
+        return set()
+
+    return {
+        method.upper()
+        for method in view_class.http_method_names
+        if method not in _IGNORED_METHODS and hasattr(view_class, method)
+    }
+
+
+def api_endpoints(resolver=None):
+    """
+    Yield `(method, url_name)` for every API endpoint in the URL configuration.
+
+    `EXCLUDED_NAMESPACES` (the admin site) and `EXCLUDED_URL_NAMES` are skipped.
+    """
+    resolver = resolver or get_resolver()
+
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in EXCLUDED_NAMESPACES:
+                continue
+            yield from api_endpoints(pattern)
+        elif isinstance(pattern, URLPattern):
+            if not pattern.name or pattern.name in EXCLUDED_URL_NAMES:
+                continue
+            for method in _view_methods(pattern.callback):
+                yield method, pattern.name
@@ -0,0 +1,209 @@
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+DEFAULT_DATABASE_ROUTING = {
+    "REPLICAS": [],
+    "STICKY_SECONDS": 5,
+    "HEALTH_CHECK_INTERVAL": 10,
+    "CACHE_ALIAS": "default",
+    "KEY_PREFIX": "db-sticky",
+}
+
+# Models always read from the primary. Tokens are cached anyway, and a
+# token created by a login must authenticate the very next request.
+PRIMARY_MODELS = {"authtoken.token"}
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def routing_config():
+    """
+    Return the `DATABASE_ROUTING` setting merged with its defaults.
+    """
+    return {
+        **DEFAULT_DATABASE_ROUTING,
+        **getattr(settings, "DATABASE_ROUTING", {}),
+    }
+
+
+def current_read_alias():
+    """
+    Return the replica the current context reads from, or None.
+    """
+    return _read_alias.get()
+
+
+@contextmanager
+def reading_from(alias):
+    """
+    Route the reads of the current context to `alias` (None for the
+    primary) until the block exits.
+    """
+    token = _read_alias.set(alias)
+
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending writes to the primary and reads to the
+    replica chosen for the current request.
+
+    `DatabaseRoutingMiddleware` picks the replica for the reads of a
+    request with `reading_from()`; everything else reads from the
+    primary. Replicas hold the same data, so relations between objects
+    loaded from either are allowed, and they are never migrated
+    (replication copies the schema).
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Return the replica of the current request, if any.
+        """
+        if model._meta.label_lower in PRIMARY_MODELS:
+            return DEFAULT_DB_ALIAS
+
+        return current_read_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """
+        Always write to the primary, also for objects read from a replica.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Allow relations between objects of the primary and its replicas.
+        """
+        aliases = {DEFAULT_DB_ALIAS, *routing_config()["REPLICAS"]}
+
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Never migrate replicas.
+        """
+        if db in routing_config()["REPLICAS"]:
+            return False
+
+        return None
+
+
+class ReplicaHealth:
+    """
+    Process-wide record of which replicas answered their last check.
+
+    A replica is checked by querying its migration table, at most once
+    per `HEALTH_CHECK_INTERVAL` seconds, so a missing or empty replica
+    file counts as down. Replicas whose queries fail during a request
+    are marked down until their next check.
+    """
+
+    def __init__(self):
+        """
+        Create an empty record.
+        """
+        self._lock = threading.Lock()
+        self._status = {}
+
+    def is_healthy(self, alias, interval):
+        """
+        Return whether `alias` is up, checking it if its last check is
+        older than `interval` seconds.
+        """
+        with self._lock:
+            healthy, checked_at = self._status.get(alias, (False, None))
+
+        if checked_at is not None and time.monotonic() - checked_at < interval:
+            return healthy
+
+        healthy = self.check(alias)
+
+        with self._lock:
+            self._status[alias] = (healthy, time.monotonic())
+
+        return healthy
+
+    def check(self, alias):
+        """
+        Return whether a query on `alias` succeeds.
+        """
+        connection = connections[alias]
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+        except DatabaseError:
+            connection.close()
+            return False
+
+        return True
+
+    def mark_down(self, alias):
+        """
+        Record that a query on `alias` failed.
+        """
+        with self._lock:
+            self._status[alias] = (False, time.monotonic())
+
+    def reset(self):
+        """
+        Forget all checks.
+        """
+        with self._lock:
+            self._status.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+def choose_replica(config):
+    """
+    Return a random healthy replica, or None to read from the primary.
+    """
+    healthy = [
+        alias
+        for alias in config["REPLICAS"]
+        if replica_health.is_healthy(alias, config["HEALTH_CHECK_INTERVAL"])
+    ]
+
+    return random.choice(healthy) if healthy else None
+
+
+def sticky_key(request, config):
+    """
+    Return the cache key pinning the request's client to the primary,
+    or None for anonymous requests.
+
+    Clients are identified by their `Authorization` header, so the key
+    is known before authentication; only a hash of it is stored.
+    """
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+
+    if not authorization:
+        return None
+
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return f"{config['KEY_PREFIX']}:{digest}"
+
+
+def sticky_cache(config):
+    """
+    Return the cache holding the stickiness windows.
+    """
+    return caches[config["CACHE_ALIAS"]]
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.database import sqlite_database, sqlite_replicas
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -52,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.DatabaseRoutingMiddleware',
+    'core.middleware.QueryInspectionMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -76,14 +81,24 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# DATABASE_PROFILE selects the SQLite connection profile ("default" or
+# "production", see core/database.py); DATABASE_PATH overrides the file.
+# DATABASE_REPLICA_PATHS adds read-only replicas (comma-separated files),
+# kept in sync by the replicate_database command.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(
+        os.environ.get('DATABASE_PATH', BASE_DIR / 'db.sqlite3'),
+        profile=os.environ.get('DATABASE_PROFILE', 'default'),
+    ),
+    **sqlite_replicas(
+        os.environ.get('DATABASE_REPLICA_PATHS', ''),
+        profile=os.environ.get('DATABASE_PROFILE', 'default'),
+    ),
 }
 
+DATABASE_ROUTERS = ['core.routing.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,6 +147,172 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.authentication.CachedTokenAuthentication',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'core.api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+}
+
+
+# Query inspection
+# Records the SQL of every request, reports query shapes repeated more than
+# REPEAT_THRESHOLD times (N+1 patterns) and requests exceeding the budgets in
+# core/query_budgets.py. RAISE turns reports into errors (used by the tests).
+
+QUERY_INSPECTION = {
+    'ENABLED': DEBUG,
+    'REPEAT_THRESHOLD': 10,
+    'RAISE': False,
+}
+
+
+# Token authentication cache
+# Used by CachedTokenAuthentication. BACKEND is "local" (in-process LRU)
+# or "django" (the Django cache named by CACHE_ALIAS, shared by workers).
+# Cached tokens are dropped by the signals of Token.delete() and User.save().
+# Queryset updates and deletes send no signals, and with the local backend
+# other processes keep their copies, so revoked tokens and deactivated users
+# may authenticate for up to TIMEOUT seconds.
+
+TOKEN_AUTH_CACHE = {
+    'BACKEND': 'local',
+    'TIMEOUT': 60,
+    'MAX_ENTRIES': 10000,
+    'CACHE_ALIAS': 'default',
+    'KEY_PREFIX': 'auth-token',
+}
+
+
+# Throttling
+# Token buckets in front of the password-hashing and user lookup endpoints
+# (core/api/throttling.py), per client IP, per submitted email and shared by
+# all clients. Rates are "<requests>/<s|min|hour|day>": a bucket holds that
+# many requests and refills at that pace. A PBKDF2 hash takes about 0.4s of
+# CPU, so keep the global login and registration rates below the hashes per
+# second the workers can spare. BACKEND is "local" (buckets per worker
+# process) or "django" (the Django cache named by CACHE_ALIAS, shared by
+# workers).
+
+THROTTLING = {
+    'ENABLED': True,
+    'BACKEND': 'local',
+    'MAX_ENTRIES': 100000,
+    'CACHE_ALIAS': 'default',
+    'KEY_PREFIX': 'throttle',
+    'RATES': {
+        'login': {'ip': '10/min', 'email': '5/min', 'global': '4/s'},
+        'registration': {'ip': '5/min', 'email': '3/min', 'global': '2/s'},
+        'email-check': {'ip': '60/min', 'email': '30/min', 'global': '50/s'},
+    },
+}
+
+
+# Pagination
+# Upper bound for the `page_size` query parameter on list endpoints.
+
+PAGINATION_MAX_PAGE_SIZE = 200
+
+
+# Bulk task writes
+# Maximum number of items accepted by one request to /api/tasks/bulk/.
+
+TASK_BULK_MAX_ITEMS = 500
+
+
+# Board change feed
+# Default and maximum page size of /api/boards/{id}/changes/, and the age in
+# days after which the compact_board_changes command removes log entries.
+
+BOARD_CHANGES = {
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+    'RETENTION_DAYS': 30,
+}
+
+
+# Board columns
+# Default and maximum number of tasks per column in /api/boards/{id}/columns/.
+
+BOARD_COLUMNS = {
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 200,
+}
+
+
+# Task search
+# Default and maximum page size of /api/tasks/search/.
+
+TASK_SEARCH = {
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+}
+
+
+# Live board updates
+# Server-sent events at /api/boards/{id}/events/ (served under ASGI).
+# BROKER is "memory" (single process) or "changelog" (workers poll the
+# shared change log every POLL_INTERVAL seconds). A subscriber with more
+# than MAX_QUEUE pending events is told to resync. HEARTBEAT is the idle
+# keep-alive interval in seconds.
+
+LIVE_UPDATES = {
+    'BROKER': 'memory',
+    'MAX_QUEUE': 100,
+    'HEARTBEAT': 15,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+# Async read views
+# Serve the board list/detail and the assigned-to-me/reviewing task lists
+# with async views using the async ORM, so requests under ASGI do not hold
+# a thread while waiting on the database. Writes stay synchronous.
+
+ASYNC_READ_VIEWS = False
+
+
+# Row serialization
+# Render the task lists, board list and board detail from `.values()` rows
+# through precompiled row plans (core/api/rows.py) instead of serializer
+# instances. Responses are the same either way.
+
+ROW_SERIALIZATION = True
+
+
+# Streaming responses
+# With ?stream=true the task lists, the board list and the board detail's
+# tasks are streamed as JSON, reading and rendering CHUNK_SIZE rows at a
+# time. Under ASGI only the async read views (ASYNC_READ_VIEWS) stream.
+
+STREAMING = {
+    'CHUNK_SIZE': 500,
+}
+
+
+# Board import
+# The board import (/api/boards/import/ and the import_boards command)
+# validates and writes BATCH_SIZE lines at a time, commits every
+# TRANSACTION_SIZE lines and reports the errors of the first MAX_ERRORS
+# rejected lines.
+
+BOARD_IMPORT = {
+    'BATCH_SIZE': 1000,
+    'TRANSACTION_SIZE': 20000,
+    'MAX_ERRORS': 100,
+}
+
+
+# Database routing
+# List reads of views with `replica_actions` go to a healthy replica
+# (checked every HEALTH_CHECK_INTERVAL seconds); writes go to the primary.
+# After a write, the client reads from the primary for STICKY_SECONDS.
+# The windows are kept in the Django cache CACHE_ALIAS, which must be
+# shared by all workers.
+
+DATABASE_ROUTING = {
+    'REPLICAS': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': 5,
+    'HEALTH_CHECK_INTERVAL': 10,
+    'CACHE_ALIAS': 'default',
+    'KEY_PREFIX': 'db-sticky',
 }
@@ -0,0 +1,217 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from boards_app.models import Board
+from core.database import sqlite_database
+from core.routing import replica_health
+from tasks_app.models import Comments, Task
+
+
+# Query inspection settings for tests: any repeated query shape
+# or exceeded budget fails the request with QueryInspectionError.
+STRICT_QUERY_INSPECTION = {
+    "ENABLED": True,
+    "REPEAT_THRESHOLD": 3,
+    "RAISE": True,
+}
+
+
+class SelectRecorder:
+    """
+    Execute wrapper collecting the SELECT statements run on a connection.
+    """
+
+    def __init__(self):
+        """
+        Create an empty recorder.
+        """
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Record a SELECT statement and execute it.
+        """
+        if sql.lstrip().upper().startswith("SELECT"):
+            self.statements.append((sql, params))
+
+        return execute(sql, params, many, context)
+
+
+def explain_query_plan(sql, params):
+    """
+    Return the detail lines of SQLite's `EXPLAIN QUERY PLAN` for a statement.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def explain_queryset(queryset):
+    """
+    Return the SQLite query plan of a queryset.
+    """
+    return explain_query_plan(*queryset.query.sql_with_params())
+
+
+def full_scans(plan):
+    """
+    Return the plan lines that read a whole table or index.
+
+    SQLite reports those as `SCAN <table>`, optionally followed by
+    the index walked; indexed lookups are reported as `SEARCH`.
+    Scans of subquery results and co-routines are not table reads.
+    """
+    coroutines = {
+        line.removeprefix("CO-ROUTINE ") for line in plan if line.startswith("CO-ROUTINE ")
+    }
+
+    return [
+        line for line in plan
+        if line.startswith("SCAN ")
+        and line != "SCAN CONSTANT ROW"
+        and not line.startswith("SCAN (subquery-")
+        and line.removeprefix("SCAN ") not in coroutines
+    ]
+
+
+@contextmanager
+def sqlite_replica(alias="replica"):
+    """
+    Register a read-only replica database file as `alias` and route
+    replica reads to it for the duration of the block.
+
+    The file is empty until it is filled with `replicate_database`,
+    which copies the test database. The connection is added to
+    `connections` directly (overriding `DATABASES` does not reconfigure
+    them); test cases using it enter the block in `setUpClass()` and
+    add `alias` to their `databases` afterwards.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        database = sqlite_database(os.path.join(directory, f"{alias}.sqlite3"), read_only=True)
+        connections.settings[alias] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: dict(connections.settings[DEFAULT_DB_ALIAS]),
+            alias: database,
+        })[alias]
+        replica_health.reset()
+
+        try:
+            with override_settings(
+                DATABASE_ROUTING={**settings.DATABASE_ROUTING, "REPLICAS": [alias]}
+            ):
+                yield alias
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+            replica_health.reset()
+
+
+@override_settings(QUERY_INSPECTION=STRICT_QUERY_INSPECTION)
+class ApiTestCase(TestCase):
+    """
+    Base test case for API tests with shared test data.
+
+    Creates an admin, a board owner, several members, an outsider and a
+    board whose tasks and comments are spread over distinct users, so
+    that per-row queries show up as repeated query shapes.
+    """
+
+    member_count = 8
+    task_count = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create users, a board, tasks and comments once per test class.
+        """
+        super().setUpTestData()
+
+        cls.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "admin-password"
+        )
+        cls.owner = User.objects.create_user(
+            "owner", "owner@example.com", "owner-password"
+        )
+        cls.outsider = User.objects.create_user(
+            "outsider", "outsider@example.com", "outsider-password"
+        )
+        cls.members = [
+            User.objects.create_user(f"member{index}", f"member{index}@example.com")
+            for index in range(cls.member_count)
+        ]
+
+        cls.board = Board.objects.create(title="Board", owner=cls.owner)
+        cls.board.members.add(*cls.members)
+
+        cls.tasks = [
+            Task.objects.create(
+                board=cls.board,
+                title=f"Task {index}",
+                status="todo",
+                priority="high",
+                assignee=cls.members[index % cls.member_count],
+                reviewer=cls.members[(index + 1) % cls.member_count],
+                created_by=cls.owner,
+            )
+            for index in range(cls.task_count)
+        ]
+        cls.task = cls.tasks[0]
+
+        for member in cls.members:
+            Comments.objects.create(
+                task=cls.task, author=member.username, content="Comment"
+            )
+
+    def client_for(self, user):
+        """
+        Return an API client authenticated with the user's token.
+        """
+        client = APIClient()
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return client
+
+    def assertUsesIndex(self, queryset, index_name):
+        """
+        Fail unless the plan of `queryset` searches `index_name`
+        without a full table scan.
+        """
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only.")
+
+        plan = explain_queryset(queryset)
+
+        self.assertEqual(full_scans(plan), [], plan)
+        self.assertTrue(
+            any(f"INDEX {index_name} " in line for line in plan), plan
+        )
+
+    def assertNoFullScans(self, client, path):
+        """
+        Request `path` and fail if the plan of any SELECT it runs
+        contains a full table scan.
+        """
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only.")
+
+        recorder = SelectRecorder()
+
+        with connection.execute_wrapper(recorder):
+            response = client.get(path)
+
+        self.assertEqual(response.status_code, 200, path)
+        self.assertTrue(recorder.statements, path)
+
+        for sql, params in recorder.statements:
+            plan = explain_query_plan(sql, params)
+            self.assertEqual(full_scans(plan), [], f"{path}\n{sql}\n{plan}")
+
+        return response
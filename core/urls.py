@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from core.api.views import check_email
+from core.api.views import check_email, throttling_metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,5 +24,6 @@ urlpatterns = [
     path('api/tasks/', include('tasks_app.api.urls')),
     path('api/', include('user_auth_app.api.urls')),
     path('api/email-check/', check_email, name='email-check'),
+    path('api/throttling/', throttling_metrics, name='throttling-metrics'),
     # path('api-auth/', include('rest_framework.urls')),
 ]
@@ -0,0 +1,118 @@
+from datetime import date
+
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend
+
+from tasks_app.models import Task
+from .serializers import TaskFilterSerializer
+
+
+# Sort keys of the `ordering` parameter. Each is an annotation, so
+# the keyset pagination can page through it with the id as tie-breaker.
+# They are expressions, not columns: no index provides their order and
+# the keyset condition on them cannot seek, so every page of an ordered
+# list sorts all tasks matching the filters (a temporary B-tree in the
+# query plan). The cost grows with the filtered set, not the page size;
+# unordered lists page by id and seek.
+ORDERING_ANNOTATIONS = {
+    # Tasks without a due date come last.
+    "due_date": Coalesce(F("due_date"), Value(date.max)),
+    "priority": Case(
+        *(
+            When(priority=priority, then=Value(rank))
+            for rank, (priority, _) in enumerate(Task.PRIORITY_CHOICES)
+        ),
+        output_field=IntegerField(),
+    ),
+}
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filter backend for the task list endpoints.
+
+    Query Parameters:
+        board (int): Only tasks of this board.
+        status (str): Only tasks with this status (repeatable).
+        priority (str): Only tasks with this priority (repeatable).
+        assignee (int): Only tasks assigned to this user.
+        reviewer (int): Only tasks reviewed by this user.
+        due_after (date): Only tasks due on or after this date.
+        due_before (date): Only tasks due on or before this date.
+        overdue (bool): Only unfinished tasks whose due date has passed.
+        ordering (str): `due_date` or `priority`, prefixed with `-` for
+            descending order. Ties are ordered by id.
+
+    Every filter is an equality or range condition on an indexed
+    column, combined with AND. The orderings are not indexed: each page
+    sorts all matching tasks (see `ORDERING_ANNOTATIONS`). Only list
+    requests are filtered.
+    """
+
+    def get_params(self, request):
+        """
+        Return the validated filter parameters of the request.
+
+        Raises:
+            ValidationError: If a parameter is invalid.
+        """
+        params = TaskFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Return `queryset` restricted by the filter parameters and
+        annotated with the requested sort key.
+        """
+        if getattr(view, "action", "list") != "list":
+            return queryset
+
+        params = self.get_params(request)
+        conditions = {}
+
+        for name, lookup in (
+            ("board", "board_id"),
+            ("assignee", "assignee_id"),
+            ("reviewer", "reviewer_id"),
+            ("due_after", "due_date__gte"),
+            ("due_before", "due_date__lte"),
+        ):
+            if name in params:
+                conditions[lookup] = params[name]
+
+        for name in ("status", "priority"):
+            if params.get(name):
+                conditions[f"{name}__in"] = params[name]
+
+        queryset = queryset.filter(**conditions)
+
+        if params.get("overdue"):
+            queryset = (
+                queryset
+                .filter(due_date__lt=timezone.localdate())
+                .exclude(status="done")
+            )
+
+        ordering = params.get("ordering")
+
+        if ordering:
+            field = ordering.lstrip("-")
+            queryset = queryset.annotate(**{f"{field}_order": ORDERING_ANNOTATIONS[field]})
+
+        return queryset
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering for the keyset pagination, or None for
+        the default ordering by id.
+        """
+        ordering = self.get_params(request).get("ordering")
+
+        if not ordering:
+            return None
+
+        direction = "-" if ordering.startswith("-") else ""
+        return (f"{direction}{ordering.lstrip('-')}_order", "id")
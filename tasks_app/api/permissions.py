@@ -1,8 +1,7 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import PermissionDenied, NotFound
 
-from tasks_app.models import Task
-from boards_app.models import Board
+from boards_app.membership import BoardMembership
 
 
 class TaskPermission(BasePermission):
@@ -11,7 +10,8 @@ class TaskPermission(BasePermission):
 
     Rules:
     - Admins (superusers) have full access.
-    - Listing all tasks is restricted to admins.
+    - Listing tasks is allowed; the list only contains tasks of the
+      user's boards (all tasks for admins).
     - Creating a task requires a valid board and membership (owner or member).
     - Reading/updating a task requires board membership (owner or member).
     - Deleting a task is restricted to the task creator or the board owner.
@@ -30,21 +30,18 @@ class TaskPermission(BasePermission):
         if user.is_superuser:
             return True
 
-        if request.method == "GET" and getattr(view, "action", None) == "list":
-            raise PermissionDenied("Only admins can list all tasks.")
-
         if request.method == "POST":
             board_id = request.data.get("board")
 
             if not board_id:
                 raise PermissionDenied("Board ID is required to create a task.")
 
-            try:
-                board = Board.objects.get(pk=board_id)
-            except Board.DoesNotExist:
+            membership = BoardMembership.for_request(request)
+
+            if not membership.board_exists(board_id):
                 raise NotFound("Board does not exist.")
 
-            if board.owner == user or user in board.members.all():
+            if membership.is_member_or_owner(board_id):
                 return True
 
             raise PermissionDenied(
@@ -59,16 +56,17 @@ class TaskPermission(BasePermission):
         for the specific task instance.
         """
         user = request.user
-        board = obj.board
 
         if user.is_superuser:
             return True
 
+        membership = BoardMembership.for_request(request)
+
         if request.method in ["GET", "PUT", "PATCH"]:
-            return board.owner == user or user in board.members.all()
+            return membership.is_member_or_owner(obj.board_id)
 
         if request.method == "DELETE":
-            if board.owner == user or obj.created_by_id == user.id:
+            if obj.created_by_id == user.id or membership.is_owner(obj.board_id):
                 return True
 
             raise PermissionDenied(
@@ -98,15 +96,13 @@ class IsBoardMemberForTaskComments(BasePermission):
         if not task_id:
             raise NotFound("Task id missing.")
 
-        try:
-            task = Task.objects.select_related("board").get(pk=task_id)
-        except Task.DoesNotExist:
-            raise NotFound("Task not found.")
+        membership = BoardMembership.for_request(request)
+        board_id = membership.board_id_for_task(task_id)
 
-        user = request.user
-        board = task.board
+        if board_id is None:
+            raise NotFound("Task not found.")
 
-        if user.is_superuser or board.owner == user or user in board.members.all():
+        if request.user.is_superuser or membership.is_member_or_owner(board_id):
             return True
 
         raise PermissionDenied(self.message)
@@ -117,14 +113,19 @@ class IsBoardMemberForTaskComments(BasePermission):
         on a specific comment instance.
         """
         user = request.user
-        board = obj.task.board
+        membership = BoardMembership.for_request(request)
+        board_id = membership.board_id_for_task(obj.task_id)
 
         if request.method == "DELETE":
-            if user.is_superuser or obj.author == user.username or board.owner == user:
+            if (
+                user.is_superuser
+                or obj.author == user.username
+                or membership.is_owner(board_id)
+            ):
                 return True
 
             raise PermissionDenied(
                 "Only the comment author, board owner, or admin can delete this comment."
             )
 
-        return user.is_superuser or board.owner == user or user in board.members.all()
+        return user.is_superuser or membership.is_member_or_owner(board_id)
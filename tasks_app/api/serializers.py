@@ -1,19 +1,30 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
 
 from tasks_app.models import Task, Comments
+from tasks_app.search import search_terms
+from boards_app.changes import record_task_transitions
+from boards_app.counters import apply_task_transitions
+from boards_app.membership import BoardMembership
 from boards_app.models import Board
+from core.api.sparse import SparseFieldsMixin
 from user_auth_app.api.serializers import UserProfileSerializer
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for listing and managing tasks.
 
     Supports assigning and reviewing users via IDs while returning
-    detailed user profile data in responses.
+    detailed user profile data in responses. Reads accept `fields` and
+    `expand`; unexpanded users are returned as ids.
     """
 
+    expandable_fields = {"assignee": "assignee_id", "reviewer": "reviewer_id"}
+
     board = serializers.PrimaryKeyRelatedField(
         queryset=Board.objects.all(),
         help_text="Board ID the task belongs to."
@@ -47,16 +58,11 @@ class TaskListSerializer(serializers.ModelSerializer):
         help_text="Detailed profile of the reviewer."
     )
 
-    comments_count = serializers.SerializerMethodField(
+    comments_count = serializers.IntegerField(
+        read_only=True,
         help_text="Number of comments associated with the task."
     )
 
-    def get_comments_count(self, obj):
-        """
-        Return the number of comments related to the task.
-        """
-        return obj.comments.count()
-
     class Meta:
         """
         Serializer metadata.
@@ -78,11 +84,437 @@ class TaskListSerializer(serializers.ModelSerializer):
         ]
 
 
-class TaskNestedSerializer(serializers.ModelSerializer):
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Serializer validating the filter parameters of the task lists.
+    """
+
+    ORDERING_CHOICES = ["due_date", "-due_date", "priority", "-priority"]
+
+    board = serializers.IntegerField(
+        required=False,
+        help_text="Only tasks of this board."
+    )
+
+    status = serializers.ListField(
+        child=serializers.ChoiceField(choices=Task.STATUS_CHOICES),
+        required=False,
+        help_text="Only tasks with one of these statuses."
+    )
+
+    priority = serializers.ListField(
+        child=serializers.ChoiceField(choices=Task.PRIORITY_CHOICES),
+        required=False,
+        help_text="Only tasks with one of these priorities."
+    )
+
+    assignee = serializers.IntegerField(
+        required=False,
+        help_text="Only tasks assigned to this user."
+    )
+
+    reviewer = serializers.IntegerField(
+        required=False,
+        help_text="Only tasks reviewed by this user."
+    )
+
+    due_after = serializers.DateField(
+        required=False,
+        help_text="Only tasks due on or after this date."
+    )
+
+    due_before = serializers.DateField(
+        required=False,
+        help_text="Only tasks due on or before this date."
+    )
+
+    overdue = serializers.BooleanField(
+        required=False,
+        help_text="Only unfinished tasks whose due date has passed."
+    )
+
+    ordering = serializers.ChoiceField(
+        choices=ORDERING_CHOICES,
+        required=False,
+        help_text="Sort by due date or priority; prefix with - for descending."
+    )
+
+    def validate(self, attrs):
+        """
+        Check that the due date range is not reversed.
+        """
+        if (
+            "due_after" in attrs
+            and "due_before" in attrs
+            and attrs["due_after"] > attrs["due_before"]
+        ):
+            raise serializers.ValidationError(
+                {"due_before": "Must not be earlier than due_after."}
+            )
+
+        return attrs
+
+
+class TaskSearchQuerySerializer(serializers.Serializer):
+    """
+    Serializer validating the query parameters of the task search.
+    """
+
+    q = serializers.CharField(
+        max_length=200,
+        help_text="Words to search for in tasks and their comments."
+    )
+
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.TASK_SEARCH["MAX_PAGE_SIZE"],
+        default=settings.TASK_SEARCH["PAGE_SIZE"],
+        help_text="Maximum number of results."
+    )
+
+    offset = serializers.IntegerField(
+        min_value=0,
+        default=0,
+        help_text="Number of results to skip."
+    )
+
+    def validate_q(self, value):
+        """
+        Return the search terms of the query.
+
+        Raises:
+            ValidationError: If the query contains no words.
+        """
+        terms = search_terms(value)
+
+        if not terms:
+            raise serializers.ValidationError("Enter at least one word to search for.")
+
+        return terms
+
+
+class TaskSearchResultSerializer(TaskListSerializer):
+    """
+    Serializer for a task found by the search, with the matched text.
+    """
+
+    snippet = serializers.CharField(
+        read_only=True,
+        help_text="HTML excerpt of the match with the matched words in <mark>."
+    )
+
+    class Meta(TaskListSerializer.Meta):
+        """
+        Serializer metadata.
+        """
+        fields = [*TaskListSerializer.Meta.fields, "snippet"]
+
+
+class TaskBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer validating and writing a batch of tasks at once.
+
+    Referenced tasks, boards and users are each resolved with one query
+    for the whole batch. All items are written in a single transaction
+    with `bulk_create` / `bulk_update`, the board counters are
+    adjusted with one update per affected board and the change log
+    entries are appended with one insert. Errors are reported
+    per item, aligned with the submitted list; nothing is written
+    if any item is invalid.
+    """
+
+    user_fields = ("assignee_id", "reviewer_id")
+
+    def to_internal_value(self, data):
+        """
+        Validate every item, then check and resolve the references
+        of all valid items in bulk.
+
+        Raises:
+            ValidationError: With one error dict per submitted item
+            (empty for valid items).
+        """
+        if (
+            not isinstance(data, list)
+            or not data
+            or (self.max_length is not None and len(data) > self.max_length)
+        ):
+            # Let DRF report list-level errors in its usual format.
+            return super().to_internal_value(data)
+
+        items = []
+        errors = []
+
+        for item in data:
+            try:
+                items.append(self.run_child_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append(None)
+                errors.append(dict(exc.detail))
+
+        resolved = self.resolve_references(items, errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return resolved
+
+    def resolve_references(self, items, errors):
+        """
+        Resolve tasks, boards and users referenced by the items.
+
+        Each kind of reference is loaded with a single query. Problems
+        are added to `errors` at the index of the offending item.
+
+        Returns:
+            list[dict]: The items with `task` set to the task to update
+            (None for creates) and related ids replaced by instances.
+        """
+        request = self.context["request"]
+        user = request.user
+        valid = [item for item in items if item is not None]
+        task_ids = [item["id"] for item in valid if "id" in item]
+        tasks = Task.objects.select_related("assignee", "reviewer").in_bulk(task_ids)
+
+        membership = BoardMembership.for_request(request)
+        membership.preload(
+            [item["board"] for item in valid if "board" in item]
+            + [task.board_id for task in tasks.values()]
+        )
+
+        user_ids = {
+            item[field]
+            for item in valid
+            for field in self.user_fields
+            if item.get(field) is not None
+        }
+        users = User.objects.in_bulk(user_ids)
+
+        resolved = []
+        seen_ids = set()
+
+        for item, item_errors in zip(items, errors):
+            if item is None:
+                resolved.append(None)
+                continue
+
+            item = dict(item)
+            task = None
+
+            if "id" in item:
+                task_id = item.pop("id")
+                task = tasks.get(task_id)
+
+                if task is None:
+                    item_errors["id"] = [f"Task {task_id} does not exist."]
+                elif task_id in seen_ids:
+                    item_errors["id"] = [f"Task {task_id} appears more than once."]
+
+                seen_ids.add(task_id)
+
+            board_ids = set()
+
+            if "board" in item:
+                item["board_id"] = item.pop("board")
+                board_ids.add(item["board_id"])
+            if task is not None:
+                board_ids.add(task.board_id)
+
+            for board_id in sorted(board_ids):
+                if not membership.board_exists(board_id):
+                    item_errors["board"] = [f"Board {board_id} does not exist."]
+                elif not (user.is_superuser or membership.is_member_or_owner(board_id)):
+                    item_errors["board"] = [
+                        f"You are not a member of board {board_id}."
+                    ]
+
+            for field in self.user_fields:
+                if field not in item:
+                    continue
+
+                user_id = item.pop(field)
+
+                if user_id is not None and user_id not in users:
+                    item_errors[field] = [f"User {user_id} does not exist."]
+
+                item[field.removesuffix("_id")] = users.get(user_id)
+
+            resolved.append({**item, "task": task})
+
+        return resolved
+
+    def create(self, validated_data):
+        """
+        Insert new tasks and update existing ones in one transaction.
+
+        The stored board, status and priority of the updated tasks are
+        read again with a row lock inside the transaction, so the
+        counter deltas match what is replaced even if the tasks changed
+        since they were validated.
+
+        Raises:
+            ValidationError: If an updated task was deleted meanwhile.
+
+        Returns:
+            list[Task]: The written tasks in the submitted order.
+        """
+        user = self.context["request"].user
+        now = timezone.now()
+        created = []
+        updated = []
+        update_fields = {"updated_at"}
+        items = []
+
+        for changes in validated_data:
+            changes = dict(changes)
+            task = changes.pop("task")
+
+            if task is None:
+                task = Task(created_by=user, **changes)
+                created.append(task)
+                items.append((task, None))
+            else:
+                for field, value in changes.items():
+                    setattr(task, field, value)
+
+                task.updated_at = now
+                update_fields.update(
+                    field.removesuffix("_id") for field in changes
+                )
+                updated.append(task)
+                items.append((task, changes))
+
+        with transaction.atomic():
+            stored = {
+                pk: (board_id, status, priority)
+                for pk, board_id, status, priority in (
+                    Task.objects
+                    .select_for_update()
+                    .filter(pk__in=[task.pk for task in updated])
+                    .values_list("pk", "board_id", "status", "priority")
+                )
+            }
+            missing = sorted(task.pk for task in updated if task.pk not in stored)
+
+            if missing:
+                raise serializers.ValidationError({
+                    "id": [
+                        "Tasks do not exist: " + ", ".join(map(str, missing))
+                    ]
+                })
+
+            transitions = []
+
+            for task, changes in items:
+                old_state = None
+
+                if changes is not None:
+                    old_state = stored[task.pk]
+
+                    # Fields the item leaves alone keep their stored value,
+                    # also where another item makes bulk_update() write them.
+                    for field, value in zip(("board_id", "status", "priority"), old_state):
+                        if field not in changes:
+                            setattr(task, field, value)
+
+                transitions.append((old_state, task.counter_state))
+
+            Task.objects.bulk_create(created)
+
+            if updated:
+                Task.objects.bulk_update(updated, sorted(update_fields))
+
+            apply_task_transitions(transitions)
+            record_task_transitions(
+                (task.pk, old_state[0] if old_state else None, new_state[0])
+                for (task, _), (old_state, new_state) in zip(items, transitions)
+            )
+
+        return [task for task, _ in items]
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer for one item of a bulk task request.
+
+    Items with an `id` partially update that task; items without one
+    create a new task and must provide `board`, `title`, `status` and
+    `priority`. Related ids are validated as plain integers here and
+    resolved for the whole batch by `TaskBulkListSerializer`.
+    """
+
+    create_required_fields = ("board", "title", "status", "priority")
+
+    id = serializers.IntegerField(
+        required=False,
+        help_text="ID of the task to update; omit to create a task."
+    )
+
+    board = serializers.IntegerField(
+        required=False,
+        help_text="Board ID the task belongs to."
+    )
+
+    assignee_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="User ID assigned to the task."
+    )
+
+    reviewer_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        help_text="User ID reviewing the task."
+    )
+
+    class Meta:
+        """
+        Serializer metadata.
+        """
+        model = Task
+        list_serializer_class = TaskBulkListSerializer
+        fields = [
+            "id",
+            "board",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assignee_id",
+            "reviewer_id",
+            "due_date",
+        ]
+        extra_kwargs = {
+            "title": {"required": False},
+            "status": {"required": False},
+            "priority": {"required": False},
+        }
+
+    def validate(self, attrs):
+        """
+        Require the fields needed to create a task on items without an `id`.
+        """
+        if "id" not in attrs:
+            missing = {
+                field: ["This field is required when creating a task."]
+                for field in self.create_required_fields
+                if field not in attrs
+            }
+
+            if missing:
+                raise serializers.ValidationError(missing)
+
+        return attrs
+
+
+class TaskNestedSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for embedding tasks in other responses.
     """
 
+    expandable_fields = {"assignee": "assignee_id", "reviewer": "reviewer_id"}
+
     assignee = UserProfileSerializer(read_only=True)
     reviewer = UserProfileSerializer(read_only=True)
 
@@ -1,10 +1,27 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TasksViewSet, TaskAssignedToCurrentUser, TaskReviewingCurrentUser, TaskCommentsViewSet
+from .views import (
+    TasksViewSet,
+    TaskAssignedToCurrentUser,
+    TaskReviewingCurrentUser,
+    TaskCommentsViewSet,
+    TaskBulkView,
+    TaskSearchView,
+    AsyncTaskAssignedToCurrentUser,
+    AsyncTaskReviewingCurrentUser,
+)
 
 router = DefaultRouter()
 router.register('', TasksViewSet, basename='tasks')
 
+if settings.ASYNC_READ_VIEWS:
+    assigned_view = AsyncTaskAssignedToCurrentUser.as_view()
+    reviewing_view = AsyncTaskReviewingCurrentUser.as_view()
+else:
+    assigned_view = TaskAssignedToCurrentUser.as_view()
+    reviewing_view = TaskReviewingCurrentUser.as_view()
+
 urlpatterns = [
     path('<int:task_pk>/comments/', TaskCommentsViewSet.as_view({
         'get': 'list',
@@ -16,7 +33,9 @@ urlpatterns = [
         'delete': 'destroy',
     }), name='task-comments-detail'),
 
-    path('assigned-to-me/', TaskAssignedToCurrentUser.as_view(), name='tasks-assigned-to-me'),
-    path('reviewing/', TaskReviewingCurrentUser.as_view(), name='tasks-reviewing'),
+    path('assigned-to-me/', assigned_view, name='tasks-assigned-to-me'),
+    path('reviewing/', reviewing_view, name='tasks-reviewing'),
+    path('bulk/', TaskBulkView.as_view(), name='tasks-bulk'),
+    path('search/', TaskSearchView.as_view(), name='tasks-search'),
     path('', include(router.urls)),
 ]
@@ -1,23 +1,62 @@
-from rest_framework import viewsets, generics
+from rest_framework import viewsets, generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
+from boards_app.api.views import boards_for_user
+from core.api.async_views import AsyncListAPIView
+from core.api.rows import RowListMixin
+from core.api.conditional import (
+    conditional_response,
+    make_etag,
+    set_conditional_headers,
+)
+from core.api.sparse import SparseFieldset
 from tasks_app.models import Task, Comments
-from .serializers import TaskListSerializer, CommentSerializer
+from tasks_app.search import search_tasks
+from .filters import TaskFilterBackend
+from .serializers import (
+    TaskBulkItemSerializer,
+    TaskListSerializer,
+    TaskSearchQuerySerializer,
+    TaskSearchResultSerializer,
+    CommentSerializer,
+)
 from .permissions import TaskPermission, IsBoardMemberForTaskComments
 
 
-class TasksViewSet(viewsets.ModelViewSet):
+class TasksViewSet(RowListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing tasks.
 
     Provides CRUD operations for tasks with permission handling.
     On creation, the current user is stored as the task creator.
+    The list contains the tasks of the user's boards and accepts the
+    filters of `TaskFilterBackend`. Only the users that are rendered
+    are joined (see `SparseFieldset`).
     """
 
     queryset = Task.objects.all()
     serializer_class = TaskListSerializer
     permission_classes = [TaskPermission]
+    filter_backends = [TaskFilterBackend]
+    replica_actions = {"list"}
+
+    def get_queryset(self):
+        """
+        Return all tasks; for listing, only those on the user's boards.
+        """
+        queryset = SparseFieldset.from_request(self.request).select_related(
+            super().get_queryset(), "assignee", "reviewer"
+        )
+        user = self.request.user
+
+        if self.action == "list" and not user.is_superuser:
+            queryset = queryset.filter(board__in=boards_for_user(user))
+
+        return queryset
 
     def perform_create(self, serializer):
         """
@@ -25,14 +64,132 @@ class TasksViewSet(viewsets.ModelViewSet):
         """
         serializer.save(created_by=self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve a single task, answering 304 if it has not changed.
+
+        The ETag is derived from the task's `updated_at`, which also
+        changes when comments are added or deleted.
+        """
+        instance = self.get_object()
+        etag = make_etag(
+            instance.pk,
+            instance.updated_at,
+            *SparseFieldset.from_request(request).etag_parts(),
+        )
+        not_modified = conditional_response(request, etag, instance.updated_at)
+
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return set_conditional_headers(
+            Response(serializer.data), etag, instance.updated_at
+        )
+
+
+class TaskBulkView(generics.GenericAPIView):
+    """
+    API view creating and updating many tasks in one request.
+
+    Accepts a list of items: items with an `id` partially update that
+    task, the others create new tasks. Membership is checked once per
+    board involved, and all writes happen in a single transaction.
+    Invalid items are reported per index and nothing is written.
+    """
+
+    serializer_class = TaskBulkItemSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Validate and write the submitted tasks.
+
+        Returns:
+            Response: The written tasks in the submitted order, with
+            status 201 if any task was created, otherwise 200.
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.TASK_BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        tasks = serializer.save()
+
+        created = any(item["task"] is None for item in serializer.validated_data)
+        return Response(
+            TaskListSerializer(tasks, many=True).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class TaskSearchView(generics.GenericAPIView):
+    """
+    API view searching the tasks on the current user's boards.
+
+    Matches task titles, descriptions and comments through the SQLite
+    full-text index (substring matching on other databases) and
+    returns the best matches first, each with a highlighted snippet.
+    Ranked results are paginated by offset.
+    """
+
+    serializer_class = TaskSearchResultSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return one page of search results.
+        """
+        params = TaskSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        terms = params.validated_data["q"]
+        limit = params.validated_data["limit"]
+        offset = params.validated_data["offset"]
+
+        boards = None if request.user.is_superuser else boards_for_user(request.user)
+        results = search_tasks(terms, boards, offset=offset, limit=limit + 1)
+        has_next = len(results) > limit
+        results = results[:limit]
+
+        tasks = (
+            SparseFieldset.from_request(request)
+            .select_related(Task.objects.all(), "assignee", "reviewer")
+            .in_bulk([task_id for task_id, _ in results])
+        )
+        page = []
+
+        for task_id, snippet in results:
+            task = tasks[task_id]
+            task.snippet = snippet
+            page.append(task)
+
+        url = request.build_absolute_uri()
+        previous = None
+
+        if offset:
+            previous = remove_query_param(url, "offset")
+
+            if offset > limit:
+                previous = replace_query_param(url, "offset", offset - limit)
+
+        return Response({
+            "next": replace_query_param(url, "offset", offset + limit) if has_next else None,
+            "previous": previous,
+            "results": self.get_serializer(page, many=True).data,
+        })
+
 
-class TaskAssignedToCurrentUser(generics.ListAPIView):
+class TaskAssignedToCurrentUser(RowListMixin, generics.ListAPIView):
     """
     List API view returning tasks assigned to the current user.
     """
 
     serializer_class = TaskListSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [TaskFilterBackend]
+    replica_actions = {"get"}
 
     def get_queryset(self):
         """
@@ -40,16 +197,20 @@ class TaskAssignedToCurrentUser(generics.ListAPIView):
         """
         user = self.request.user
         filtred_tasks = Task.objects.filter(assignee=user)
-        return filtred_tasks
+        return SparseFieldset.from_request(self.request).select_related(
+            filtred_tasks, "assignee", "reviewer"
+        )
 
 
-class TaskReviewingCurrentUser(generics.ListAPIView):
+class TaskReviewingCurrentUser(RowListMixin, generics.ListAPIView):
     """
     List API view returning tasks where the current user is the reviewer.
     """
 
     serializer_class = TaskListSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [TaskFilterBackend]
+    replica_actions = {"get"}
 
     def get_queryset(self):
         """
@@ -57,7 +218,43 @@ class TaskReviewingCurrentUser(generics.ListAPIView):
         """
         user = self.request.user
         filtred_tasks = Task.objects.filter(reviewer=user)
-        return filtred_tasks
+        return SparseFieldset.from_request(self.request).select_related(
+            filtred_tasks, "assignee", "reviewer"
+        )
+
+
+class AsyncTaskAssignedToCurrentUser(AsyncListAPIView):
+    """
+    Async variant of `TaskAssignedToCurrentUser`.
+    """
+
+    serializer_class = TaskListSerializer
+    filter_backends = [TaskFilterBackend]
+
+    def get_queryset(self, request):
+        """
+        Return tasks where the current user is the assignee.
+        """
+        return SparseFieldset.from_request(request).select_related(
+            Task.objects.filter(assignee=request.user), "assignee", "reviewer"
+        )
+
+
+class AsyncTaskReviewingCurrentUser(AsyncListAPIView):
+    """
+    Async variant of `TaskReviewingCurrentUser`.
+    """
+
+    serializer_class = TaskListSerializer
+    filter_backends = [TaskFilterBackend]
+
+    def get_queryset(self, request):
+        """
+        Return tasks where the current user is the reviewer.
+        """
+        return SparseFieldset.from_request(request).select_related(
+            Task.objects.filter(reviewer=request.user), "assignee", "reviewer"
+        )
 
 
 class TaskCommentsViewSet(viewsets.ModelViewSet):
@@ -71,6 +268,13 @@ class TaskCommentsViewSet(viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsBoardMemberForTaskComments]
     queryset = Comments.objects.all()
+    replica_actions = {"list"}
+
+    def get_queryset(self):
+        """
+        Return only the comments belonging to the task from the URL.
+        """
+        return Comments.objects.filter(task_id=self.kwargs.get("task_pk"))
 
     def perform_create(self, serializer):
         """
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from tasks_app.models import Comments, Task
+
+
+class Command(BaseCommand):
+    """
+    Recompute the stored comment count of every task.
+
+    Tasks are processed in primary key order and in fixed-size batches,
+    each batch being recounted with a single grouped query and written
+    back inside its own transaction.
+    """
+
+    help = "Backfill Task.comments_count from the comments table in batches."
+
+    def add_arguments(self, parser):
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tasks recounted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Walk all tasks in batches and store their actual comment counts.
+        """
+        batch_size = options["batch_size"]
+        last_id = 0
+        checked = 0
+        updated = 0
+
+        while True:
+            with transaction.atomic():
+                tasks = list(
+                    Task.objects
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .select_for_update()
+                    .only("pk", "comments_count")[:batch_size]
+                )
+
+                if not tasks:
+                    break
+
+                counts = dict(
+                    Comments.objects
+                    .filter(task_id__in=[task.pk for task in tasks])
+                    .values("task_id")
+                    .annotate(total=Count("id"))
+                    .order_by()
+                    .values_list("task_id", "total")
+                )
+
+                changed = []
+
+                for task in tasks:
+                    actual = counts.get(task.pk, 0)
+
+                    if task.comments_count != actual:
+                        task.comments_count = actual
+                        changed.append(task)
+
+                if changed:
+                    Task.objects.bulk_update(changed, ["comments_count"])
+
+            checked += len(tasks)
+            updated += len(changed)
+            last_id = tasks[-1].pk
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} tasks, updated {updated} comment counts."
+            )
+        )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks_app.search import (
+    create_search_index,
+    drop_search_index,
+    search_index_available,
+)
+
+
+class Command(BaseCommand):
+    """
+    Recreate the full-text search index over tasks and comments.
+
+    Needed after a migration rebuilt the task or comment table, which
+    drops the triggers keeping the index in sync.
+    """
+
+    help = "Recreate the SQLite full-text search index over tasks and comments."
+
+    def handle(self, *args, **options):
+        """
+        Drop and recreate the index in one transaction.
+        """
+        if connection.vendor != "sqlite":
+            self.stdout.write("Full-text search is only indexed on SQLite; nothing to do.")
+            return
+
+        with connection.schema_editor() as schema_editor:
+            drop_search_index(schema_editor)
+            create_search_index(schema_editor)
+
+        if not search_index_available():
+            self.stdout.write(self.style.WARNING(
+                "SQLite was built without FTS5; search falls back to substring matching."
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:28
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    """
+    Fill the new comments_count column from the existing comments.
+    """
+    Task = apps.get_model('tasks_app', 'Task')
+    Comments = apps.get_model('tasks_app', 'Comments')
+
+    Task.objects.update(
+        comments_count=Coalesce(
+            Subquery(
+                Comments.objects
+                .filter(task_id=OuterRef('pk'))
+                .values('task_id')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            Value(0),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0008_alter_comments_author_alter_comments_content_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of comments on the task.'),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0009_task_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comments',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp when the comment was last changed.'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp of the last change to the task or its comments.'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,109 @@
+from django.db import OperationalError, migrations
+
+
+# The schema as of this migration. It is copied here rather than imported
+# from tasks_app.search, so later changes to the live schema do not change
+# what this migration does.
+SEARCH_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE tasks_app_task_search USING fts5(
+        title, description,
+        content='tasks_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_app_task_search_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_search (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_task_search_delete AFTER DELETE ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_search (tasks_app_task_search, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_task_search_update
+    AFTER UPDATE OF title, description ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_search (tasks_app_task_search, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_app_task_search (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE tasks_app_comments_search USING fts5(
+        content,
+        content='tasks_app_comments', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_app_comments_search_insert AFTER INSERT ON tasks_app_comments BEGIN
+        INSERT INTO tasks_app_comments_search (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_comments_search_delete AFTER DELETE ON tasks_app_comments BEGIN
+        INSERT INTO tasks_app_comments_search (tasks_app_comments_search, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_comments_search_update
+    AFTER UPDATE OF content ON tasks_app_comments BEGIN
+        INSERT INTO tasks_app_comments_search (tasks_app_comments_search, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO tasks_app_comments_search (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+DROP_SEARCH_SCHEMA = [
+    f"DROP TRIGGER IF EXISTS {table}_{event}"
+    for table in ("tasks_app_task_search", "tasks_app_comments_search")
+    for event in ("insert", "delete", "update")
+] + [
+    f"DROP TABLE IF EXISTS {table}"
+    for table in ("tasks_app_task_search", "tasks_app_comments_search")
+]
+
+
+def create_index(apps, schema_editor):
+    """
+    Create and fill the full-text index on SQLite builds with FTS5.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    try:
+        for statement in SEARCH_SCHEMA:
+            schema_editor.execute(statement)
+    except OperationalError:
+        drop_index(apps, schema_editor)
+        return
+
+    for table in ("tasks_app_task_search", "tasks_app_comments_search"):
+        schema_editor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def drop_index(apps, schema_editor):
+    """
+    Remove the full-text index.
+    """
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_SEARCH_SCHEMA:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0011_task_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
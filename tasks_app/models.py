@@ -1,6 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Subquery
+from django.utils import timezone
 from django.contrib.auth.models import User
 
+from boards_app.changes import record_change, record_task_transitions
+from boards_app.counters import apply_task_transition, touch_boards
+from boards_app.models import BoardChange
+
 
 class Comments(models.Model):
     """
@@ -16,6 +22,7 @@ class Comments(models.Model):
         on_delete=models.CASCADE,
         null=True,
         blank=True,
+        db_index=False,
         help_text="Task this comment belongs to."
     )
 
@@ -24,6 +31,11 @@ class Comments(models.Model):
         help_text="Timestamp when the comment was created."
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp when the comment was last changed."
+    )
+
     author = models.CharField(
         max_length=70,
         help_text="Name of the comment author."
@@ -33,6 +45,38 @@ class Comments(models.Model):
         help_text="Content of the comment."
     )
 
+    class Meta:
+        """
+        Model metadata.
+
+        Comments of a task are listed in keyset order by id, which
+        is also their creation order.
+        """
+        indexes = [
+            models.Index(fields=["task", "id"], name="comment_task_cursor"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the comment and mark its task and board as changed
+        in the same transaction. New comments also increment the
+        comment count of the task. The change is appended to the
+        board's change log.
+        """
+        is_new = self._state.adding
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if self.task_id is not None:
+                Task.touch(self.task_id, comments_delta=1 if is_new else 0)
+                record_change(
+                    self.task.board_id,
+                    BoardChange.COMMENT,
+                    BoardChange.INSERT if is_new else BoardChange.UPDATE,
+                    self.pk,
+                )
+
     def __str__(self):
         """
         Return a readable string representation of the comment.
@@ -46,6 +90,10 @@ class Task(models.Model):
 
     A task can be assigned, reviewed, prioritized,
     and moved through multiple workflow states.
+
+    Saving a task keeps the stored counters of its board in sync,
+    including moves between boards, statuses and priorities.
+    The stored `comments_count` is maintained by the comment write paths.
     """
 
     STATUS_CHOICES = [
@@ -74,6 +122,7 @@ class Task(models.Model):
         'boards_app.Board',
         related_name='tasks',
         on_delete=models.CASCADE,
+        db_index=False,
         help_text="Board this task belongs to."
     )
 
@@ -105,6 +154,7 @@ class Task(models.Model):
         blank=True,
         null=True,
         on_delete=models.SET_NULL,
+        db_index=False,
         help_text="User assigned to work on the task."
     )
 
@@ -114,6 +164,7 @@ class Task(models.Model):
         blank=True,
         null=True,
         on_delete=models.SET_NULL,
+        db_index=False,
         help_text="User responsible for reviewing the task."
     )
 
@@ -123,6 +174,121 @@ class Task(models.Model):
         help_text="Optional due date for the task."
     )
 
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of comments on the task."
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp of the last change to the task or its comments."
+    )
+
+    class Meta:
+        """
+        Model metadata.
+
+        The composite indexes follow the hot queries: tasks of a board
+        by status or priority, and the assigned / reviewing lists,
+        which are keyset-paginated by id. Their leading columns also
+        serve the plain foreign key lookups.
+        """
+        indexes = [
+            models.Index(fields=["board", "status"], name="task_board_status"),
+            models.Index(fields=["board", "priority"], name="task_board_priority"),
+            models.Index(fields=["assignee", "id"], name="task_assignee_cursor"),
+            models.Index(fields=["reviewer", "id"], name="task_reviewer_cursor"),
+            models.Index(fields=["due_date"], name="task_due_date"),
+        ]
+
+    @classmethod
+    def touch(cls, task_id, comments_delta=0):
+        """
+        Mark a task and its board as changed after one of its comments changed.
+
+        Optionally shifts the stored comment count by `comments_delta`.
+        """
+        changes = {"updated_at": timezone.now()}
+
+        if comments_delta:
+            changes["comments_count"] = F("comments_count") + comments_delta
+
+        cls.objects.filter(pk=task_id).update(**changes)
+        touch_boards(
+            pk=Subquery(cls.objects.filter(pk=task_id).values("board_id")[:1])
+        )
+
+    @property
+    def counter_state(self):
+        """
+        Return the `(board_id, status, priority)` tuple counted on boards.
+        """
+        return (self.board_id, self.status, self.priority)
+
+    def _stored_counter_state(self):
+        """
+        Return the counter state currently persisted for this task.
+
+        Must be called inside the saving transaction: the row is read
+        there (with a row lock where supported) rather than taken from
+        the instance, so overlapping saves of the same task, e.g. from
+        two stale instances, each replace what the previous one wrote.
+
+        Returns None for tasks that have not been saved yet.
+        """
+        if self._state.adding:
+            return None
+
+        return (
+            Task.objects
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("board_id", "status", "priority")
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task and update the counters of the affected boards
+        in the same transaction.
+
+        Updates never write `comments_count`, so a stale instance
+        cannot overwrite comments added concurrently, but always
+        refresh `updated_at`. The change is appended to the change
+        log of the affected boards.
+        """
+        update_fields = kwargs.get("update_fields")
+
+        if not self._state.adding and update_fields is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "comments_count"
+            ]
+        elif update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+
+        update_fields = kwargs.get("update_fields")
+
+        with transaction.atomic():
+            old_state = self._stored_counter_state()
+            super().save(*args, **kwargs)
+            new_state = self.counter_state
+
+            if update_fields is not None and old_state is not None:
+                saved = {field.removesuffix("_id") for field in update_fields}
+                new_state = tuple(
+                    new if name in saved else old
+                    for name, old, new in zip(
+                        ("board", "status", "priority"), old_state, new_state
+                    )
+                )
+
+            apply_task_transition(old_state, new_state)
+            record_task_transitions([
+                (self.pk, old_state[0] if old_state else None, new_state[0])
+            ])
+
     def __str__(self):
         """
         Return the string representation of the task.
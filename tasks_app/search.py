@@ -0,0 +1,329 @@
+import re
+
+from django.db import OperationalError, connection
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils.html import escape
+
+from tasks_app.models import Comments, Task
+
+
+TASK_SEARCH_TABLE = "tasks_app_task_search"
+COMMENT_SEARCH_TABLE = "tasks_app_comments_search"
+
+# Words taken from a query; the rest is ignored.
+MAX_TERMS = 8
+
+# Approximate number of words in a snippet.
+SNIPPET_WORDS = 12
+
+# Markers placed around matches before the snippet is HTML-escaped.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+TERM_PATTERN = re.compile(r"\w+")
+
+# FTS5 tables over the task and comment texts. They are external
+# content tables: the text stays in the model tables and the triggers
+# keep the indexes in sync on every write, including bulk writes and
+# cascading deletes.
+#
+# On SQLite, most schema changes to a table (e.g. an AlterField or
+# RemoveField on Task or Comments) rebuild it by copying it into a new
+# table, which silently drops the triggers. Such migrations must
+# recreate the index with `create_search_index()` in a RunPython step,
+# or `rebuild_search_index` must be run afterwards. Migration 0012
+# holds its own copy of this schema; changes here need a new migration.
+SEARCH_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE {TASK_SEARCH_TABLE} USING fts5(
+        title, description,
+        content='tasks_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {TASK_SEARCH_TABLE}_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {TASK_SEARCH_TABLE}_delete AFTER DELETE ON tasks_app_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE} ({TASK_SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {TASK_SEARCH_TABLE}_update
+    AFTER UPDATE OF title, description ON tasks_app_task BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE} ({TASK_SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {TASK_SEARCH_TABLE} (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE VIRTUAL TABLE {COMMENT_SEARCH_TABLE} USING fts5(
+        content,
+        content='tasks_app_comments', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {COMMENT_SEARCH_TABLE}_insert AFTER INSERT ON tasks_app_comments BEGIN
+        INSERT INTO {COMMENT_SEARCH_TABLE} (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {COMMENT_SEARCH_TABLE}_delete AFTER DELETE ON tasks_app_comments BEGIN
+        INSERT INTO {COMMENT_SEARCH_TABLE} ({COMMENT_SEARCH_TABLE}, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {COMMENT_SEARCH_TABLE}_update
+    AFTER UPDATE OF content ON tasks_app_comments BEGIN
+        INSERT INTO {COMMENT_SEARCH_TABLE} ({COMMENT_SEARCH_TABLE}, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO {COMMENT_SEARCH_TABLE} (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+DROP_SEARCH_SCHEMA = [
+    f"DROP TRIGGER IF EXISTS {table}_{event}"
+    for table in (TASK_SEARCH_TABLE, COMMENT_SEARCH_TABLE)
+    for event in ("insert", "delete", "update")
+] + [
+    f"DROP TABLE IF EXISTS {table}"
+    for table in (TASK_SEARCH_TABLE, COMMENT_SEARCH_TABLE)
+]
+
+# Ranked matches of tasks and comments, best match per task. Title
+# matches weigh most, comment matches least (bm25 is negative, lower
+# is better). For the bare `snippet` column SQLite takes the row that
+# produced MIN(rank).
+SEARCH_SQL = f"""
+    SELECT task.id, MIN(match.rank) AS rank, match.snippet
+    FROM (
+        SELECT rowid AS task_id,
+               bm25({TASK_SEARCH_TABLE}, 4.0, 1.0) AS rank,
+               snippet({TASK_SEARCH_TABLE}, -1, %s, %s, '…', %s) AS snippet
+        FROM {TASK_SEARCH_TABLE}
+        WHERE {TASK_SEARCH_TABLE} MATCH %s
+        UNION ALL
+        SELECT comment.task_id,
+               bm25({COMMENT_SEARCH_TABLE}, 0.5) AS rank,
+               snippet({COMMENT_SEARCH_TABLE}, 0, %s, %s, '…', %s) AS snippet
+        FROM {COMMENT_SEARCH_TABLE}
+        JOIN tasks_app_comments AS comment ON comment.id = {COMMENT_SEARCH_TABLE}.rowid
+        WHERE {COMMENT_SEARCH_TABLE} MATCH %s
+    ) AS match
+    JOIN tasks_app_task AS task ON task.id = match.task_id
+    {{scope}}
+    GROUP BY task.id
+    ORDER BY rank, task.id
+    LIMIT %s OFFSET %s
+"""
+
+_available = {}
+
+
+def create_search_index(schema_editor):
+    """
+    Create and fill the full-text index on SQLite.
+
+    Does nothing on other databases or if SQLite was built without
+    FTS5; search then falls back to plain substring matching.
+    """
+    _available.clear()
+
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    try:
+        for statement in SEARCH_SCHEMA:
+            schema_editor.execute(statement)
+    except OperationalError:
+        for statement in DROP_SEARCH_SCHEMA:
+            schema_editor.execute(statement)
+        return
+
+    for table in (TASK_SEARCH_TABLE, COMMENT_SEARCH_TABLE):
+        schema_editor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def drop_search_index(schema_editor):
+    """
+    Remove the full-text index.
+    """
+    _available.clear()
+
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_SEARCH_SCHEMA:
+            schema_editor.execute(statement)
+
+
+def search_index_available():
+    """
+    Return whether the full-text index exists in the current database.
+
+    The result is remembered per database, so only the first search
+    pays for the lookup.
+    """
+    if connection.vendor != "sqlite":
+        return False
+
+    key = connection.settings_dict["NAME"]
+
+    if key not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [TASK_SEARCH_TABLE],
+            )
+            _available[key] = cursor.fetchone() is not None
+
+    return _available[key]
+
+
+def search_terms(query):
+    """
+    Return the words of a search query.
+    """
+    return TERM_PATTERN.findall(query)[:MAX_TERMS]
+
+
+def search_tasks(terms, boards=None, offset=0, limit=20):
+    """
+    Return the tasks matching all `terms`, best matches first.
+
+    A task matches if its title and description together, or one of
+    its comments, contain every term. Terms match word prefixes, or
+    any substring without the index.
+
+    Args:
+        terms: Words as returned by `search_terms()`.
+        boards: Optional queryset of boards to search in.
+        offset: Number of results to skip.
+        limit: Maximum number of results.
+
+    Returns:
+        list[tuple[int, str]]: Task ids with an HTML snippet of the
+        match, in which matched words are wrapped in `<mark>`.
+    """
+    if not terms:
+        return []
+
+    if search_index_available():
+        rows = _search_index(terms, boards, offset, limit)
+    else:
+        rows = _search_fallback(terms, boards, offset, limit)
+
+    return [(task_id, render_snippet(snippet)) for task_id, snippet in rows]
+
+
+def _search_index(terms, boards, offset, limit):
+    """
+    Search the FTS5 index.
+    """
+    # Every term is quoted, so no query syntax reaches FTS5, and
+    # matched as a prefix to support search-as-you-type.
+    expression = " ".join(f'"{term}"*' for term in terms)
+    snippet_params = [MATCH_START, MATCH_END, SNIPPET_WORDS]
+    scope, scope_params = "", []
+
+    if boards is not None:
+        board_sql, scope_params = boards.order_by().values("id").query.sql_with_params()
+        scope = f"WHERE task.board_id IN ({board_sql})"
+
+    params = [
+        *snippet_params, expression,
+        *snippet_params, expression,
+        *scope_params,
+        limit, offset,
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL.format(scope=scope), params)
+        return [(task_id, snippet) for task_id, _, snippet in cursor.fetchall()]
+
+
+def _search_fallback(terms, boards, offset, limit):
+    """
+    Search with case-insensitive substring matching on databases
+    without the index. Tasks whose title contains the first term
+    come first.
+    """
+    tasks = Task.objects.all() if boards is None else Task.objects.filter(board__in=boards)
+    comments = Comments.objects.all()
+    task_match = Q()
+
+    for term in terms:
+        task_match &= Q(title__icontains=term) | Q(description__icontains=term)
+        comments = comments.filter(content__icontains=term)
+
+    rows = list(
+        tasks
+        .filter(task_match | Exists(comments.filter(task=OuterRef("pk"))))
+        .annotate(title_match=Case(
+            When(title__icontains=terms[0], then=Value(0)), default=Value(1)
+        ))
+        .order_by("title_match", "id")
+        .values_list("id", "title", "description")[offset:offset + limit]
+    )
+    texts = {
+        task_id: f"{title} {description}"
+        for task_id, title, description in rows
+        if _contains_all(f"{title} {description}", terms)
+    }
+    missing = [task_id for task_id, _, _ in rows if task_id not in texts]
+
+    if missing:
+        for task_id, content in (
+            comments
+            .filter(task_id__in=missing)
+            .order_by("id")
+            .values_list("task_id", "content")
+        ):
+            texts.setdefault(task_id, content)
+
+    return [(task_id, mark_terms(texts[task_id], terms)) for task_id, _, _ in rows]
+
+
+def _contains_all(text, terms):
+    """
+    Return whether `text` contains every term, ignoring case.
+    """
+    text = text.casefold()
+    return all(term.casefold() in text for term in terms)
+
+
+def mark_terms(text, terms):
+    """
+    Return an excerpt of `text` around the first match with the
+    matches wrapped in match markers, like FTS5's `snippet()`.
+    """
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    words = text.split()
+    first = next(
+        (index for index, word in enumerate(words) if pattern.search(word)), 0
+    )
+    start = max(first - SNIPPET_WORDS // 2, 0)
+    excerpt = " ".join(words[start:start + SNIPPET_WORDS])
+    marked = pattern.sub(lambda match: f"{MATCH_START}{match.group()}{MATCH_END}", excerpt)
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + SNIPPET_WORDS < len(words) else ""
+    return f"{prefix}{marked}{suffix}"
+
+
+def render_snippet(snippet):
+    """
+    Return a snippet as safe HTML with the matches wrapped in `<mark>`.
+    """
+    return (
+        escape(snippet or "")
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_END, "</mark>")
+    )
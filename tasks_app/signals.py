@@ -0,0 +1,61 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from boards_app.changes import record_change
+from boards_app.counters import apply_task_transition
+from boards_app.models import Board, BoardChange
+from boards_app.signals import is_deleted_with
+from tasks_app.models import Comments, Task
+
+
+def _is_deletion_of(origin, *models):
+    """
+    Return True if the deletion was started by deleting one of `models`.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model in models
+
+    return isinstance(origin, models)
+
+
+@receiver(post_delete, sender=Task)
+def update_board_counters_on_task_delete(sender, instance, origin=None, **kwargs):
+    """
+    Remove a deleted task from its board's counters and leave
+    a tombstone in the board's change log.
+
+    Skipped when the board itself is being deleted, directly or by a
+    cascade such as the deletion of its owner, since its counters and
+    change log are going away together with it.
+    """
+    if _is_deletion_of(origin, Board) or is_deleted_with(instance.board_id, origin):
+        return
+
+    apply_task_transition(instance.counter_state, None)
+    record_change(instance.board_id, BoardChange.TASK, BoardChange.DELETE, instance.pk)
+
+
+@receiver(post_delete, sender=Comments)
+def update_comments_count_on_comment_delete(sender, instance, origin=None, **kwargs):
+    """
+    Decrement the comment count of the task a deleted comment belonged to,
+    mark the task and its board as changed and leave a tombstone in the
+    board's change log.
+
+    Skipped when the task or its board is being deleted as a whole. In
+    a cascade the task may already be gone, so its board is looked up
+    without loading it.
+    """
+    if instance.task_id is None or _is_deletion_of(origin, Board, Task):
+        return
+
+    board_id = (
+        Task.objects.filter(pk=instance.task_id).values_list("board_id", flat=True).first()
+    )
+
+    if board_id is None or is_deleted_with(board_id, origin):
+        return
+
+    Task.touch(instance.task_id, comments_delta=-1)
+    record_change(board_id, BoardChange.COMMENT, BoardChange.DELETE, instance.pk)
@@ -1,3 +1,871 @@
-from django.test import TestCase
+import importlib
+import json
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boards_app.counters import COUNTER_FIELDS, compute_counters
+from boards_app.models import Board, BoardChange
+from core.api.pagination import KeysetPagination
+from core.api.rows import get_row_plan
+from core.testing import ApiTestCase, SelectRecorder
+from tasks_app.api.serializers import (
+    TaskBulkListSerializer,
+    TaskListSerializer,
+    TaskSearchResultSerializer,
+)
+from tasks_app import search
+from tasks_app.models import Comments, Task
+
+
+class TaskEndpointBudgetTests(ApiTestCase):
+    """
+    Task and comment endpoints stay within their query budgets.
+    """
+
+    def test_list_as_admin(self):
+        response = self.client_for(self.admin).get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create(self):
+        response = self.client_for(self.members[0]).post(
+            "/api/tasks/",
+            {
+                "board": self.board.id,
+                "title": "New",
+                "status": "todo",
+                "priority": "low",
+                "assignee_id": self.members[1].id,
+                "reviewer_id": self.members[2].id,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_retrieve(self):
+        response = self.client_for(self.members[0]).get(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["comments_count"], self.member_count)
+
+    def test_update(self):
+        response = self.client_for(self.members[0]).put(
+            f"/api/tasks/{self.task.id}/",
+            {
+                "board": self.board.id,
+                "title": "Renamed",
+                "status": "done",
+                "priority": "low",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_partial_update(self):
+        response = self.client_for(self.members[0]).patch(
+            f"/api/tasks/{self.task.id}/",
+            {"status": "review", "reviewer_id": self.owner.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_destroy(self):
+        response = self.client_for(self.owner).delete(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_assigned_to_me(self):
+        response = self.client_for(self.members[0]).get("/api/tasks/assigned-to-me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reviewing(self):
+        response = self.client_for(self.members[1]).get("/api/tasks/reviewing/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_list(self):
+        response = self.client_for(self.members[0]).get(
+            f"/api/tasks/{self.task.id}/comments/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), self.member_count)
+
+    def test_comment_create(self):
+        response = self.client_for(self.members[0]).post(
+            f"/api/tasks/{self.task.id}/comments/",
+            {"content": "New comment"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_comment_retrieve(self):
+        comment = self.task.comments.first()
+        response = self.client_for(self.members[0]).get(
+            f"/api/tasks/{self.task.id}/comments/{comment.id}/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_destroy(self):
+        comment = self.task.comments.first()
+        response = self.client_for(self.owner).delete(
+            f"/api/tasks/{self.task.id}/comments/{comment.id}/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class TaskPaginationTests(ApiTestCase):
+    """
+    Task lists are paged with keyset cursors.
+    """
+
+    def test_next_and_previous(self):
+        client = self.client_for(self.admin)
+        pages = []
+        path = "/api/tasks/?page_size=3"
+
+        while path:
+            page = client.get(path).json()
+            pages.append(page)
+            path = page["next"]
+
+        ids = [task["id"] for page in pages for task in page["results"]]
+        self.assertEqual(ids, sorted(task.id for task in self.tasks))
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = client.get(pages[1]["previous"]).json()
+        self.assertEqual(previous["results"], pages[0]["results"])
+
+    def test_page_size_is_capped(self):
+        request = Request(APIRequestFactory().get("/api/tasks/", {"page_size": 10000}))
+        paginator = KeysetPagination()
+
+        self.assertEqual(paginator.get_page_size(request), paginator.max_page_size)
+        self.assertEqual(paginator.max_page_size, settings.PAGINATION_MAX_PAGE_SIZE)
+
+    def test_invalid_cursor(self):
+        response = self.client_for(self.admin).get("/api/tasks/?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskCommentsCountTests(ApiTestCase):
+    """
+    The stored comment count follows comment writes and is repaired by
+    `backfill_comments_count`.
+    """
+
+    def comments_count(self):
+        self.task.refresh_from_db()
+        return self.task.comments_count
+
+    def test_comment_writes(self):
+        client = self.client_for(self.members[0])
+        path = f"/api/tasks/{self.task.id}/comments/"
+
+        response = client.post(path, {"content": "New"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.comments_count(), self.member_count + 1)
+
+        client.delete(f"{path}{response.data['id']}/")
+        self.assertEqual(self.comments_count(), self.member_count)
+
+        listed = client.get(f"/api/tasks/?board={self.board.id}&page_size=100").json()["results"]
+        counts = {task["id"]: task["comments_count"] for task in listed}
+        self.assertEqual(counts[self.task.id], self.member_count)
+        self.assertEqual(counts[self.tasks[1].id], 0)
+
+    def test_backfill_comments_count(self):
+        Task.objects.update(comments_count=5)
+        out = StringIO()
+
+        call_command("backfill_comments_count", "--batch-size", "3", stdout=out)
+
+        self.assertIn(f"Checked {self.task_count} tasks, updated {self.task_count}", out.getvalue())
+        self.assertEqual(self.comments_count(), self.member_count)
+        self.assertEqual(Task.objects.filter(comments_count=0).count(), self.task_count - 1)
+
+
+class TaskConditionalGetTests(ApiTestCase):
+    """
+    Task detail supports ETag based conditional requests.
+    """
+
+    def test_new_comment_changes_task_etag(self):
+        client = self.client_for(self.members[0])
+        etag = client.get(f"/api/tasks/{self.task.id}/")["ETag"]
+
+        not_modified = client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_NONE_MATCH=etag)
+        client.post(f"/api/tasks/{self.task.id}/comments/", {"content": "New"}, format="json")
+        modified = client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+
+class TaskBulkTests(ApiTestCase):
+    """
+    The bulk endpoint writes many tasks at once and keeps board counters in sync.
+    """
+
+    def new_task(self, index):
+        return {
+            "board": self.board.id,
+            "title": f"Bulk {index}",
+            "status": "todo",
+            "priority": "low",
+            "assignee_id": self.members[index % self.member_count].id,
+            "reviewer_id": self.members[(index + 1) % self.member_count].id,
+        }
+
+    def test_create_and_update_within_budget(self):
+        items = [self.new_task(index) for index in range(20)]
+        items += [{"id": task.id, "status": "done"} for task in self.tasks]
+
+        response = self.client_for(self.members[0]).post(
+            "/api/tasks/bulk/", items, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), len(items))
+        self.assertEqual(response.data[-1]["status"], "done")
+
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.ticket_count, self.task_count + 20)
+        self.assertEqual(self.board.tasks_to_do_count, 20)
+        self.assertEqual(self.board.tasks_high_prio_count, self.task_count)
+
+    def test_update_only_returns_ok(self):
+        response = self.client_for(self.members[0]).post(
+            "/api/tasks/bulk/",
+            [{"id": self.task.id, "title": "Renamed", "assignee_id": None}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+        self.assertIsNone(self.task.assignee_id)
+
+    def test_errors_are_reported_per_item(self):
+        response = self.client_for(self.outsider).post(
+            "/api/tasks/bulk/",
+            [
+                {"id": self.task.id, "status": "done"},
+                {"title": "Incomplete"},
+                {**self.new_task(0), "board": 0},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("board", response.data[0])
+        self.assertIn("status", response.data[1])
+        self.assertIn("board", response.data[2])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "todo")
+
+    def test_unknown_user_is_rejected(self):
+        response = self.client_for(self.members[0]).post(
+            "/api/tasks/bulk/",
+            [self.new_task(0), {**self.new_task(1), "reviewer_id": 0}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("reviewer_id", response.data[1])
+        self.assertEqual(self.board.tasks.count(), self.task_count)
+
+    @override_settings(QUERY_INSPECTION={"ENABLED": False})
+    def test_tasks_changed_after_validation(self):
+        resolve_references = TaskBulkListSerializer.resolve_references
+
+        def resolve_then_change(serializer, items, errors):
+            resolved = resolve_references(serializer, items, errors)
+
+            for task in Task.objects.filter(pk__in=[self.tasks[0].pk, self.tasks[1].pk]):
+                task.status = "done"
+                task.save()
+
+            return resolved
+
+        with patch.object(TaskBulkListSerializer, "resolve_references", resolve_then_change):
+            response = self.client_for(self.members[0]).post(
+                "/api/tasks/bulk/",
+                [
+                    {"id": self.tasks[0].id, "status": "review"},
+                    {"id": self.tasks[1].id, "title": "Renamed"},
+                ],
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.tasks[1].refresh_from_db()
+        self.assertEqual(self.tasks[1].status, "done")
+        self.assertEqual(
+            compute_counters([self.board.pk])[self.board.pk],
+            {
+                field: getattr(Board.objects.get(pk=self.board.pk), field)
+                for field in COUNTER_FIELDS
+            },
+        )
+
+
+@override_settings(ASYNC_READ_VIEWS=True)
+class AsyncTaskListTests(ApiTestCase):
+    """
+    The async task lists match the synchronous views under ASGI.
+    """
+
+    def get_async(self, user, path):
+        token, _ = Token.objects.get_or_create(user=user)
+        return async_to_sync(self.async_client.get)(
+            path, headers={"Authorization": f"Token {token.key}"}
+        )
+
+    def test_lists_match_sync_views(self):
+        for path in (
+            "/api/tasks/assigned-to-me/",
+            "/api/tasks/reviewing/?page_size=1",
+            "/api/tasks/assigned-to-me/?ordering=-due_date&status=todo",
+        ):
+            response = self.get_async(self.members[1], path)
+
+            with override_settings(ASYNC_READ_VIEWS=False):
+                expected = self.client_for(self.members[1]).get(path)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+
+    def test_requires_authentication(self):
+        response = async_to_sync(self.async_client.get)("/api/tasks/assigned-to-me/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+
+class TaskQueryPlanTests(ApiTestCase):
+    """
+    The hot task and comment queries are answered from indexes.
+    """
+
+    def test_task_lists_use_indexes(self):
+        client = self.client_for(self.members[1])
+
+        first_page = self.assertNoFullScans(client, "/api/tasks/assigned-to-me/?page_size=1")
+        self.assertNoFullScans(client, first_page.json()["next"])
+        self.assertNoFullScans(client, "/api/tasks/reviewing/")
+        self.assertNoFullScans(client, f"/api/tasks/{self.task.id}/")
+        self.assertNoFullScans(client, f"/api/tasks/?board={self.board.id}&status=todo")
+        self.assertNoFullScans(client, "/api/tasks/?overdue=true&ordering=due_date")
+
+    def test_comment_list_uses_index(self):
+        client = self.client_for(self.members[0])
+
+        first_page = self.assertNoFullScans(
+            client, f"/api/tasks/{self.task.id}/comments/?page_size=2"
+        )
+        self.assertNoFullScans(client, first_page.json()["next"])
+
+    def test_task_filters_use_indexes(self):
+        tasks = Task.objects.filter(board=self.board)
+
+        self.assertUsesIndex(tasks.filter(status="todo"), "task_board_status")
+        self.assertUsesIndex(tasks.filter(priority="high"), "task_board_priority")
+        self.assertUsesIndex(
+            Task.objects.filter(assignee=self.members[0]).order_by("id"),
+            "task_assignee_cursor",
+        )
+        self.assertUsesIndex(
+            Task.objects.filter(reviewer=self.members[0], id__gt=self.task.id).order_by("id"),
+            "task_reviewer_cursor",
+        )
+        self.assertUsesIndex(
+            Task.objects.filter(due_date__lte=date(2025, 6, 1)), "task_due_date"
+        )
+        self.assertUsesIndex(
+            Comments.objects.filter(task=self.task).order_by("id"),
+            "comment_task_cursor",
+        )
+
+
+class TaskSearchTests(ApiTestCase):
+    """
+    The search finds tasks and comments on the user's boards, ranked and highlighted.
+    """
+
+    def test_migration_matches_schema(self):
+        migration = importlib.import_module("tasks_app.migrations.0012_task_search_index")
+
+        def normalize(statements):
+            return [" ".join(statement.split()) for statement in statements]
+
+        # A change to the live schema needs a new migration.
+        self.assertEqual(normalize(migration.SEARCH_SCHEMA), normalize(search.SEARCH_SCHEMA))
+        self.assertEqual(migration.DROP_SEARCH_SCHEMA, search.DROP_SEARCH_SCHEMA)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.title_match = Task.objects.create(
+            board=cls.board, title="Deploy the invoicing service",
+            status="todo", priority="low",
+        )
+        cls.comment_match = Task.objects.create(
+            board=cls.board, title="Quarterly report",
+            description="Numbers for finance", status="todo", priority="low",
+        )
+        Comments.objects.create(
+            task=cls.comment_match, author="owner",
+            content="Blocked until the invoicing <b>export</b> is fixed.",
+        )
+        other_board = Board.objects.create(title="Other", owner=cls.outsider)
+        Task.objects.create(
+            board=other_board, title="Invoicing for someone else",
+            status="todo", priority="low",
+        )
+
+    def search(self, user, query, **params):
+        return self.client_for(user).get("/api/tasks/search/", {"q": query, **params})
+
+    def test_ranks_matches_and_highlights_snippets(self):
+        response = self.search(self.members[0], "invoic")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["id"] for result in results],
+            [self.title_match.id, self.comment_match.id],
+        )
+        self.assertIn("<mark>invoicing</mark>", results[0]["snippet"])
+        self.assertIn("&lt;b&gt;export&lt;/b&gt;", results[1]["snippet"])
+
+    def test_only_searches_own_boards(self):
+        response = self.search(self.outsider, "invoicing")
+
+        self.assertEqual(
+            [result["title"] for result in response.json()["results"]],
+            ["Invoicing for someone else"],
+        )
+
+    def test_index_follows_writes(self):
+        client = self.client_for(self.members[0])
+        client.patch(
+            f"/api/tasks/{self.title_match.id}/", {"title": "Rollout plan"}, format="json"
+        )
+        client.post(
+            "/api/tasks/bulk/",
+            [{"board": self.board.id, "title": "Invoicing backlog",
+              "status": "todo", "priority": "low"}],
+            format="json",
+        )
+        self.comment_match.delete()
+
+        titles = [result["title"] for result in self.search(self.members[0], "invoicing").json()["results"]]
+        self.assertEqual(titles, ["Invoicing backlog"])
+        self.assertEqual(len(self.search(self.members[0], "rollout").json()["results"]), 1)
+
+    def test_paginates_by_offset(self):
+        first = self.search(self.members[0], "task", limit=4).json()
+        second = self.client_for(self.members[0]).get(first["next"]).json()
+
+        self.assertEqual(len(first["results"]), 4)
+        self.assertIsNone(first["previous"])
+        self.assertIsNotNone(second["previous"])
+        self.assertFalse(
+            {result["id"] for result in first["results"]}
+            & {result["id"] for result in second["results"]}
+        )
+
+    def test_falls_back_without_index(self):
+        expected = self.search(self.members[0], "invoicing").json()["results"]
+
+        with patch("tasks_app.search.search_index_available", return_value=False):
+            results = self.search(self.members[0], "invoicing").json()["results"]
+
+        self.assertEqual(
+            [result["id"] for result in results],
+            [result["id"] for result in expected],
+        )
+        self.assertIn("<mark>invoicing</mark>", results[1]["snippet"].lower())
+
+    def test_rejects_queries_without_words(self):
+        response = self.search(self.members[0], "**")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.json())
+
+
+class TaskFilterTests(ApiTestCase):
+    """
+    The task lists are scoped to the user's boards, filtered and ordered on the server.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        today = timezone.localdate()
+        cls.overdue = Task.objects.create(
+            board=cls.board, title="Overdue", status="review", priority="low",
+            due_date=today - timedelta(days=1), assignee=cls.members[0],
+        )
+        cls.finished = Task.objects.create(
+            board=cls.board, title="Finished", status="done", priority="medium",
+            due_date=today - timedelta(days=2),
+        )
+        cls.upcoming = Task.objects.create(
+            board=cls.board, title="Upcoming", status="in_progress", priority="medium",
+            due_date=today + timedelta(days=3), assignee=cls.members[0],
+        )
+        other_board = Board.objects.create(title="Other", owner=cls.outsider)
+        cls.foreign = Task.objects.create(
+            board=other_board, title="Foreign", status="review", priority="low",
+        )
+
+    def ids(self, user, path):
+        response = self.client_for(user).get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [task["id"] for task in response.json()["results"]]
+
+    def collect(self, user, path):
+        client = self.client_for(user)
+        ids = []
+
+        while path:
+            page = client.get(path).json()
+            ids += [task["id"] for task in page["results"]]
+            path = page["next"]
+
+        return ids
+
+    def test_list_is_scoped_to_own_boards(self):
+        self.assertEqual(self.ids(self.outsider, "/api/tasks/"), [self.foreign.id])
+        self.assertNotIn(self.foreign.id, self.ids(self.members[0], "/api/tasks/?page_size=100"))
+        self.assertIn(self.foreign.id, self.ids(self.admin, "/api/tasks/?page_size=100"))
+
+    def test_filters_combine(self):
+        member = self.members[0]
+
+        self.assertEqual(
+            self.ids(member, "/api/tasks/?status=review&status=done"),
+            [self.overdue.id, self.finished.id],
+        )
+        self.assertEqual(
+            self.ids(member, f"/api/tasks/?board={self.board.id}&priority=medium"
+                             f"&assignee={member.id}"),
+            [self.upcoming.id],
+        )
+        self.assertEqual(
+            self.ids(member, f"/api/tasks/?due_after={self.finished.due_date}"
+                             f"&due_before={self.overdue.due_date}"),
+            [self.overdue.id, self.finished.id],
+        )
+        self.assertEqual(self.ids(member, "/api/tasks/?overdue=true"), [self.overdue.id])
+        self.assertEqual(
+            self.ids(member, "/api/tasks/assigned-to-me/?overdue=true"), [self.overdue.id]
+        )
+
+    def test_rejects_invalid_filters(self):
+        client = self.client_for(self.members[0])
+
+        for path in (
+            "/api/tasks/?status=unknown",
+            "/api/tasks/?due_after=2025-02-01&due_before=2025-01-01",
+            "/api/tasks/?ordering=title",
+        ):
+            self.assertEqual(client.get(path).status_code, status.HTTP_400_BAD_REQUEST, path)
+
+    def test_orders_by_due_date_with_missing_dates_last(self):
+        ids = self.ids(self.members[0], "/api/tasks/?ordering=due_date&page_size=3")
+
+        self.assertEqual(ids, [self.finished.id, self.overdue.id, self.upcoming.id])
+
+    def test_ordering_pages_through_ties(self):
+        expected = sorted(
+            Task.objects.filter(board=self.board),
+            key=lambda task: (-["low", "medium", "high"].index(task.priority), task.id),
+        )
+
+        path = "/api/tasks/?ordering=-priority&page_size=3"
+        ids = self.collect(self.members[0], path)
+
+        self.assertEqual(ids, [task.id for task in expected])
+
+        client = self.client_for(self.members[0])
+        second = client.get(client.get(path).json()["next"]).json()
+        self.assertEqual(
+            [task["id"] for task in client.get(second["previous"]).json()["results"]],
+            ids[:3],
+        )
+
+
+class TaskSparseFieldsTests(ApiTestCase):
+    """
+    Task reads render and load only the requested fields and relations.
+    """
+
+    def get(self, path):
+        recorder = SelectRecorder()
+
+        with connection.execute_wrapper(recorder):
+            response = self.client_for(self.members[0]).get(path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        joins_users = any("auth_user" in sql and "tasks_app_task" in sql
+                          for sql, _ in recorder.statements)
+        return response.json(), joins_users
+
+    def test_default_representation_is_unchanged(self):
+        data, joins_users = self.get("/api/tasks/")
+        task = data["results"][0]
+
+        self.assertTrue(joins_users)
+        self.assertEqual(task["assignee"]["id"], self.task.assignee_id)
+        self.assertEqual(
+            set(task),
+            {"id", "board", "title", "description", "status", "priority",
+             "assignee", "reviewer", "due_date", "comments_count"},
+        )
+
+    def test_fields_without_relations_skip_the_join(self):
+        data, joins_users = self.get("/api/tasks/?fields=id,title,status")
+
+        self.assertFalse(joins_users)
+        self.assertEqual(data["results"][0], {
+            "id": self.task.id, "title": self.task.title, "status": "todo",
+        })
+
+    def test_unexpanded_relations_are_ids(self):
+        data, joins_users = self.get("/api/tasks/?fields=id,assignee,reviewer&expand=")
+
+        self.assertFalse(joins_users)
+        self.assertEqual(data["results"][0], {
+            "id": self.task.id,
+            "assignee": self.task.assignee_id,
+            "reviewer": self.task.reviewer_id,
+        })
+
+    def test_expanded_relation_with_nested_fields(self):
+        data, _ = self.get(
+            f"/api/tasks/{self.task.id}/?fields=id,assignee.fullname,reviewer"
+            "&expand=assignee"
+        )
+
+        self.assertEqual(data, {
+            "id": self.task.id,
+            "assignee": {"fullname": self.task.assignee.username},
+            "reviewer": self.task.reviewer_id,
+        })
+
+    def test_sparse_representation_has_its_own_etag(self):
+        client = self.client_for(self.members[0])
+        full = client.get(f"/api/tasks/{self.task.id}/")
+        sparse = client.get(f"/api/tasks/{self.task.id}/?fields=id")
+
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+        self.assertEqual(
+            client.get(f"/api/tasks/{self.task.id}/?fields=id",
+                       HTTP_IF_NONE_MATCH=sparse["ETag"]).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+    def test_writes_return_the_full_representation(self):
+        response = self.client_for(self.members[0]).patch(
+            f"/api/tasks/{self.task.id}/?fields=id", {"title": "Renamed"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Renamed")
+        self.assertIn("assignee", response.json())
+
+
+class TaskRowSerializationTests(ApiTestCase):
+    """
+    Task lists rendered from row plans are identical to the serializer output.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        Task.objects.create(
+            board=cls.board, title="Unassigned", status="done", priority="low",
+            due_date=date(2030, 1, 31),
+        )
+
+    def assertSameContent(self, user, path):
+        client = self.client_for(user)
+        response = client.get(path)
+
+        with override_settings(ROW_SERIALIZATION=False):
+            expected = client.get(path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(response.content, expected.content)
+        return response.json()
+
+    def test_lists_match_serializers(self):
+        member = self.members[0]
+
+        for path in (
+            "/api/tasks/?page_size=4",
+            "/api/tasks/?ordering=-due_date&page_size=3",
+            "/api/tasks/?fields=id,assignee.email,due_date&expand=assignee",
+            "/api/tasks/assigned-to-me/",
+            "/api/tasks/reviewing/?expand=",
+        ):
+            page = self.assertSameContent(member, path)
+
+            if page["next"]:
+                self.assertSameContent(member, page["next"])
+
+    def test_unsupported_serializer_falls_back(self):
+        self.assertIsNotNone(get_row_plan(TaskListSerializer))
+        self.assertIsNone(get_row_plan(TaskSearchResultSerializer))
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_list_matches_serializer(self):
+        token, _ = Token.objects.get_or_create(user=self.members[0])
+        headers = {"Authorization": f"Token {token.key}"}
+        response = async_to_sync(self.async_client.get)(
+            "/api/tasks/assigned-to-me/", headers=headers
+        )
+
+        with override_settings(ROW_SERIALIZATION=False):
+            expected = async_to_sync(self.async_client.get)(
+                "/api/tasks/assigned-to-me/", headers=headers
+            )
+
+        self.assertEqual(response.content, expected.content)
+
+
+@override_settings(STREAMING={"CHUNK_SIZE": 3})
+class TaskStreamingTests(ApiTestCase):
+    """
+    Task lists stream all results as one JSON array with `?stream=true`.
+    """
+
+    def collect(self, client, path):
+        results = []
+
+        while path:
+            page = client.get(path).json()
+            results += page["results"]
+            path = page["next"]
+
+        return results
+
+    def test_stream_matches_all_pages(self):
+        client = self.client_for(self.admin)
+
+        for path, params in (
+            ("/api/tasks/", "page_size=4"),
+            ("/api/tasks/", "ordering=-priority&page_size=4"),
+            ("/api/tasks/reviewing/", "fields=id,reviewer&expand="),
+        ):
+            response = client.get(f"{path}?{params}&stream=true")
+
+            self.assertTrue(response.streaming)
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertEqual(
+                json.loads(b"".join(response.streaming_content)),
+                self.collect(client, f"{path}?{params}"),
+            )
+
+    def test_stream_without_row_plans(self):
+        client = self.client_for(self.members[0])
+        expected = client.get("/api/tasks/?stream=true&page_size=100")
+
+        with override_settings(ROW_SERIALIZATION=False):
+            response = client.get("/api/tasks/?stream=true")
+
+        self.assertEqual(
+            b"".join(response.streaming_content), b"".join(expected.streaming_content)
+        )
+
+    def test_empty_stream(self):
+        response = self.client_for(self.outsider).get("/api/tasks/?stream=1")
+
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
+    @override_settings(ASYNC_READ_VIEWS=True)
+    def test_async_stream(self):
+        token, _ = Token.objects.get_or_create(user=self.members[0])
+        response = async_to_sync(self.async_client.get)(
+            "/api/tasks/assigned-to-me/?stream=true",
+            headers={"Authorization": f"Token {token.key}"},
+        )
+
+        async def read():
+            return b"".join([part async for part in response.streaming_content])
+
+        self.assertEqual(
+            json.loads(async_to_sync(read)()),
+            self.client_for(self.members[0]).get("/api/tasks/assigned-to-me/").json()["results"],
+        )
+
+
+class TaskCascadeDeleteTests(TransactionTestCase):
+    """
+    Deleting a board owner cascades to their boards, tasks and comments
+    without writing counters or change log entries for deleted boards.
+
+    Foreign keys are only checked when the deletion commits, so the
+    tests run outside a wrapping transaction.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", "owner@example.com")
+        self.other = User.objects.create_user("other", "other@example.com")
+        self.board = Board.objects.create(title="Owned", owner=self.owner)
+        self.task = Task.objects.create(
+            board=self.board, title="Task", status="todo", priority="high",
+            created_by=self.owner,
+        )
+        Comments.objects.create(task=self.task, author="other", content="Comment")
+
+        self.kept = Board.objects.create(title="Kept", owner=self.other)
+        self.kept_task = Task.objects.create(
+            board=self.kept, title="Kept", status="todo", priority="low",
+            created_by=self.owner,
+        )
+        Comments.objects.create(task=self.kept_task, author="owner", content="Comment")
+
+    def test_delete_board_owner(self):
+        self.owner.delete()
+
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(BoardChange.objects.filter(board_id=self.board.pk).exists())
+        self.assertTrue(Task.objects.filter(pk=self.kept_task.pk, created_by=None).exists())
+
+    def test_delete_board_owners_by_queryset(self):
+        User.objects.filter(pk=self.owner.pk).delete()
+
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+        self.assertEqual(Board.objects.count(), 1)
+
+    def test_delete_task_records_comment_deletions(self):
+        comment = self.kept_task.comments.get()
+        comment_id = comment.pk
+        comment.delete()
+
+        self.kept_task.refresh_from_db()
+        self.assertEqual(self.kept_task.comments_count, 0)
+        self.assertTrue(
+            BoardChange.objects.filter(
+                board=self.kept, entity=BoardChange.COMMENT, entity_id=comment_id,
+                action=BoardChange.DELETE,
+            ).exists()
+        )
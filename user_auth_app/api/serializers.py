@@ -3,8 +3,11 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework import serializers
 
+# 3. lokal imports
+from core.api.sparse import SparseFieldsMixin
 
-class UserProfileSerializer(serializers.ModelSerializer):
+
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for exposing basic user profile data.
 
@@ -26,7 +29,12 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
         Excludes the current instance during updates.
         """
-        if User.objects.filter(username__iexact=value).exclude(pk=self.instance.pk).exists():
+        users = User.objects.filter(username__iexact=value)
+
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+
+        if users.exists():
             raise serializers.ValidationError("Username already taken.")
         return value
 
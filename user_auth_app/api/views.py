@@ -7,6 +7,7 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 
 # 3. lokal imports
+from core.api.throttling import TokenBucketThrottle
 from .serializers import (
     UserProfileSerializer,
     RegistrationSerializer,
@@ -46,10 +47,13 @@ class RegistrationView(generics.CreateAPIView):
     Returns:
         201 CREATED: Token and basic user data.
         400 BAD REQUEST: Validation errors.
+        429 TOO MANY REQUESTS: Throttled (see `THROTTLING`).
     """
 
     permission_classes = [AllowAny]
     serializer_class = RegistrationSerializer
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "registration"
 
     def create(self, request, *args, **kwargs):
         """
@@ -79,10 +83,13 @@ class LoginView(ObtainAuthToken):
     Returns:
         200 OK: Token and basic user data.
         400 BAD REQUEST: Invalid credentials or validation errors.
+        429 TOO MANY REQUESTS: Throttled (see `THROTTLING`).
     """
 
     permission_classes = [AllowAny]
     serializer_class = EmailAuthTokenSerializer
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         """
@@ -0,0 +1,278 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from core.cache import NamespacedCache, configured_by
+
+
+DEFAULT_TOKEN_AUTH_CACHE = {
+    "BACKEND": "local",
+    "TIMEOUT": 60,
+    "MAX_ENTRIES": 10000,
+    "CACHE_ALIAS": "default",
+    "KEY_PREFIX": "auth-token",
+}
+
+
+class LocalTokenCache:
+    """
+    In-process LRU cache with a per-entry time to live.
+
+    Entries expire `timeout` seconds after they were stored, and the
+    least recently used entry is evicted once `max_entries` is reached.
+    Safe to share between the threads of one worker process.
+    """
+
+    def __init__(self, timeout, max_entries):
+        """
+        Create an empty cache.
+        """
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the cached value for `key`, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return copy.copy(value[0]), copy.copy(value[1])
+
+    def set(self, key, value):
+        """
+        Store `value` under `key`, evicting the oldest entries if full.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aget(self, key):
+        """
+        Async counterpart of `get()`; the cache lives in memory.
+        """
+        return self.get(key)
+
+    async def aset(self, key, value):
+        """
+        Async counterpart of `set()`; the cache lives in memory.
+        """
+        self.set(key, value)
+
+    def delete(self, key):
+        """
+        Remove `key` from the cache if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoTokenCache(NamespacedCache):
+    """
+    Token cache backed by one of the caches configured in `CACHES`.
+
+    Use this backend when several worker processes should share
+    cached tokens and see each other's invalidations.
+    """
+
+    def __init__(self, alias, timeout, key_prefix):
+        """
+        Create a cache wrapper around the Django cache `alias`.
+        """
+        super().__init__(alias, key_prefix)
+        self.timeout = timeout
+
+    def get(self, key):
+        """
+        Return the cached value for `key`, or None if missing or expired.
+        """
+        return self.cache.get(self._make_key(key))
+
+    def set(self, key, value):
+        """
+        Store `value` under `key` for `timeout` seconds.
+        """
+        self.cache.set(self._make_key(key), value, self.timeout)
+
+    async def aget(self, key):
+        """
+        Async counterpart of `get()`.
+        """
+        return await self.cache.aget(self._make_key(key))
+
+    async def aset(self, key, value):
+        """
+        Async counterpart of `set()`.
+        """
+        await self.cache.aset(self._make_key(key), value, self.timeout)
+
+    def delete(self, key):
+        """
+        Remove `key` from the cache if present.
+        """
+        self.cache.delete(self._make_key(key))
+
+
+@configured_by("TOKEN_AUTH_CACHE")
+def get_token_cache():
+    """
+    Return the token cache configured by the `TOKEN_AUTH_CACHE` setting.
+    """
+    config = {
+        **DEFAULT_TOKEN_AUTH_CACHE,
+        **getattr(settings, "TOKEN_AUTH_CACHE", {}),
+    }
+
+    if config["BACKEND"] == "django":
+        return DjangoTokenCache(
+            alias=config["CACHE_ALIAS"],
+            timeout=config["TIMEOUT"],
+            key_prefix=config["KEY_PREFIX"],
+        )
+
+    return LocalTokenCache(
+        timeout=config["TIMEOUT"],
+        max_entries=config["MAX_ENTRIES"],
+    )
+
+
+def invalidate_token(key):
+    """
+    Drop a token key from the authentication cache.
+    """
+    get_token_cache().delete(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and its user by token key.
+
+    Only successful lookups of active users are cached. Entries are
+    invalidated when the token is deleted or its user is saved
+    (e.g. deactivated) and otherwise expire after `TOKEN_AUTH_CACHE['TIMEOUT']`.
+
+    Cache hits are not checked against the database. Changes that send
+    no signals, such as `User.objects.filter(...).update(is_active=False)`
+    or bulk token deletes, and invalidations in other processes with
+    the local backend, therefore take effect after at most `TIMEOUT`
+    seconds; call `invalidate_token()` to revoke a token immediately.
+
+    `aauthenticate()` offers the same checks for async views, using
+    the async cache and ORM APIs.
+    """
+
+    def get_token_key(self, request):
+        """
+        Return the token key from the `Authorization` header, or None
+        if the header does not use this scheme.
+
+        Raises:
+            AuthenticationFailed: If the header is malformed.
+        """
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            msg = _("Invalid token header. Token string should not contain invalid characters.")
+            raise exceptions.AuthenticationFailed(msg)
+
+    def authenticate(self, request):
+        """
+        Return `(user, token)` for the request's token, or None.
+        """
+        key = self.get_token_key(request)
+
+        if key is None:
+            return None
+
+        return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of `authenticate()`.
+        """
+        key = self.get_token_key(request)
+
+        if key is None:
+            return None
+
+        return await self.aauthenticate_credentials(key)
+
+    def authenticate_credentials(self, key):
+        """
+        Return `(user, token)` from the cache, falling back to the database.
+        """
+        token_cache = get_token_cache()
+        cached = token_cache.get(key)
+
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, (user, token))
+
+        return user, token
+
+    async def aauthenticate_credentials(self, key):
+        """
+        Async counterpart of `authenticate_credentials()`.
+        """
+        token_cache = get_token_cache()
+        cached = await token_cache.aget(key)
+
+        if cached is not None:
+            return cached
+
+        model = self.get_model()
+
+        try:
+            token = await model.objects.select_related("user").aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        await token_cache.aset(key, (token.user, token))
+
+        return token.user, token
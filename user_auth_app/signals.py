@@ -0,0 +1,132 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from boards_app.changes import record_changes
+from boards_app.counters import refresh_member_count, touch_boards
+from boards_app.models import Board, BoardChange
+from tasks_app.models import Task
+from user_auth_app.authentication import invalidate_token
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Remove a deleted token from the authentication cache.
+    """
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """
+    Remove the tokens of a saved user from the authentication cache.
+
+    Covers deactivation and any other change to the cached user data.
+    """
+    if created:
+        return
+
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        invalidate_token(key)
+
+
+@receiver(post_save, sender=User)
+def touch_content_of_changed_user(sender, instance, created, update_fields, **kwargs):
+    """
+    Mark boards and tasks embedding a changed user profile as changed.
+
+    Board and task payloads include the names and emails of members,
+    assignees and reviewers, so their ETags must change with them and
+    the change is appended to the change log of every affected board.
+    Saves that only record a login are ignored.
+    """
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+
+    tasks = Task.objects.filter(Q(assignee=instance) | Q(reviewer=instance))
+    task_rows = list(tasks.values_list("pk", "board_id"))
+    tasks.update(updated_at=timezone.now())
+
+    member_boards = (
+        Board.members.through.objects
+        .filter(user_id=instance.pk)
+        .values("board_id")
+    )
+    touch_boards(Q(pk__in=member_boards) | Q(pk__in=tasks.values("board_id")))
+    board_ids = member_boards.values_list("board_id", flat=True)
+
+    record_changes([
+        *(
+            (board_id, BoardChange.MEMBER, BoardChange.UPDATE, instance.pk)
+            for board_id in board_ids
+        ),
+        *(
+            (board_id, BoardChange.TASK, BoardChange.UPDATE, task_id)
+            for task_id, board_id in task_rows
+        ),
+    ])
+
+
+@receiver(pre_delete, sender=User)
+def collect_content_of_deleted_user(sender, instance, **kwargs):
+    """
+    Remember the boards and tasks a deleted user appears in.
+
+    The deletion removes the user's memberships and clears them as
+    assignee and reviewer with plain queries that send no signals, so
+    the affected rows are collected before they change.
+    """
+    instance._member_board_ids = list(
+        Board.members.through.objects
+        .filter(user_id=instance.pk)
+        .values_list("board_id", flat=True)
+    )
+    instance._task_rows = list(
+        Task.objects
+        .filter(Q(assignee=instance) | Q(reviewer=instance))
+        .values_list("pk", "board_id")
+    )
+
+
+@receiver(post_delete, sender=User)
+def update_content_of_deleted_user(sender, instance, **kwargs):
+    """
+    Recount the members of the boards a deleted user belonged to, mark
+    their tasks and boards as changed and append the changes to the
+    change log.
+
+    Boards deleted together with the user (those they owned) are
+    skipped; they are gone by the time the user row is deleted.
+    """
+    member_board_ids = getattr(instance, "_member_board_ids", [])
+    task_rows = getattr(instance, "_task_rows", [])
+    existing = set(
+        Board.objects
+        .filter(pk__in={*member_board_ids, *(board_id for _, board_id in task_rows)})
+        .values_list("pk", flat=True)
+    )
+    member_board_ids = [board_id for board_id in member_board_ids if board_id in existing]
+    task_rows = [(task_id, board_id) for task_id, board_id in task_rows if board_id in existing]
+
+    refresh_member_count(member_board_ids)
+
+    if task_rows:
+        Task.objects.filter(pk__in=[task_id for task_id, _ in task_rows]).update(
+            updated_at=timezone.now()
+        )
+        touch_boards(pk__in={board_id for _, board_id in task_rows})
+
+    record_changes([
+        *(
+            (board_id, BoardChange.MEMBER, BoardChange.DELETE, instance.pk)
+            for board_id in member_board_ids
+        ),
+        *(
+            (board_id, BoardChange.TASK, BoardChange.UPDATE, task_id)
+            for task_id, board_id in task_rows
+        ),
+    ])
@@ -1,3 +1,256 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.api.throttling import get_throttle_store, refill
+from core.testing import ApiTestCase
+from user_auth_app.authentication import (
+    CachedTokenAuthentication,
+    get_token_cache,
+    invalidate_token,
+)
+
+
+class UserEndpointBudgetTests(ApiTestCase):
+    """
+    User, authentication and email check endpoints stay within their query budgets.
+    """
+
+    def test_list_as_admin(self):
+        response = self.client_for(self.admin).get("/api/user/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create_as_admin(self):
+        response = self.client_for(self.admin).post(
+            "/api/user/",
+            {"fullname": "created", "email": "created@example.com"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_retrieve_own_profile(self):
+        response = self.client_for(self.owner).get(f"/api/user/{self.owner.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_own_profile(self):
+        response = self.client_for(self.owner).put(
+            f"/api/user/{self.owner.id}/",
+            {"fullname": "owner-renamed", "email": "owner@example.com"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_partial_update_own_profile(self):
+        response = self.client_for(self.owner).patch(
+            f"/api/user/{self.owner.id}/",
+            {"fullname": "owner-renamed"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_destroy_is_forbidden(self):
+        response = self.client_for(self.owner).delete(f"/api/user/{self.owner.id}/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_registration(self):
+        response = APIClient().post(
+            "/api/registration/",
+            {
+                "fullname": "newcomer",
+                "email": "newcomer@example.com",
+                "password": "newcomer-password",
+                "repeated_password": "newcomer-password",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_login(self):
+        response = APIClient().post(
+            "/api/login/",
+            {"email": "owner@example.com", "password": "owner-password"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_email_check(self):
+        response = self.client_for(self.owner).get(
+            "/api/email-check/", {"email": "member0@example.com"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenCacheTests(ApiTestCase):
+    """
+    Tokens are cached after their first lookup and dropped from the
+    cache when they are deleted or their user is saved.
+    """
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.token, _ = Token.objects.get_or_create(user=self.owner)
+        self.path = f"/api/user/{self.owner.id}/"
+
+    def test_lookup_is_cached(self):
+        authentication = CachedTokenAuthentication()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(authentication.authenticate_credentials(self.token.key)[0], self.owner)
+            self.assertEqual(authentication.authenticate_credentials(self.token.key)[0], self.owner)
+
+    def test_token_delete(self):
+        client = self.client_for(self.owner)
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_200_OK)
+
+        self.token.delete()
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_deactivation(self):
+        client = self.client_for(self.owner)
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_200_OK)
+
+        self.owner.is_active = False
+        self.owner.save()
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_queryset_update_is_cached_until_invalidated(self):
+        client = self.client_for(self.owner)
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_200_OK)
+
+        User.objects.filter(pk=self.owner.pk).update(is_active=False)
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_200_OK)
+
+        invalidate_token(self.token.key)
+        self.assertEqual(client.get(self.path).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UserSparseFieldsTests(ApiTestCase):
+    """
+    User profiles render only the requested fields.
+    """
+
+    def test_fields(self):
+        client = self.client_for(self.owner)
+
+        sparse = client.get(f"/api/user/{self.owner.id}/", {"fields": "id,fullname"})
+        full = client.get(f"/api/user/{self.owner.id}/")
+
+        self.assertEqual(sparse.json(), {"id": self.owner.id, "fullname": "owner"})
+        self.assertEqual(set(full.json()), {"id", "email", "fullname"})
+
+
+def throttling(backend="local", **rates):
+    """
+    Return `THROTTLING` settings with the given rates per scope.
+    """
+    return {**settings.THROTTLING, "BACKEND": backend, "RATES": rates}
+
+
+class TokenBucketTests(SimpleTestCase):
+    """
+    Buckets refill continuously up to their capacity.
+    """
+
+    def test_refill(self):
+        bucket, wait = refill(None, 2, 1.0, now=100.0)
+        self.assertEqual((bucket, wait), ((1, 100.0), 0))
+
+        bucket, wait = refill(bucket, 2, 1.0, now=100.0)
+        bucket, wait = refill(bucket, 2, 1.0, now=100.5)
+        self.assertEqual(wait, 0.5)
+
+        bucket, wait = refill(bucket, 2, 1.0, now=110.0)
+        self.assertEqual((bucket, wait), ((1, 110.0), 0))
+
+
+class ThrottlingTests(ApiTestCase):
+    """
+    Login, registration and the email check are throttled per IP, per
+    email and globally.
+    """
+
+    def setUp(self):
+        get_throttle_store().clear()
+        cache.clear()
+
+    def login(self, email="owner@example.com", ip="10.0.0.1"):
+        return APIClient(REMOTE_ADDR=ip).post(
+            "/api/login/", {"email": email, "password": "owner-password"}, format="json"
+        )
+
+    def rejected(self):
+        response = self.client_for(self.admin).get("/api/throttling/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["rejected"]
+
+    def test_ip_bucket(self):
+        # Freeze the clock so that slow password checks do not refill the bucket.
+        with (
+            patch("core.api.throttling.time") as clock,
+            override_settings(THROTTLING=throttling(login={"ip": "2/min"})),
+        ):
+            clock.monotonic.return_value = clock.time.return_value = 1000.0
+
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login("member0@example.com").status_code, status.HTTP_400_BAD_REQUEST)
+
+            response = self.login()
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(response["Retry-After"], "30")
+            self.assertEqual(self.login(ip="10.0.0.2").status_code, status.HTTP_200_OK)
+
+            self.assertEqual(self.rejected()["login"], {"ip": 1, "email": 0, "global": 0})
+
+    def test_email_bucket(self):
+        with override_settings(THROTTLING=throttling(login={"ip": "5/min", "email": "1/min"})):
+            self.assertEqual(self.login(ip="10.0.0.1").status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.login(" Owner@Example.com", ip="10.0.0.2").status_code,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            self.assertEqual(self.rejected()["login"]["email"], 1)
+
+    def test_throttled_clients_do_not_drain_the_global_bucket(self):
+        with override_settings(THROTTLING=throttling(login={"ip": "1/min", "global": "2/min"})):
+            self.assertEqual(self.login(ip="10.0.0.1").status_code, status.HTTP_200_OK)
+
+            for _ in range(3):
+                self.assertEqual(self.login(ip="10.0.0.1").status_code, 429)
+
+            self.assertEqual(self.login(ip="10.0.0.2").status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login(ip="10.0.0.3").status_code, 429)
+            self.assertEqual(self.rejected()["login"], {"ip": 3, "email": 0, "global": 1})
+
+    def test_registration_and_email_check(self):
+        with override_settings(THROTTLING=throttling(
+            registration={"global": "1/min"}, **{"email-check": {"email": "1/min"}},
+        )):
+            data = {
+                "fullname": "newcomer",
+                "email": "newcomer@example.com",
+                "password": "newcomer-password",
+                "repeated_password": "newcomer-password",
+            }
+            self.assertEqual(APIClient().post("/api/registration/", data, format="json").status_code, 201)
+            self.assertEqual(APIClient().post("/api/registration/", data, format="json").status_code, 429)
+
+            client = self.client_for(self.owner)
+            self.assertEqual(client.get("/api/email-check/", {"email": "member0@example.com"}).status_code, 200)
+            self.assertEqual(client.get("/api/email-check/", {"email": "member0@example.com"}).status_code, 429)
+            self.assertEqual(client.get("/api/email-check/", {"email": "member1@example.com"}).status_code, 200)
+
+    def test_shared_cache_backend(self):
+        with override_settings(THROTTLING=throttling("django", login={"ip": "1/min"})):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self.rejected()["login"], {"ip": 1, "email": 0, "global": 0})
+
+    def test_metrics_require_an_admin(self):
+        response = self.client_for(self.owner).get("/api/throttling/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)